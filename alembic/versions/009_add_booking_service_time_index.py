@@ -0,0 +1,30 @@
+"""add booking tenant/service/time index
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Supports the per-service booking range query used by slot generation
+    op.create_index(
+        'ix_bookings_tenant_service_time',
+        'bookings',
+        ['tenant_id', 'service_id', 'start_time'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_tenant_service_time', table_name='bookings')
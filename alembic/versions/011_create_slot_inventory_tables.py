@@ -0,0 +1,58 @@
+"""create slot_inventory tables
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'slot_inventory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('service_id', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('capacity', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('booked', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['service_id'], ['services.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('service_id', 'start_time', name='uq_slot_inventory_service_start')
+    )
+    op.create_index(op.f('ix_slot_inventory_id'), 'slot_inventory', ['id'], unique=False)
+    op.create_index('ix_slot_inventory_tenant_service_start', 'slot_inventory',
+                    ['tenant_id', 'service_id', 'start_time'], unique=False)
+
+    op.create_table(
+        'slot_inventory_coverage',
+        sa.Column('service_id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('valid_from', sa.Date(), nullable=False),
+        sa.Column('valid_until', sa.Date(), nullable=False),
+        sa.Column('rebuilt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['service_id'], ['services.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('service_id')
+    )
+    op.create_index(op.f('ix_slot_inventory_coverage_tenant_id'), 'slot_inventory_coverage',
+                    ['tenant_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_slot_inventory_coverage_tenant_id'), table_name='slot_inventory_coverage')
+    op.drop_table('slot_inventory_coverage')
+    op.drop_index('ix_slot_inventory_tenant_service_start', table_name='slot_inventory')
+    op.drop_index(op.f('ix_slot_inventory_id'), table_name='slot_inventory')
+    op.drop_table('slot_inventory')
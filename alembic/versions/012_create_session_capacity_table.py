@@ -0,0 +1,44 @@
+"""create session_capacity table
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'session_capacity',
+        sa.Column('service_id', sa.Integer(), nullable=False),
+        sa.Column('session_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('booked', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['service_id'], ['services.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('service_id', 'session_start')
+    )
+    op.create_index(op.f('ix_session_capacity_tenant_id'), 'session_capacity', ['tenant_id'], unique=False)
+    
+    # Backfill counters from existing confirmed bookings
+    op.execute("""
+        INSERT INTO session_capacity (service_id, session_start, tenant_id, booked)
+        SELECT service_id, start_time, tenant_id, COUNT(*)
+        FROM bookings
+        WHERE status = 'CONFIRMED'
+        GROUP BY service_id, start_time, tenant_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_session_capacity_tenant_id'), table_name='session_capacity')
+    op.drop_table('session_capacity')
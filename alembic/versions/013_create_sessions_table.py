@@ -0,0 +1,46 @@
+"""create sessions table
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('service_id', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('end_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['service_id'], ['services.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('service_id', 'start_time', name='uq_sessions_service_start')
+    )
+    op.create_index(op.f('ix_sessions_id'), 'sessions', ['id'], unique=False)
+    op.create_index('ix_sessions_tenant_start', 'sessions', ['tenant_id', 'start_time'], unique=False)
+    
+    op.add_column('tenants', sa.Column('sessions_valid_from', sa.Date(), nullable=True))
+    op.add_column('tenants', sa.Column('sessions_valid_until', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('tenants', 'sessions_valid_until')
+    op.drop_column('tenants', 'sessions_valid_from')
+    op.drop_index('ix_sessions_tenant_start', table_name='sessions')
+    op.drop_index(op.f('ix_sessions_id'), table_name='sessions')
+    op.drop_table('sessions')
@@ -0,0 +1,81 @@
+"""add booking overlap exclusion
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+OVERLAP_CHECK = """
+    WHEN NEW.is_exclusive AND NEW.status IN ('CONFIRMED', 'COMPLETED')
+    BEGIN
+        SELECT RAISE(ABORT, 'ex_bookings_no_overlap')
+        WHERE EXISTS (
+            SELECT 1 FROM bookings
+            WHERE tenant_id = NEW.tenant_id
+              AND service_id = NEW.service_id
+              AND id IS NOT NEW.id
+              AND is_exclusive
+              AND status IN ('CONFIRMED', 'COMPLETED')
+              AND start_time < NEW.end_time
+              AND end_time > NEW.start_time
+        );
+    END
+"""
+
+
+def upgrade() -> None:
+    op.add_column('bookings', sa.Column('is_exclusive', sa.Boolean(), nullable=False, server_default=sa.false()))
+    
+    # Mark bookings of single-seat services as exclusive. A booking that
+    # already overlaps an earlier active one stays unmarked, so existing
+    # double bookings do not block the constraint.
+    op.execute("""
+        UPDATE bookings SET is_exclusive = TRUE
+        WHERE service_id IN (
+            SELECT id FROM services WHERE COALESCE(max_capacity, 1) = 1
+        )
+        AND NOT EXISTS (
+            SELECT 1 FROM bookings earlier
+            WHERE earlier.tenant_id = bookings.tenant_id
+              AND earlier.service_id = bookings.service_id
+              AND earlier.id < bookings.id
+              AND earlier.status IN ('CONFIRMED', 'COMPLETED')
+              AND earlier.start_time < bookings.end_time
+              AND earlier.end_time > bookings.start_time
+        )
+    """)
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute("""
+            ALTER TABLE bookings ADD COLUMN during tstzrange
+            GENERATED ALWAYS AS (tstzrange(start_time, end_time, '[)')) STORED
+        """)
+        op.execute("""
+            ALTER TABLE bookings ADD CONSTRAINT ex_bookings_no_overlap
+            EXCLUDE USING gist (tenant_id WITH =, service_id WITH =, during WITH &&)
+            WHERE (is_exclusive AND status IN ('CONFIRMED', 'COMPLETED'))
+        """)
+    else:
+        op.execute(f"CREATE TRIGGER ex_bookings_no_overlap_insert BEFORE INSERT ON bookings {OVERLAP_CHECK}")
+        op.execute(f"CREATE TRIGGER ex_bookings_no_overlap_update BEFORE UPDATE ON bookings {OVERLAP_CHECK}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE bookings DROP CONSTRAINT ex_bookings_no_overlap")
+        op.execute("ALTER TABLE bookings DROP COLUMN during")
+    else:
+        op.execute("DROP TRIGGER ex_bookings_no_overlap_insert")
+        op.execute("DROP TRIGGER ex_bookings_no_overlap_update")
+    op.drop_column('bookings', 'is_exclusive')
@@ -0,0 +1,35 @@
+"""create booking_locks table
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only used by advisory admission mode on databases without
+    # pg_advisory_xact_lock
+    op.create_table(
+        'booking_locks',
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('service_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['service_id'], ['services.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tenant_id', 'service_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('booking_locks')
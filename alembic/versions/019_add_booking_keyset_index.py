@@ -0,0 +1,30 @@
+"""add booking tenant/start/id index
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '019'
+down_revision = '018'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Supports keyset pagination of the booking list on (start_time, id)
+    op.create_index(
+        'ix_bookings_tenant_start_id',
+        'bookings',
+        ['tenant_id', 'start_time', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_tenant_start_id', table_name='bookings')
@@ -0,0 +1,44 @@
+"""add booking customer search indexes
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '021'
+down_revision = '020'
+branch_labels = None
+depends_on = None
+
+SEARCH_COLUMNS = {
+    'customer_name': 'lower(customer_name)',
+    'customer_email': 'lower(customer_email)',
+    'customer_phone': 'customer_phone',
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # Trigram indexes match a search term anywhere in the field
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+        for column, field in SEARCH_COLUMNS.items():
+            op.execute(
+                f"CREATE INDEX ix_bookings_{column}_trgm ON bookings "
+                f"USING gin (tenant_id, {field} gin_trgm_ops)"
+            )
+    else:
+        # No trigram index: prefix matches use expression b-tree indexes
+        for column, field in SEARCH_COLUMNS.items():
+            op.execute(f"CREATE INDEX ix_bookings_{column}_prefix ON bookings (tenant_id, {field})")
+
+
+def downgrade() -> None:
+    suffix = 'trgm' if op.get_bind().dialect.name == 'postgresql' else 'prefix'
+    for column in SEARCH_COLUMNS:
+        op.execute(f"DROP INDEX ix_bookings_{column}_{suffix}")
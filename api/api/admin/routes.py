@@ -1,11 +1,10 @@
 from fastapi import APIRouter, Request, Depends, Query, Response
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy import and_
 from datetime import datetime, date
 from typing import Optional
-import csv
-import io
+from urllib.parse import urlencode
 
 from api.core.database import get_db
 from api.core.permissions import require_tenant_access, require_admin_access
@@ -13,10 +12,15 @@ from api.models.booking import Booking, BookingStatus
 from api.models.service import Service
 from api.models.tenant import Tenant
 from api.models.user import User
+from api.services.booking_export import ADMIN_HEADER, ExportFormat, admin_row, apply_booking_filters, export_response
+from api.services.booking_search import SEARCH_MIN_LENGTH, fetch_search_page, search_tiers
 
 router = APIRouter()
 templates = Jinja2Templates(directory="api/templates")
 
+# Bookings shown per page of the admin bookings view
+ADMIN_BOOKINGS_PAGE_SIZE = 50
+
 
 @router.get("/bookings", response_class=HTMLResponse)
 def admin_bookings_view(
@@ -25,27 +29,44 @@ def admin_bookings_view(
     end_date: Optional[date] = Query(None),
     status: Optional[BookingStatus] = Query(None),
     service_id: Optional[int] = Query(None),
+    search: Optional[str] = Query(None, max_length=255),
+    page: int = Query(1, ge=1),
     tenant: Tenant = Depends(require_tenant_access),
     current_user: User = Depends(require_admin_access),
     db = Depends(get_db)
 ):
-    """Admin view for bookings with filters."""
+    """Admin view for bookings with filters and customer search, a page at a time."""
     
     # Build query
-    query = db.query(Booking).filter(Booking.tenant_id == tenant.id)
-    
-    # Apply filters
-    if start_date:
-        query = query.filter(Booking.start_time >= datetime.combine(start_date, datetime.min.time()))
-    if end_date:
-        query = query.filter(Booking.start_time <= datetime.combine(end_date, datetime.max.time()))
-    if status:
-        query = query.filter(Booking.status == status)
-    if service_id:
-        query = query.filter(Booking.service_id == service_id)
+    query = apply_booking_filters(
+        db.query(Booking).filter(Booking.tenant_id == tenant.id),
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        service_id=service_id
+    )
     
-    # Order by start time descending (most recent first)
-    bookings = query.order_by(Booking.start_time.desc()).all()
+    # Best customer matches first when searching, one query per rank
+    search = (search or "").strip() or None
+    search_error = None
+    offset = (page - 1) * ADMIN_BOOKINGS_PAGE_SIZE
+    if search and len(search) < SEARCH_MIN_LENGTH:
+        search_error = f"Enter at least {SEARCH_MIN_LENGTH} characters to search customers"
+        bookings = []
+    elif search:
+        tiers = search_tiers(search, db.get_bind().dialect.name)
+        bookings = [
+            booking
+            for _, booking in fetch_search_page(query, tiers, ADMIN_BOOKINGS_PAGE_SIZE + 1, offset=offset)
+        ]
+    else:
+        # Order by start time descending (most recent first)
+        query = query.order_by(Booking.start_time.desc(), Booking.id.desc())
+        bookings = query.offset(offset).limit(ADMIN_BOOKINGS_PAGE_SIZE + 1).all()
+    
+    # One extra row tells whether there is a next page
+    has_next = len(bookings) > ADMIN_BOOKINGS_PAGE_SIZE
+    bookings = bookings[:ADMIN_BOOKINGS_PAGE_SIZE]
     
     # Get all services for filter dropdown
     services = db.query(Service).filter(
@@ -62,84 +83,41 @@ def admin_bookings_view(
             "start_date": start_date,
             "end_date": end_date,
             "status": status.value if status else None,
-            "service_id": service_id
+            "service_id": service_id,
+            "search": search
         },
+        "search_error": search_error,
+        "search_min_length": SEARCH_MIN_LENGTH,
+        "page": page,
+        "has_next": has_next,
+        # Current filters, for the pagination links
+        "page_query": urlencode([(key, value) for key, value in request.query_params.multi_items() if key != "page"]),
         "active_page": "bookings"
     })
 
 
 @router.get("/bookings/export")
 def export_bookings_csv(
+    request: Request,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     status: Optional[BookingStatus] = Query(None),
     service_id: Optional[int] = Query(None),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
     tenant: Tenant = Depends(require_tenant_access),
     current_user: User = Depends(require_admin_access),
     db = Depends(get_db)
 ):
-    """Export bookings to CSV with same filters as view."""
-    
-    # Build query (same as view)
-    query = db.query(Booking).filter(Booking.tenant_id == tenant.id)
-    
-    if start_date:
-        query = query.filter(Booking.start_time >= datetime.combine(start_date, datetime.min.time()))
-    if end_date:
-        query = query.filter(Booking.start_time <= datetime.combine(end_date, datetime.max.time()))
-    if status:
-        query = query.filter(Booking.status == status)
-    if service_id:
-        query = query.filter(Booking.service_id == service_id)
-    
-    bookings = query.order_by(Booking.start_time.desc()).all()
-    
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow([
-        'Date',
-        'Start Time',
-        'End Time',
-        'Customer Name',
-        'Customer Email',
-        'Customer Phone',
-        'Service',
-        'Duration (min)',
-        'Status',
-        'Notes',
-        'Created At'
-    ])
-    
-    # Write data
-    for booking in bookings:
-        status_value = booking.status.value if hasattr(booking.status, 'value') else str(booking.status)
-        writer.writerow([
-            booking.start_time.strftime('%Y-%m-%d'),
-            booking.start_time.strftime('%H:%M'),
-            booking.end_time.strftime('%H:%M'),
-            booking.customer_name,
-            booking.customer_email,
-            booking.customer_phone or '',
-            booking.service.name,
-            booking.service.duration_minutes,
-            status_value.upper(),
-            booking.notes or '',
-            booking.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        ])
-    
-    # Prepare response
-    output.seek(0)
-    filename = f"bookings_{tenant.slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
+    """Export bookings to CSV (or csv.gz / ndjson) with same filters as view, streamed in batches."""
+    return export_response(
+        db, tenant.id, export_format,
+        request.headers.get("accept-encoding", ""),
+        f"bookings_{tenant.slug}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        ADMIN_HEADER, admin_row,
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        service_id=service_id
     )
 
 
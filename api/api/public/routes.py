@@ -5,10 +5,12 @@ from fastapi import APIRouter, Request, Depends, Query, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from api.core.tenant_context import require_tenant
-from api.core.database import get_db
+from api.core.database import get_async_db
 from api.models.tenant import Tenant
 from api.models.service import Service
 from api.models.booking import Booking
@@ -47,7 +49,7 @@ async def preview_branding(
 async def booking_step1_services(
     request: Request,
     tenant: Tenant = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Step 1: Service Selection
@@ -56,10 +58,12 @@ async def booking_step1_services(
     css_vars = get_branding_css_vars(branding)
     
     # Get active services for this tenant
-    services = db.query(Service).filter(
-        Service.tenant_id == tenant.id,
-        Service.is_active == True
-    ).all()
+    services = (await db.execute(
+        select(Service).where(
+            Service.tenant_id == tenant.id,
+            Service.is_active == True
+        )
+    )).scalars().all()
     
     return templates.TemplateResponse(
         "public/book_step1_services.html",
@@ -82,7 +86,7 @@ async def booking_step2_slots(
     service_id: int = Query(...),
     date: str = Query(None),
     tenant: Tenant = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Step 2: Time Slot Selection
@@ -91,11 +95,13 @@ async def booking_step2_slots(
     css_vars = get_branding_css_vars(branding)
     
     # Get service
-    service = db.query(Service).filter(
-        Service.id == service_id,
-        Service.tenant_id == tenant.id,
-        Service.is_active == True
-    ).first()
+    service = (await db.execute(
+        select(Service).where(
+            Service.id == service_id,
+            Service.tenant_id == tenant.id,
+            Service.is_active == True
+        )
+    )).scalars().first()
     
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
@@ -117,20 +123,19 @@ async def booking_step2_slots(
     selected_date = date or today.isoformat()
     
     if date:
-        slot_generator = SlotGenerator(db)
-        start_date = datetime.fromisoformat(selected_date)
-        end_date = start_date + timedelta(days=1)
+        slot_date = datetime.fromisoformat(selected_date).date()
         
-        available_slots = slot_generator.generate_slots(
-            service_id=service_id,
-            start_date=start_date,
-            end_date=end_date,
-            tenant_id=tenant.id
+        available_slots = await db.run_sync(
+            lambda session: SlotGenerator(session, tenant.id).generate_slots(
+                service_id=service_id,
+                start_date=slot_date,
+                end_date=slot_date
+            )
         )
         
         slots = [{
-            "start_time": slot["start_time"].isoformat(),
-            "time_display": slot["start_time"].strftime("%I:%M %p"),
+            "start_time": slot["start_time"],
+            "time_display": datetime.fromisoformat(slot["start_time"]).strftime("%I:%M %p"),
             "available": True
         } for slot in available_slots]
     
@@ -159,7 +164,7 @@ async def booking_step3_details(
     date: str = Query(...),
     time: str = Query(...),
     tenant: Tenant = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Step 3: Customer Details
@@ -168,10 +173,12 @@ async def booking_step3_details(
     css_vars = get_branding_css_vars(branding)
     
     # Get service
-    service = db.query(Service).filter(
-        Service.id == service_id,
-        Service.tenant_id == tenant.id
-    ).first()
+    service = (await db.execute(
+        select(Service).where(
+            Service.id == service_id,
+            Service.tenant_id == tenant.id
+        )
+    )).scalars().first()
     
     if not service:
         raise HTTPException(status_code=404, detail="Service not found")
@@ -201,7 +208,7 @@ async def booking_step4_confirmation(
     request: Request,
     booking_id: int = Query(...),
     tenant: Tenant = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Step 4: Booking Confirmation
@@ -209,19 +216,17 @@ async def booking_step4_confirmation(
     branding = tenant.get_branding()
     css_vars = get_branding_css_vars(branding)
     
-    # Get booking with service
-    booking = db.query(Booking).filter(
-        Booking.id == booking_id,
-        Booking.tenant_id == tenant.id
-    ).first()
+    # Get booking with service (loaded up front; the template cannot lazy-load)
+    booking = (await db.execute(
+        select(Booking).options(joinedload(Booking.service)).where(
+            Booking.id == booking_id,
+            Booking.tenant_id == tenant.id
+        )
+    )).scalars().first()
     
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
-    # Get service details
-    service = db.query(Service).filter(Service.id == booking.service_id).first()
-    booking.service = service
-    
     return templates.TemplateResponse(
         "public/book_step4_confirmation.html",
         {
@@ -6,6 +6,9 @@ from api.core.tenant_context import require_tenant
 from api.models.availability import Availability
 from api.models.tenant import Tenant
 from api.schemas.availability import AvailabilityCreate, AvailabilityResponse, AvailabilityUpdate
+from api.services.availability_cache import bump_availability_version
+from api.services.slot_inventory import SlotInventoryManager
+from api.services.session_store import SessionStore
 
 router = APIRouter()
 
@@ -55,6 +58,9 @@ def create_availability(
     """Create a new availability window for the current tenant."""
     availability = Availability(**availability_in.model_dump(), tenant_id=tenant.id)
     db.add(availability)
+    bump_availability_version(tenant)
+    SlotInventoryManager(db, tenant.id).availability_changed()
+    SessionStore(db, tenant.id).refresh()
     db.commit()
     db.refresh(availability)
     return availability
@@ -83,6 +89,9 @@ def update_availability(
     for field, value in update_data.items():
         setattr(availability, field, value)
     
+    bump_availability_version(tenant)
+    SlotInventoryManager(db, tenant.id).availability_changed()
+    SessionStore(db, tenant.id).refresh()
     db.commit()
     db.refresh(availability)
     return availability
@@ -107,5 +116,8 @@ def delete_availability(
         )
     
     db.delete(availability)
+    bump_availability_version(tenant)
+    SlotInventoryManager(db, tenant.id).availability_changed()
+    SessionStore(db, tenant.id).refresh()
     db.commit()
     return None
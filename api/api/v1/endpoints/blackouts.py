@@ -7,6 +7,9 @@ from api.core.tenant_context import require_tenant
 from api.models.availability import Blackout
 from api.models.tenant import Tenant
 from api.schemas.availability import BlackoutCreate, BlackoutResponse, BlackoutUpdate
+from api.services.slot_inventory import SlotInventoryManager
+from api.services.session_cache import bump_sessions_version
+from api.services.session_store import SessionStore
 
 router = APIRouter()
 
@@ -64,6 +67,9 @@ def create_blackout(
     """Create a new blackout for the current tenant."""
     blackout = Blackout(**blackout_in.model_dump(), tenant_id=tenant.id)
     db.add(blackout)
+    SlotInventoryManager(db, tenant.id).blackout_changed(blackout.start_datetime, blackout.end_datetime)
+    SessionStore(db, tenant.id).refresh()
+    bump_sessions_version(db, tenant.id)
     db.commit()
     db.refresh(blackout)
     return blackout
@@ -88,10 +94,19 @@ def update_blackout(
             detail="Blackout not found"
         )
     
+    previous = (blackout.start_datetime, blackout.end_datetime)
+    
     update_data = blackout_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(blackout, field, value)
     
+    # Regenerate inventory for the days covered before and after the change
+    inventory = SlotInventoryManager(db, tenant.id)
+    inventory.blackout_changed(*previous)
+    inventory.blackout_changed(blackout.start_datetime, blackout.end_datetime)
+    SessionStore(db, tenant.id).refresh()
+    bump_sessions_version(db, tenant.id)
+    
     db.commit()
     db.refresh(blackout)
     return blackout
@@ -116,5 +131,8 @@ def delete_blackout(
         )
     
     db.delete(blackout)
+    SlotInventoryManager(db, tenant.id).blackout_changed(blackout.start_datetime, blackout.end_datetime)
+    SessionStore(db, tenant.id).refresh()
+    bump_sessions_version(db, tenant.id)
     db.commit()
     return None
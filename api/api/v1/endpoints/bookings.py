@@ -1,108 +1,317 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
-from fastapi.responses import StreamingResponse
-from sqlalchemy import and_, or_
-from datetime import datetime
-import csv
-import io
+from typing import Annotated, List, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Request, Response, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+from datetime import date, datetime
+import base64
+import os
 
 from api.core.database import get_db
 from api.core.permissions import require_tenant_access, verify_resource_ownership
 from api.core.auth import get_current_user
 from api.core.config import settings
 from api.models.booking import Booking, BookingStatus
+from api.models.export_job import ExportJob, ExportJobStatus
 from api.models.service import Service
 from api.models.tenant import Tenant
 from api.models.user import User
-from api.schemas.booking import BookingCreate, BookingResponse, BookingUpdate, BookingListItem
-from api.services.slot_generator import SlotGenerator
-from api.services.email_service import email_service
+from api.schemas.booking import (
+    BookingCreate, BookingResponse, BookingUpdate, BookingListItem, BulkBookingReport,
+    ExportJobResponse
+)
+from api.services.booking_admission import admit_booking, is_double_booking, is_exclusive_service
+from api.services.booking_export import API_HEADER, EXPORT_MEDIA_TYPES, ExportFormat, api_row, export_response
+from api.services.booking_import import CREATED, BookingImporter, parse_bulk_payload
+from api.services.booking_search import SEARCH_MIN_LENGTH, fetch_search_page, search_tiers
+from api.services.email_outbox import enqueue_booking_emails
+from api.services.export_jobs import create_export_job, export_file_path, iter_file_range, parse_range
+from api.services.idempotency import IDEMPOTENCY_HEADER, IdempotencyGuard, request_fingerprint
+from api.services.slot_generator import Admission, SlotGenerator
+from api.services.slot_inventory import SlotInventoryManager
+from api.services.session_capacity import record_booking_change, session_key
+from api.services.session_cache import bump_sessions_version
 
 router = APIRouter()
 
 
 @router.get("/export")
 def export_bookings_csv(
+    request: Request,
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    status: Optional[BookingStatus] = Query(None),
+    service_id: Optional[int] = Query(None),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
     tenant: Tenant = Depends(require_tenant_access),
     db = Depends(get_db)
 ):
     """
     Export all bookings as CSV file.
     Requires authentication.
+    
+    Rows are streamed from a server-side cursor in batches, so the
+    response starts at once and memory use does not grow with the tenant.
+    `format` may also be csv.gz (a gzipped CSV file) or ndjson; csv and
+    ndjson are gzip-encoded on the fly when Accept-Encoding allows it.
+    For very large exports use POST /export/jobs instead.
     """
-    # Get all bookings for the tenant
-    bookings = db.query(Booking).filter(
-        Booking.tenant_id == tenant.id
-    ).order_by(Booking.start_time.desc()).all()
-    
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow([
-        'Booking ID',
-        'Date',
-        'Start Time',
-        'End Time',
-        'Service',
-        'Customer Name',
-        'Customer Email',
-        'Customer Phone',
-        'Status',
-        'Notes',
-        'Created At'
-    ])
-    
-    # Write booking data
-    for booking in bookings:
-        service = db.query(Service).filter(Service.id == booking.service_id).first()
-        service_name = service.name if service else 'Unknown'
-        
-        writer.writerow([
-            booking.id,
-            booking.start_time.strftime('%Y-%m-%d'),
-            booking.start_time.strftime('%H:%M'),
-            booking.end_time.strftime('%H:%M'),
-            service_name,
-            booking.customer_name,
-            booking.customer_email,
-            booking.customer_phone or '',
-            booking.status.value,
-            booking.notes or '',
-            booking.created_at.strftime('%Y-%m-%d %H:%M:%S')
-        ])
-    
-    # Prepare response
-    output.seek(0)
+    return export_response(
+        db, tenant.id, export_format,
+        request.headers.get("accept-encoding", ""),
+        f"bookings_{datetime.now().strftime('%Y%m%d')}",
+        API_HEADER, api_row,
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        service_id=service_id
+    )
+
+
+def _export_job_response(job: ExportJob) -> dict:
+    """Build the ExportJobResponse body for a job, with its download URL once completed."""
+    body = ExportJobResponse.model_validate(job).model_dump()
+    if job.status == ExportJobStatus.COMPLETED:
+        body["download_url"] = f"{settings.API_V1_STR}/bookings/export/jobs/{job.id}/download"
+    return body
+
+
+def _get_export_job(db, tenant: Tenant, job_id: int) -> ExportJob:
+    job = db.query(ExportJob).filter(
+        ExportJob.id == job_id,
+        ExportJob.tenant_id == tenant.id
+    ).first()
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+    return job
+
+
+@router.post("/export/jobs", response_model=ExportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def start_export_job(
+    response: Response,
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    status: Optional[BookingStatus] = Query(None),
+    service_id: Optional[int] = Query(None),
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    tenant: Tenant = Depends(require_tenant_access),
+    db = Depends(get_db)
+):
+    """
+    Queue a booking export to be built in the background.
+    
+    Takes the same filters and formats as GET /export. Poll the URL in
+    the Location header until the job is completed, then fetch its
+    download_url, which supports Range requests for resuming.
+    """
+    job = create_export_job(
+        db, tenant.id, export_format,
+        start_date=start_date,
+        end_date=end_date,
+        status=status,
+        service_id=service_id
+    )
+    db.commit()
+    db.refresh(job)
+    
+    response.headers["Location"] = f"{settings.API_V1_STR}/bookings/export/jobs/{job.id}"
+    return _export_job_response(job)
+
+
+@router.get("/export/jobs/{job_id}", response_model=ExportJobResponse)
+def get_export_job(
+    job_id: int,
+    tenant: Tenant = Depends(require_tenant_access),
+    db = Depends(get_db)
+):
+    """Get the status of an export job."""
+    return _export_job_response(_get_export_job(db, tenant, job_id))
+
+
+@router.get("/export/jobs/{job_id}/download")
+def download_export_job(
+    job_id: int,
+    range_header: Annotated[Optional[str], Header(alias="Range")] = None,
+    if_range: Annotated[Optional[str], Header(alias="If-Range")] = None,
+    tenant: Tenant = Depends(require_tenant_access),
+    db = Depends(get_db)
+):
+    """
+    Download a completed export job's file.
+    
+    Supports single byte ranges (Range: bytes=start-end), so an interrupted
+    download can resume with If-Range set to the ETag of the first response.
+    """
+    job = _get_export_job(db, tenant, job_id)
+    if job.status != ExportJobStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job is {job.status.value}"
+        )
+    
+    path = export_file_path(job)
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Export file has expired"
+        )
+    
+    size = job.file_size
+    etag = f'"export-{job.id}-{size}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Content-Disposition": f"attachment; filename=bookings_export_{job.id}.{job.format}"
+    }
+    media_type = EXPORT_MEDIA_TYPES[ExportFormat(job.format)]
+    
+    byte_range = None
+    # A stale If-Range means the file changed: send it whole
+    if if_range is None or if_range == etag:
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={"Content-Range": f"bytes */{size}"}
+            )
+    
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iter_file_range(path, 0, size - 1), media_type=media_type, headers=headers)
+    
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": f"attachment; filename=bookings_{datetime.now().strftime('%Y%m%d')}.csv"
-        }
+        iter_file_range(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers
+    )
+
+
+def _flush_or_conflict(db) -> None:
+    """Flush pending booking writes, turning an overlap with another booking into a 409."""
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_double_booking(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This time slot is already booked"
+        )
+
+
+def _encode_cursor(start_time: datetime, booking_id: int, rank: Optional[int] = None) -> str:
+    """Build an opaque cursor resuming after the booking with this (start_time, id), and search rank."""
+    value = f"{start_time.isoformat()}|{booking_id}"
+    if rank is not None:
+        value += f"|{rank}"
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def _decode_cursor(cursor: str, ranked: bool = False) -> Tuple[datetime, int, Optional[int]]:
+    try:
+        start_time, booking_id, *rank = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        # Search cursors carry the rank, list cursors do not
+        if len(rank) != (1 if ranked else 0):
+            raise ValueError("Cursor does not match the query")
+        return datetime.fromisoformat(start_time), int(booking_id), int(rank[0]) if rank else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _search_tiers(db, search: str):
+    """Split a customer search into its per-rank filters."""
+    try:
+        return search_tiers(search, db.get_bind().dialect.name)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+def _booking_response(booking: Booking, service_name: Optional[str]) -> dict:
+    """Build the BookingResponse body for a booking."""
+    return {
+        "id": booking.id,
+        "tenant_id": booking.tenant_id,
+        "service_id": booking.service_id,
+        "service_name": service_name,
+        "start_time": booking.start_time,
+        "end_time": booking.end_time,
+        "customer_name": booking.customer_name,
+        "customer_email": booking.customer_email,
+        "customer_phone": booking.customer_phone,
+        "status": booking.status,
+        "notes": booking.notes,
+        "created_at": booking.created_at,
+        "updated_at": booking.updated_at
+    }
+
+
+def _claim_idempotency_key(guard: IdempotencyGuard) -> Optional[JSONResponse]:
+    """Claim the request's Idempotency-Key, returning the stored response if it was already used."""
+    try:
+        record = guard.claim()
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc)
+        )
+    
+    if record is None:
+        return None
+    return JSONResponse(
+        content=record.response_body,
+        status_code=record.status_code,
+        headers={"Idempotent-Replayed": "true"}
     )
 
 
 @router.post("/public", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 def create_public_booking(
     booking_in: BookingCreate,
+    idempotency_key: Annotated[Optional[str], Header(alias=IDEMPOTENCY_HEADER, max_length=255)] = None,
     db = Depends(get_db)
 ):
     """
     Create a new booking from public booking form (no authentication required).
     Automatically assigns to tenant ID 1 (NBNE Signs).
+    A retry with the same Idempotency-Key header gets the original response back.
     """
     tenant_id = 1  # Default to NBNE Signs tenant
     
-    # Verify service exists and is active
-    service = db.query(Service).filter(
-        Service.id == booking_in.service_id,
-        Service.tenant_id == tenant_id,
-        Service.is_active == True
-    ).first()
+    guard = None
+    if idempotency_key:
+        guard = IdempotencyGuard(db, tenant_id, idempotency_key, request_fingerprint("bookings.public", booking_in))
+        replay = _claim_idempotency_key(guard)
+        if replay is not None:
+            return replay
+    
+    # Same admission as create_booking: service, availability window,
+    # blackouts and capacity in one round-trip
+    admission, service = admit_booking(
+        SlotGenerator(db, tenant_id),
+        booking_in.service_id,
+        booking_in.start_time,
+        booking_in.end_time
+    )
     
-    if not service:
+    if admission == Admission.SERVICE_NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Service not found"
@@ -115,49 +324,71 @@ def create_public_booking(
             detail="end_time must be after start_time"
         )
     
-    # Create booking with PENDING status
+    if admission == Admission.UNAVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Selected time slot is not available"
+        )
+    
+    if admission == Admission.FULL:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This time slot is already booked"
+        )
+    
     booking = Booking(
         **booking_in.model_dump(),
         tenant_id=tenant_id,
-        status=BookingStatus.PENDING
+        status=BookingStatus.CONFIRMED,
+        is_exclusive=is_exclusive_service(service)
     )
     
     db.add(booking)
-    db.commit()
-    db.refresh(booking)
+    _flush_or_conflict(db)
+    SlotInventoryManager(db, tenant_id).booking_changed(booking)
+    record_booking_change(db, None, booking)
     
     # Return booking with service name
-    return {
-        "id": booking.id,
-        "tenant_id": booking.tenant_id,
-        "service_id": booking.service_id,
-        "service_name": service.name,
-        "start_time": booking.start_time,
-        "end_time": booking.end_time,
-        "customer_name": booking.customer_name,
-        "customer_email": booking.customer_email,
-        "customer_phone": booking.customer_phone,
-        "status": booking.status,
-        "notes": booking.notes,
-        "created_at": booking.created_at,
-        "updated_at": booking.updated_at
-    }
+    response = _booking_response(booking, service.name)
+    if guard:
+        guard.save(status.HTTP_201_CREATED, jsonable_encoder(BookingResponse(**response)))
+    bump_sessions_version(db, tenant_id)
+    db.commit()
+    return response
 
 
 @router.get("/", response_model=List[BookingListItem])
 def list_bookings(
     request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     status: BookingStatus = Query(None),
     service_id: int = Query(None),
     start_date: datetime = Query(None),
     end_date: datetime = Query(None),
+    search: Optional[str] = Query(None, min_length=SEARCH_MIN_LENGTH, max_length=255),
     tenant: Tenant = Depends(require_tenant_access),
     db = Depends(get_db)
 ):
-    """List all bookings for the current tenant with optional filters (authenticated)."""
-    query = db.query(Booking).filter(Booking.tenant_id == tenant.id)
+    """
+    List all bookings for the current tenant with optional filters (authenticated).
+    
+    Bookings are returned newest first. When there are more, the
+    X-Next-Cursor header holds a cursor for the following page; pass it
+    back as `cursor` to page by keyset on (start_time, id), which stays
+    fast at any depth, instead of `skip`.
+    
+    `search` matches customer name, email or phone (anywhere in the field
+    on PostgreSQL, as a prefix on SQLite). Matches are ranked exact, then
+    prefix, then substring, newest first within a rank; each rank is read
+    with its own index-backed query.
+    """
+    # Service names come from the same query
+    query = db.query(Booking, Service.name).outerjoin(
+        Service, Service.id == Booking.service_id
+    ).filter(Booking.tenant_id == tenant.id)
     
     if status:
         query = query.filter(Booking.status == status)
@@ -171,16 +402,38 @@ def list_bookings(
     if end_date:
         query = query.filter(Booking.start_time <= end_date)
     
-    bookings = query.order_by(Booking.start_time.desc()).offset(skip).limit(limit).all()
-    
-    # Enrich with service names
-    result = []
-    for booking in bookings:
-        service = db.query(Service).filter(Service.id == booking.service_id).first()
-        result.append({
+    if search is not None:
+        # One query per rank, each driven by the search indexes
+        after = None
+        if cursor:
+            after_start, after_id, after_rank = _decode_cursor(cursor, ranked=True)
+            after = (after_rank, after_start, after_id)
+        matches = fetch_search_page(query, _search_tiers(db, search), limit + 1, after, 0 if cursor else skip)
+        rows = [row for _, row in matches]
+        ranks = [rank for rank, _ in matches]
+    else:
+        # id breaks ties between equal start times, so pages never skip or repeat rows
+        query = query.order_by(Booking.start_time.desc(), Booking.id.desc())
+        if cursor:
+            after_start, after_id, _ = _decode_cursor(cursor)
+            query = query.filter(tuple_(Booking.start_time, Booking.id) < tuple_(after_start, after_id))
+        elif skip:
+            query = query.offset(skip)
+        # One extra row tells whether another page exists
+        rows = query.limit(limit + 1).all()
+        ranks = None
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(last[0].start_time, last[0].id, ranks[limit - 1] if ranks else None)
+    
+    result = [
+        {
             "id": booking.id,
             "service_id": booking.service_id,
-            "service_name": service.name if service else "Unknown",
+            "service_name": service_name or "Unknown",
             "start_time": booking.start_time,
             "end_time": booking.end_time,
             "customer_name": booking.customer_name,
@@ -188,8 +441,12 @@ def list_bookings(
             "customer_phone": booking.customer_phone,
             "status": booking.status,
             "created_at": booking.created_at
-        })
+        }
+        for booking, service_name in rows
+    ]
     
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return result
 
 
@@ -217,43 +474,39 @@ def get_booking(
     
     # Enrich with service name
     service = db.query(Service).filter(Service.id == booking.service_id).first()
-    booking_dict = {
-        "id": booking.id,
-        "tenant_id": booking.tenant_id,
-        "service_id": booking.service_id,
-        "service_name": service.name if service else None,
-        "start_time": booking.start_time,
-        "end_time": booking.end_time,
-        "customer_name": booking.customer_name,
-        "customer_email": booking.customer_email,
-        "customer_phone": booking.customer_phone,
-        "status": booking.status,
-        "notes": booking.notes,
-        "created_at": booking.created_at,
-        "updated_at": booking.updated_at
-    }
-    
-    return booking_dict
+    return _booking_response(booking, service.name if service else None)
 
 
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 def create_booking(
     booking_in: BookingCreate,
+    idempotency_key: Annotated[Optional[str], Header(alias=IDEMPOTENCY_HEADER, max_length=255)] = None,
     tenant: Tenant = Depends(require_tenant_access),
     db = Depends(get_db)
 ):
     """
     Create a new booking with double-booking prevention.
     Uses database transaction isolation to prevent race conditions.
+    A retry with the same Idempotency-Key header gets the original response
+    back without creating another booking or queueing email again.
     """
-    # Verify service exists and belongs to tenant
-    service = db.query(Service).filter(
-        Service.id == booking_in.service_id,
-        Service.tenant_id == tenant.id,
-        Service.is_active == True
-    ).first()
+    guard = None
+    if idempotency_key:
+        guard = IdempotencyGuard(db, tenant.id, idempotency_key, request_fingerprint("bookings.create", booking_in))
+        replay = _claim_idempotency_key(guard)
+        if replay is not None:
+            return replay
+    
+    # Validate service, availability window, blackouts and capacity in one
+    # round-trip; concurrent overlaps are caught by the database guard
+    admission, service = admit_booking(
+        SlotGenerator(db, tenant.id),
+        booking_in.service_id,
+        booking_in.start_time,
+        booking_in.end_time
+    )
     
-    if not service:
+    if admission == Admission.SERVICE_NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Service not found"
@@ -266,40 +519,13 @@ def create_booking(
             detail="end_time must be after start_time"
         )
     
-    # Verify slot is available (checks availability windows and blackouts)
-    generator = SlotGenerator(db, tenant.id)
-    if not generator.is_slot_available(service.id, booking_in.start_time, booking_in.end_time):
+    if admission == Admission.UNAVAILABLE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Selected time slot is not available"
         )
     
-    # Check for overlapping bookings (double-booking prevention)
-    # Use FOR UPDATE to lock rows and prevent race conditions
-    overlapping = db.query(Booking).filter(
-        Booking.tenant_id == tenant.id,
-        Booking.service_id == booking_in.service_id,
-        Booking.status.in_([BookingStatus.CONFIRMED, BookingStatus.COMPLETED]),
-        or_(
-            # New booking starts during existing booking
-            and_(
-                Booking.start_time <= booking_in.start_time,
-                Booking.end_time > booking_in.start_time
-            ),
-            # New booking ends during existing booking
-            and_(
-                Booking.start_time < booking_in.end_time,
-                Booking.end_time >= booking_in.end_time
-            ),
-            # New booking completely contains existing booking
-            and_(
-                Booking.start_time >= booking_in.start_time,
-                Booking.end_time <= booking_in.end_time
-            )
-        )
-    ).with_for_update().first()
-    
-    if overlapping:
+    if admission == Admission.FULL:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="This time slot is already booked"
@@ -309,59 +535,98 @@ def create_booking(
     booking = Booking(
         **booking_in.model_dump(),
         tenant_id=tenant.id,
-        status=BookingStatus.CONFIRMED
+        status=BookingStatus.CONFIRMED,
+        is_exclusive=is_exclusive_service(service)
     )
     db.add(booking)
-    db.commit()
-    db.refresh(booking)
+    _flush_or_conflict(db)
+    SlotInventoryManager(db, tenant.id).booking_changed(booking)
+    record_booking_change(db, None, booking)
     
-    # Send email notifications (non-blocking - don't fail booking if email fails)
+    # Queue email notifications with the booking; the outbox worker sends them
     if settings.ENABLE_EMAIL_NOTIFICATIONS:
-        try:
-            # Send confirmation to customer
-            email_service.send_booking_confirmation_to_customer(
-                customer_email=booking.customer_email,
-                customer_name=booking.customer_name,
-                service_name=service.name,
-                start_time=booking.start_time,
-                end_time=booking.end_time,
-                tenant_name=tenant.name,
-                tenant_email=tenant.email,
-                tenant_phone=tenant.phone,
-                notes=booking.notes
-            )
-            
-            # Send notification to business
-            email_service.send_booking_notification_to_business(
-                business_email=tenant.email,
-                business_name=tenant.name,
-                customer_name=booking.customer_name,
-                customer_email=booking.customer_email,
-                customer_phone=booking.customer_phone,
-                service_name=service.name,
-                start_time=booking.start_time,
-                end_time=booking.end_time,
-                notes=booking.notes
-            )
-        except Exception as e:
-            # Log error but don't fail the booking
-            print(f"Email notification failed: {str(e)}")
+        enqueue_booking_emails(db, tenant, service.name, booking)
     
     # Return with service name
+    response = _booking_response(booking, service.name)
+    if guard:
+        guard.save(status.HTTP_201_CREATED, jsonable_encoder(BookingResponse(**response)))
+    bump_sessions_version(db, tenant.id)
+    db.commit()
+    
+    return response
+
+
+async def _request_body(request: Request) -> bytes:
+    """Read the raw request body for endpoints that parse it themselves."""
+    return await request.body()
+
+
+@router.post("/bulk", response_model=BulkBookingReport)
+def bulk_create_bookings(
+    body: bytes = Depends(_request_body),
+    content_type: Annotated[str, Header()] = "",
+    send_emails: bool = Query(False),
+    check_availability: bool = Query(True),
+    dry_run: bool = Query(False),
+    tenant: Tenant = Depends(require_tenant_access),
+    db = Depends(get_db)
+):
+    """
+    Import many bookings at once from a JSON list or a CSV file (text/csv).
+    
+    Rows are checked against existing bookings and each other in one pass
+    and inserted together; the response reports the outcome of every row.
+    Emails are only queued with send_emails=true. check_availability=false
+    skips the opening hours and blackout check (e.g. for past bookings),
+    and dry_run=true reports without writing.
+    """
+    try:
+        rows = parse_bulk_payload(body, content_type)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    
+    if len(rows) > settings.BULK_BOOKING_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_BOOKING_MAX_ROWS} bookings per request"
+        )
+    
+    try:
+        results = BookingImporter(db, tenant.id, check_availability).run(rows, dry_run=dry_run)
+        booking_ids = [result["booking_id"] for result in results if result["booking_id"] is not None]
+        if send_emails and booking_ids and settings.ENABLE_EMAIL_NOTIFICATIONS:
+            bookings = db.query(Booking).options(joinedload(Booking.service)).filter(
+                Booking.id.in_(booking_ids)
+            )
+            for booking in bookings:
+                enqueue_booking_emails(db, tenant, booking.service.name, booking)
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_double_booking(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A booking in the batch was taken concurrently, nothing was imported"
+        )
+    
+    created = sum(1 for result in results if result["status"] == CREATED)
+    if dry_run:
+        db.rollback()
+    else:
+        if created:
+            bump_sessions_version(db, tenant.id)
+        db.commit()
+    
     return {
-        "id": booking.id,
-        "tenant_id": booking.tenant_id,
-        "service_id": booking.service_id,
-        "service_name": service.name,
-        "start_time": booking.start_time,
-        "end_time": booking.end_time,
-        "customer_name": booking.customer_name,
-        "customer_email": booking.customer_email,
-        "customer_phone": booking.customer_phone,
-        "status": booking.status,
-        "notes": booking.notes,
-        "created_at": booking.created_at,
-        "updated_at": booking.updated_at
+        "total": len(results),
+        "created": created,
+        "failed": len(results) - created,
+        "dry_run": dry_run,
+        "results": results
     }
 
 
@@ -384,30 +649,27 @@ def update_booking(
             detail="Booking not found"
         )
     
+    previous = (booking.service_id, booking.start_time, booking.end_time)
+    previous_session = session_key(booking)
+    
     update_data = booking_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(booking, field, value)
+    _flush_or_conflict(db)
     
+    # Recount inventory for both the old and new time ranges
+    inventory = SlotInventoryManager(db, tenant.id)
+    inventory.refresh_booked(*previous)
+    inventory.booking_changed(booking)
+    record_booking_change(db, previous_session, booking)
+    
+    bump_sessions_version(db, tenant.id)
     db.commit()
     db.refresh(booking)
     
     # Return with service name
     service = db.query(Service).filter(Service.id == booking.service_id).first()
-    return {
-        "id": booking.id,
-        "tenant_id": booking.tenant_id,
-        "service_id": booking.service_id,
-        "service_name": service.name if service else None,
-        "start_time": booking.start_time,
-        "end_time": booking.end_time,
-        "customer_name": booking.customer_name,
-        "customer_email": booking.customer_email,
-        "customer_phone": booking.customer_phone,
-        "status": booking.status,
-        "notes": booking.notes,
-        "created_at": booking.created_at,
-        "updated_at": booking.updated_at
-    }
+    return _booking_response(booking, service.name if service else None)
 
 
 @router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -428,6 +690,10 @@ def cancel_booking(
             detail="Booking not found"
         )
     
+    previous_session = session_key(booking)
     booking.status = BookingStatus.CANCELLED
+    SlotInventoryManager(db, tenant.id).booking_changed(booking)
+    record_booking_change(db, previous_session, booking)
+    bump_sessions_version(db, tenant.id)
     db.commit()
     return None
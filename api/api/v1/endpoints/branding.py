@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, Dict
 
-from api.core.database import get_db
+from api.core.database import get_async_db
 from api.core.tenant_context import get_current_tenant
 from api.models.tenant import Tenant
 from pydantic import BaseModel
@@ -32,7 +32,7 @@ class BrandingResponse(BaseModel):
 @router.get("/public", response_model=BrandingResponse)
 async def get_tenant_branding(
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get tenant branding configuration for public-facing pages.
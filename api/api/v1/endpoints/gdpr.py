@@ -1,10 +1,11 @@
 from typing import Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 import json
 
-from api.core.database import get_db
+from api.core.database import get_async_db
 from api.core.auth import get_current_user
 from api.core.permissions import require_admin_access
 from api.core.audit import AuditLogger
@@ -41,7 +42,7 @@ class DataDeletionRequest(BaseModel):
 async def data_subject_access_request(
     request: DSARRequest,
     current_user: User = Depends(require_admin_access),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Data Subject Access Request (DSAR) - GDPR Article 15.
@@ -50,7 +51,9 @@ async def data_subject_access_request(
     Admin only to prevent unauthorized data access.
     """
     # Find user by email
-    user = db.query(User).filter(User.email == request.email).first()
+    user = (await db.execute(
+        select(User).where(User.email == request.email)
+    )).scalars().first()
     
     if not user:
         raise HTTPException(
@@ -73,9 +76,9 @@ async def data_subject_access_request(
     }
     
     # Collect bookings where user is the customer
-    bookings = db.query(Booking).filter(
-        Booking.customer_email == request.email
-    ).all()
+    bookings = (await db.execute(
+        select(Booking).where(Booking.customer_email == request.email)
+    )).scalars().all()
     
     bookings_data = [
         {
@@ -94,9 +97,11 @@ async def data_subject_access_request(
     ]
     
     # Collect audit logs
-    audit_logs = db.query(AuditLog).filter(
-        AuditLog.user_id == user.id
-    ).order_by(AuditLog.timestamp.desc()).limit(100).all()
+    audit_logs = (await db.execute(
+        select(AuditLog).where(
+            AuditLog.user_id == user.id
+        ).order_by(AuditLog.timestamp.desc()).limit(100)
+    )).scalars().all()
     
     audit_logs_data = [
         {
@@ -112,15 +117,15 @@ async def data_subject_access_request(
     request_id = f"DSAR-{user.id}-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
     
     # Audit log the DSAR
-    AuditLogger.log(
-        db=db,
+    await db.run_sync(lambda session: AuditLogger.log(
+        db=session,
         action=AuditAction.DATA_EXPORT,
         user=current_user,
         resource_type="user",
         resource_id=user.id,
         description=f"DSAR executed for {request.email}",
         metadata={"request_id": request_id, "target_email": request.email}
-    )
+    ))
     
     return DSARResponse(
         request_id=request_id,
@@ -136,7 +141,7 @@ async def delete_user_data(
     request: DataDeletionRequest,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(require_admin_access),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete or anonymize user data - GDPR Article 17 (Right to Erasure).
@@ -155,7 +160,9 @@ async def delete_user_data(
         )
     
     # Find user
-    user = db.query(User).filter(User.email == request.email).first()
+    user = (await db.execute(
+        select(User).where(User.email == request.email)
+    )).scalars().first()
     
     if not user:
         raise HTTPException(
@@ -172,9 +179,9 @@ async def delete_user_data(
     user.is_verified = False
     
     # Anonymize bookings
-    bookings = db.query(Booking).filter(
-        Booking.customer_email == request.email
-    ).all()
+    bookings = (await db.execute(
+        select(Booking).where(Booking.customer_email == request.email)
+    )).scalars().all()
     
     for booking in bookings:
         booking.customer_name = f"Deleted Customer {booking.id}"
@@ -182,11 +189,11 @@ async def delete_user_data(
         booking.customer_phone = None
         booking.notes = "[Customer data deleted per GDPR request]"
     
-    db.commit()
+    await db.commit()
     
     # Audit log the deletion
-    AuditLogger.log(
-        db=db,
+    await db.run_sync(lambda session: AuditLogger.log(
+        db=session,
         action=AuditAction.DATA_DELETE,
         user=current_user,
         resource_type="user",
@@ -196,7 +203,7 @@ async def delete_user_data(
             "original_email": request.email,
             "bookings_anonymized": len(bookings)
         }
-    )
+    ))
     
     return {
         "status": "success",
@@ -210,7 +217,7 @@ async def delete_user_data(
 @router.get("/retention-status")
 async def get_retention_status(
     current_user: User = Depends(require_admin_access),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get data retention status.
@@ -222,20 +229,26 @@ async def get_retention_status(
     
     # Count old audit logs (>2 years)
     two_years_ago = datetime.now(timezone.utc) - timedelta(days=730)
-    old_audit_logs = db.query(AuditLog).filter(
-        AuditLog.timestamp < two_years_ago
-    ).count()
+    old_audit_logs = await db.scalar(
+        select(func.count()).select_from(AuditLog).where(
+            AuditLog.timestamp < two_years_ago
+        )
+    )
     
     # Count inactive users (>1 year no login)
     one_year_ago = datetime.now(timezone.utc) - timedelta(days=365)
-    inactive_users = db.query(User).filter(
-        User.last_login < one_year_ago
-    ).count()
+    inactive_users = await db.scalar(
+        select(func.count()).select_from(User).where(
+            User.last_login < one_year_ago
+        )
+    )
     
     # Count old bookings (>2 years)
-    old_bookings = db.query(Booking).filter(
-        Booking.created_at < two_years_ago
-    ).count()
+    old_bookings = await db.scalar(
+        select(func.count()).select_from(Booking).where(
+            Booking.created_at < two_years_ago
+        )
+    )
     
     return {
         "audit_logs_older_than_2_years": old_audit_logs,
@@ -6,6 +6,9 @@ from api.core.tenant_context import require_tenant
 from api.models.service import Service
 from api.models.tenant import Tenant
 from api.schemas.service import ServiceCreate, ServiceResponse, ServiceUpdate
+from api.services.slot_inventory import SlotInventoryManager
+from api.services.session_cache import bump_sessions_version
+from api.services.session_store import SessionStore
 
 router = APIRouter()
 
@@ -72,6 +75,9 @@ def create_service(
     """Create a new service for the current tenant."""
     service = Service(**service_in.model_dump(), tenant_id=tenant.id)
     db.add(service)
+    SlotInventoryManager(db, tenant.id).service_changed(service)
+    SessionStore(db, tenant.id).refresh()
+    bump_sessions_version(db, tenant.id)
     db.commit()
     db.refresh(service)
     return service
@@ -100,6 +106,9 @@ def update_service(
     for field, value in update_data.items():
         setattr(service, field, value)
     
+    SlotInventoryManager(db, tenant.id).service_changed(service)
+    SessionStore(db, tenant.id).refresh()
+    bump_sessions_version(db, tenant.id)
     db.commit()
     db.refresh(service)
     return service
@@ -124,5 +133,8 @@ def delete_service(
         )
     
     service.is_active = False
+    SlotInventoryManager(db, tenant.id).service_changed(service)
+    SessionStore(db, tenant.id).refresh()
+    bump_sessions_version(db, tenant.id)
     db.commit()
     return None
@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
 from typing import List, Optional
 from datetime import datetime, date, timedelta
 
-from api.core.database import get_db
+from api.core.database import get_async_db, get_db
 from api.core.tenant_context import get_current_tenant
 from api.models.tenant import Tenant
 from api.models.service import Service
 from api.models.booking import Booking, BookingStatus
-from api.models.availability import Availability
 from api.schemas.service import ServiceResponse
+from api.schemas.booking import BookingResponse, SessionBookingCreate
+from api.services.availability_cache import availability_cache
+from api.services.booking_admission import is_double_booking, is_exclusive_service
+from api.services.intervals import to_naive_utc
+from api.services.slot_generator import service_capacity
+from api.services.slot_inventory import SlotInventoryManager
+from api.services.session_capacity import load_session_counts, reserve_session_seat
+from api.services.session_cache import bump_sessions_version, session_list_cache, session_list_key
+from api.services.session_store import SessionStore, iter_session_times, load_blackout_index
 from pydantic import BaseModel, Field
 
 
@@ -42,23 +51,46 @@ class SessionGroupResponse(BaseModel):
     sessions: List[SessionResponse]
 
 
-@router.get("/public", response_model=List[SessionResponse])
-async def get_public_sessions(
-    tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db),
-    from_date: Optional[date] = Query(None, description="Start date for sessions (default: today)"),
-    to_date: Optional[date] = Query(None, description="End date for sessions (default: 30 days from now)"),
-    service_id: Optional[int] = Query(None, description="Filter by specific service")
-):
-    """
-    Get upcoming sessions for a tenant with capacity information.
-    Sessions are generated from services with availability windows.
-    """
-    if from_date is None:
-        from_date = date.today()
-    if to_date is None:
-        to_date = from_date + timedelta(days=30)
+def _session_response(
+    session_id: int,
+    service: Service,
+    session_start: datetime,
+    session_end: datetime,
+    booked_count: int,
+    tenant: Tenant
+) -> SessionResponse:
+    # Calculate availability; a service without max_capacity takes one
+    # booking per session, as booking admission does
+    max_capacity = service_capacity(service)
+    spaces_left = max_capacity - booked_count
+    is_sold_out = spaces_left <= 0
+    is_available = spaces_left > 0
     
+    return SessionResponse(
+        id=session_id,
+        service_id=service.id,
+        service_name=service.name,
+        description=service.description,
+        start_time=session_start,
+        end_time=session_end,
+        duration_minutes=service.duration_minutes,
+        price=service.price,
+        max_capacity=max_capacity,
+        booked_count=booked_count,
+        spaces_left=spaces_left,
+        is_available=is_available,
+        is_sold_out=is_sold_out,
+        location_text=tenant.location_text
+    )
+
+
+def _load_public_sessions(
+    db: Session,
+    tenant: Tenant,
+    from_date: date,
+    to_date: date,
+    service_id: Optional[int]
+) -> List[SessionResponse]:
     # Get active services for tenant
     services_query = db.query(Service).filter(
         Service.tenant_id == tenant.id,
@@ -73,76 +105,63 @@ async def get_public_sessions(
     if not services:
         return []
     
-    # Get availability windows
-    availability_windows = db.query(Availability).filter(
-        Availability.tenant_id == tenant.id
-    ).all()
+    # Get the availability windows sessions start from (cached per tenant version)
+    windows = availability_cache.get(db, tenant.id, tenant.availability_version)
     
-    if not availability_windows:
+    if not any(windows):
         return []
     
-    # Generate sessions
+    # Read booked counts in one range query: from the slot inventory when
+    # it covers the request, otherwise from the session capacity ledger
+    service_ids = [service.id for service in services]
+    inventory = {}
+    session_counts = None
+    inventory_rows = SlotInventoryManager(db, tenant.id).read_rows(from_date, to_date, service_ids)
+    if inventory_rows is not None:
+        inventory = {
+            (row.service_id, to_naive_utc(row.start_time)): row.booked
+            for row in inventory_rows
+        }
+    else:
+        session_counts = load_session_counts(db, tenant.id, service_ids, from_date, to_date)
+    
+    # Sessions come from the materialized table (stable IDs) when it covers
+    # the range, otherwise they are generated with synthetic IDs
+    services_by_id = {service.id: service for service in services}
+    stored = SessionStore(db, tenant.id).read(from_date, to_date, service_ids)
+    if stored is not None:
+        candidates = [
+            (row.id, services_by_id[row.service_id], to_naive_utc(row.start_time), to_naive_utc(row.end_time))
+            for row in stored
+        ]
+    else:
+        candidates = [
+            (service.id * 1000000 + int(start.timestamp()), service, start, end)
+            for service, start, end in iter_session_times(
+                windows, services, from_date, to_date, load_blackout_index(db, tenant.id, from_date, to_date)
+            )
+        ]
+    
     sessions = []
-    current_date = from_date
+    now = datetime.now()
     
-    while current_date <= to_date:
-        day_of_week = current_date.weekday()
-        
-        # Find availability for this day
-        day_availability = [av for av in availability_windows if av.day_of_week == day_of_week]
+    for session_id, service, session_start, session_end in candidates:
+        # Skip past sessions
+        if session_start < now:
+            continue
         
-        for availability in day_availability:
-            for service in services:
-                # Create session at availability start time
-                session_start = datetime.combine(current_date, availability.start_time)
-                session_end = session_start + timedelta(minutes=service.duration_minutes)
-                
-                # Skip if session end exceeds availability window
-                if session_end.time() > availability.end_time:
-                    continue
-                
-                # Skip past sessions
-                if session_start < datetime.now():
-                    continue
-                
-                # Count bookings for this session
-                booked_count = db.query(func.count(Booking.id)).filter(
-                    and_(
-                        Booking.service_id == service.id,
-                        Booking.start_time == session_start,
-                        Booking.status.in_([BookingStatus.CONFIRMED])
-                    )
-                ).scalar() or 0
-                
-                # Calculate availability
-                max_capacity = service.max_capacity
-                spaces_left = None
-                is_sold_out = False
-                is_available = True
-                
-                if max_capacity is not None:
-                    spaces_left = max_capacity - booked_count
-                    is_sold_out = spaces_left <= 0
-                    is_available = spaces_left > 0
-                
-                sessions.append(SessionResponse(
-                    id=service.id * 1000000 + int(session_start.timestamp()),
-                    service_id=service.id,
-                    service_name=service.name,
-                    description=service.description,
-                    start_time=session_start,
-                    end_time=session_end,
-                    duration_minutes=service.duration_minutes,
-                    price=service.price,
-                    max_capacity=max_capacity,
-                    booked_count=booked_count,
-                    spaces_left=spaces_left,
-                    is_available=is_available,
-                    is_sold_out=is_sold_out,
-                    location_text=tenant.location_text
-                ))
+        # Both candidate sources already leave out blacked-out sessions. A
+        # session off the slot grid has no inventory row, so its count comes
+        # from the ledger
+        booked_count = inventory.get((service.id, session_start))
+        if booked_count is None:
+            if session_counts is None:
+                session_counts = load_session_counts(db, tenant.id, service_ids, from_date, to_date)
+            booked_count = session_counts.get((service.id, session_start), 0)
         
-        current_date += timedelta(days=1)
+        sessions.append(_session_response(
+            session_id, service, session_start, session_end, booked_count, tenant
+        ))
     
     # Sort by start time
     sessions.sort(key=lambda s: s.start_time)
@@ -150,17 +169,51 @@ async def get_public_sessions(
     return sessions
 
 
+@router.get("/public", response_model=List[SessionResponse])
+async def get_public_sessions(
+    tenant: Tenant = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_async_db),
+    from_date: Optional[date] = Query(None, description="Start date for sessions (default: today)"),
+    to_date: Optional[date] = Query(None, description="End date for sessions (default: 30 days from now)"),
+    service_id: Optional[int] = Query(None, description="Filter by specific service")
+):
+    """
+    Get upcoming sessions for a tenant with capacity information.
+    Sessions are generated from services with availability windows.
+    """
+    if from_date is None:
+        from_date = date.today()
+    if to_date is None:
+        to_date = from_date + timedelta(days=30)
+    
+    # Served from memory until a booking, service, availability or tenant
+    # write bumps one of the tenant's versions
+    key = session_list_key(tenant, service_id, from_date, to_date)
+    sessions = session_list_cache.get(key)
+    if sessions is None:
+        # The session services share their queries with the sync endpoints;
+        # run_sync drives them over the async connection
+        sessions = await db.run_sync(_load_public_sessions, tenant, from_date, to_date, service_id)
+        session_list_cache.set(key, sessions)
+    
+    # Drop sessions that have started since the list was computed
+    now = datetime.now()
+    return [session for session in sessions if session.start_time >= now]
+
+
 @router.get("/public/grouped", response_model=List[SessionGroupResponse])
 async def get_grouped_sessions(
     tenant: Tenant = Depends(get_current_tenant),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     from_date: Optional[date] = Query(None, description="Start date for sessions (default: today)"),
     to_date: Optional[date] = Query(None, description="End date for sessions (default: 30 days from now)")
 ):
     """
     Get sessions grouped by time period (Today, This Week, Next Week, Later).
     """
-    sessions = await get_public_sessions(tenant=tenant, db=db, from_date=from_date, to_date=to_date)
+    sessions = await get_public_sessions(
+        tenant=tenant, db=db, from_date=from_date, to_date=to_date, service_id=None
+    )
     
     today = date.today()
     week_start = today - timedelta(days=today.weekday())
@@ -197,3 +250,117 @@ async def get_grouped_sessions(
             ))
     
     return result
+
+
+@router.get("/{session_id}", response_model=SessionResponse)
+def get_session(
+    session_id: int,
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """Get a materialized session by ID."""
+    session = SessionStore(db, tenant.id).get(session_id)
+    
+    if not session or not session.service.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    session_start = to_naive_utc(session.start_time)
+    booked_count = load_session_counts(
+        db, tenant.id, [session.service_id], session_start.date(), session_start.date()
+    ).get((session.service_id, session_start), 0)
+    
+    return _session_response(
+        session.id, session.service, session_start, to_naive_utc(session.end_time), booked_count, tenant
+    )
+
+
+@router.post("/{session_id}/book", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+def book_session(
+    session_id: int,
+    booking_in: SessionBookingCreate,
+    tenant: Tenant = Depends(get_current_tenant),
+    db: Session = Depends(get_db)
+):
+    """
+    Book a seat in a materialized session.
+    
+    The session is fetched by primary key and a seat is taken with one
+    conditional update of the capacity ledger, so the last seat cannot be
+    sold twice.
+    """
+    session = SessionStore(db, tenant.id).get(session_id)
+    
+    if not session or not session.service.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    service = session.service
+    session_start = to_naive_utc(session.start_time)
+    
+    if session_start < datetime.now():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Session has already started"
+        )
+    
+    # Same blackout check as booking admission, in case the session was
+    # materialized before the blackout was added
+    session_end = to_naive_utc(session.end_time)
+    if load_blackout_index(db, tenant.id, session_start.date(), session_end.date()).overlaps(session_start, session_end):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Selected time slot is not available"
+        )
+    
+    if not reserve_session_seat(db, tenant.id, service.id, session_start, service_capacity(service)):
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Session is sold out"
+        )
+    
+    booking = Booking(
+        **booking_in.model_dump(),
+        tenant_id=tenant.id,
+        service_id=service.id,
+        start_time=session_start,
+        end_time=session_end,
+        status=BookingStatus.CONFIRMED,
+        is_exclusive=is_exclusive_service(service)
+    )
+    db.add(booking)
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_double_booking(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Session is sold out"
+        )
+    SlotInventoryManager(db, tenant.id).booking_changed(booking)
+    bump_sessions_version(db, tenant.id)
+    db.commit()
+    db.refresh(booking)
+    
+    return {
+        "id": booking.id,
+        "tenant_id": booking.tenant_id,
+        "service_id": booking.service_id,
+        "service_name": service.name,
+        "start_time": booking.start_time,
+        "end_time": booking.end_time,
+        "customer_name": booking.customer_name,
+        "customer_email": booking.customer_email,
+        "customer_phone": booking.customer_phone,
+        "status": booking.status,
+        "notes": booking.notes,
+        "created_at": booking.created_at,
+        "updated_at": booking.updated_at
+    }
@@ -1,23 +1,87 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from datetime import date, timedelta
+import base64
+import json
+from itertools import islice
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime, timedelta
 
 from api.core.database import get_db
 from api.core.tenant_context import require_tenant
 from api.models.service import Service
 from api.models.tenant import Tenant
 from api.services.slot_generator import SlotGenerator
+from api.services.slot_inventory import SlotInventoryManager
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Page size when a cursor is given without a limit
+DEFAULT_PAGE_SIZE = 100
+
+
+def _resolve_date_range(start_date: date, end_date: Optional[date], days: Optional[int]) -> date:
+    """Return the validated end date for a slot query."""
+    # Calculate end_date if not provided
+    if not end_date:
+        if days is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Either end_date or days is required"
+            )
+        end_date = start_date + timedelta(days=days - 1)
+    
+    # Validate date range
+    if end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be after start_date"
+        )
+    
+    # Limit date range to 90 days
+    if (end_date - start_date).days > 90:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range cannot exceed 90 days"
+        )
+    
+    return end_date
+
+
+def _encode_cursor(service_id: int, last_start: str) -> str:
+    """Build an opaque cursor resuming after the slot starting at last_start."""
+    return base64.urlsafe_b64encode(f"{service_id}|{last_start}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, datetime]:
+    try:
+        service_id, last_start = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return int(service_id), datetime.fromisoformat(last_start)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _ndjson_lines(days_iter):
+    """Encode (date, slots) pairs as NDJSON, one chunk per day."""
+    for _, slots in days_iter:
+        if slots:
+            yield "".join(json.dumps(slot) + "\n" for slot in slots)
+
 
 @router.get("/")
 def get_available_slots(
+    request: Request,
     service_id: int,
     start_date: date,
     end_date: Optional[date] = None,
     days: Optional[int] = Query(None, ge=1, le=90),
     timezone_offset: int = Query(0, ge=-12, le=14),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
     tenant: Tenant = Depends(require_tenant),
     db = Depends(get_db)
 ):
@@ -30,9 +94,13 @@ def get_available_slots(
         end_date: End date for slot generation (optional, defaults to start_date + days)
         days: Number of days to generate slots for if end_date not provided
         timezone_offset: Timezone offset in hours
+        limit: Return at most this many slots plus a next_cursor
+        cursor: next_cursor from a previous page
     
     Returns:
-        List of available slots with start and end times
+        List of available slots with start and end times. With
+        `Accept: application/x-ndjson` the slots are streamed instead, one
+        JSON object per line, generated a day at a time.
     """
     # Get service
     service = db.query(Service).filter(
@@ -47,39 +115,173 @@ def get_available_slots(
             detail="Service not found"
         )
     
-    # Calculate end_date if not provided
-    if not end_date:
-        end_date = start_date + timedelta(days=days - 1)
+    end_date = _resolve_date_range(start_date, end_date, days)
     
-    # Validate date range
-    if end_date < start_date:
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        generator = SlotGenerator(db, tenant.id)
+        days_iter = generator.iter_slots_by_day(service_id, start_date, end_date)
+        return StreamingResponse(_ndjson_lines(days_iter), media_type=NDJSON_MEDIA_TYPE)
+    
+    if limit is not None or cursor is not None:
+        # Paginate lazily: only the days needed to fill the page (plus one
+        # slot to know whether another page exists) are generated
+        after = None
+        if cursor is not None:
+            cursor_service_id, after = _decode_cursor(cursor)
+            if cursor_service_id != service_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+        
+        page_size = limit or DEFAULT_PAGE_SIZE
+        generator = SlotGenerator(db, tenant.id)
+        slots = list(islice(generator.iter_slots(service_id, start_date, end_date, after=after), page_size + 1))
+        
+        next_cursor = None
+        if len(slots) > page_size:
+            slots = slots[:page_size]
+            next_cursor = _encode_cursor(service_id, slots[-1]["start_time"])
+        
+        return {
+            "service_id": service.id,
+            "service_name": service.name,
+            "duration_minutes": service.duration_minutes,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "slots": slots,
+            "total_slots": len(slots),
+            "next_cursor": next_cursor
+        }
+    
+    # Read from the materialized inventory when it covers the range,
+    # otherwise generate slots
+    slots = SlotInventoryManager(db, tenant.id).read_slots(service_id, start_date, end_date)
+    if slots is None:
+        generator = SlotGenerator(db, tenant.id)
+        slots = generator.generate_slots(
+            service_id=service_id,
+            start_date=start_date,
+            end_date=end_date,
+            timezone_offset=timezone_offset
+        )
+    
+    return {
+        "service_id": service.id,
+        "service_name": service.name,
+        "duration_minutes": service.duration_minutes,
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "slots": slots,
+        "total_slots": len(slots)
+    }
+
+
+@router.get("/next")
+def get_next_available_slots(
+    service_id: int,
+    after: Optional[datetime] = None,
+    limit: int = Query(1, ge=1, le=100),
+    tenant: Tenant = Depends(require_tenant),
+    db = Depends(get_db)
+):
+    """
+    Get the earliest available slots for a service.
+    
+    Args:
+        service_id: ID of the service
+        after: Only return slots starting at or after this instant (default: now)
+        limit: Number of slots to return
+    
+    Returns:
+        Up to `limit` slots within the next year, earliest first
+    """
+    service = db.query(Service).filter(
+        Service.id == service_id,
+        Service.tenant_id == tenant.id,
+        Service.is_active == True
+    ).first()
+    
+    if not service:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="end_date must be after start_date"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Service not found"
         )
     
-    # Limit date range to 90 days
-    if (end_date - start_date).days > 90:
+    if after is None:
+        after = datetime.now()
+    
+    generator = SlotGenerator(db, tenant.id)
+    slots = generator.next_available_slots(service_id, after, limit=limit)
+    
+    return {
+        "service_id": service.id,
+        "service_name": service.name,
+        "duration_minutes": service.duration_minutes,
+        "after": after.isoformat(),
+        "slots": slots,
+        "total_slots": len(slots)
+    }
+
+
+@router.get("/batch")
+def get_available_slots_batch(
+    start_date: date,
+    end_date: Optional[date] = None,
+    days: Optional[int] = Query(None, ge=1, le=90),
+    service_ids: Optional[List[int]] = Query(None),
+    tenant: Tenant = Depends(require_tenant),
+    db = Depends(get_db)
+):
+    """
+    Get available booking slots for several services at once.
+    
+    Availability, blackouts and bookings are loaded once and shared by all
+    services, instead of once per /slots/ call.
+    
+    Args:
+        start_date: Start date for slot generation
+        end_date: End date for slot generation (optional, defaults to start_date + days)
+        days: Number of days to generate slots for if end_date not provided
+        service_ids: Services to include (default: all active services)
+    
+    Returns:
+        Available slots keyed by service ID
+    """
+    end_date = _resolve_date_range(start_date, end_date, days)
+    
+    services = db.query(Service).filter(
+        Service.tenant_id == tenant.id,
+        Service.is_active == True
+    )
+    if service_ids:
+        services = services.filter(Service.id.in_(service_ids))
+    services = {service.id: service for service in services.all()}
+    
+    if service_ids and len(services) != len(set(service_ids)):
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Date range cannot exceed 90 days"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Service not found"
         )
     
-    # Generate slots
     generator = SlotGenerator(db, tenant.id)
-    slots = generator.generate_slots(
-        service_id=service_id,
+    slots_by_service = generator.generate_slots_for_services(
         start_date=start_date,
         end_date=end_date,
-        timezone_offset=timezone_offset
+        service_ids=list(services)
     )
     
     return {
-        "service_id": service.id,
-        "service_name": service.name,
-        "duration_minutes": service.duration_minutes,
         "start_date": start_date.isoformat(),
         "end_date": end_date.isoformat(),
-        "slots": slots,
-        "total_slots": len(slots)
+        "services": {
+            service_id: {
+                "service_id": service_id,
+                "service_name": services[service_id].name,
+                "duration_minutes": services[service_id].duration_minutes,
+                "slots": slots,
+                "total_slots": len(slots)
+            }
+            for service_id, slots in slots_by_service.items()
+        }
     }
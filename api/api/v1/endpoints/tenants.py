@@ -6,6 +6,7 @@ from api.core.permissions import require_admin_access, require_superadmin_access
 from api.models.tenant import Tenant
 from api.models.user import User
 from api.schemas.tenant import TenantCreate, TenantResponse, TenantUpdate
+from api.services.session_cache import bump_sessions_version
 
 router = APIRouter()
 
@@ -124,6 +125,8 @@ def update_tenant(
     for field, value in update_data.items():
         setattr(tenant, field, value)
     
+    # Session lists embed tenant details such as location_text
+    bump_sessions_version(db, tenant.id)
     db.commit()
     db.refresh(tenant)
     return tenant
@@ -47,6 +47,48 @@ class Settings(BaseSettings):
     
     ENABLE_EMAIL_NOTIFICATIONS: bool = True
     ENABLE_SMS_NOTIFICATIONS: bool = False
+    
+    # Email outbox delivery: attempts before a message is marked failed, and
+    # the delay before the first retry in seconds (doubled after each failure,
+    # up to EMAIL_OUTBOX_MAX_RETRY_SECONDS)
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 6
+    EMAIL_OUTBOX_RETRY_SECONDS: int = 60
+    EMAIL_OUTBOX_MAX_RETRY_SECONDS: int = 3600
+    
+    # Slot generation engine: "bitmap" (minute bitmaps) or "reference" (datetime loop)
+    SLOT_ENGINE: str = "bitmap"
+    
+    # Booking admission: "exclusion" (database overlap guard), "row_lock"
+    # (lock the service row for every booking) or "advisory" (lock per
+    # service and day)
+    BOOKING_ADMISSION_MODE: str = "exclusion"
+    
+    # Max tenants whose compiled weekly availability is cached per process
+    AVAILABILITY_CACHE_SIZE: int = 1024
+    
+    # Max computed public session lists cached per process
+    SESSION_CACHE_SIZE: int = 256
+    
+    # Days of slots materialized into slot_inventory by the rebuild command
+    SLOT_INVENTORY_HORIZON_DAYS: int = 90
+    
+    # Max rows accepted by one POST /bookings/bulk request
+    BULK_BOOKING_MAX_ROWS: int = 10000
+    
+    # Rows fetched per server-side cursor round trip and written per chunk
+    # by the streaming booking exports
+    BOOKING_EXPORT_BATCH_SIZE: int = 1000
+    
+    # Directory the export worker writes export job files to, and hours a
+    # finished job and its file are kept for download
+    EXPORT_STORAGE_DIR: str = "exports"
+    EXPORT_JOB_RETENTION_HOURS: int = 24
+    # Minutes a job may stay running before it is taken for a dead worker's
+    # and marked failed
+    EXPORT_JOB_TIMEOUT_MINUTES: int = 60
+    
+    # Hours a booking response is kept for replay under its Idempotency-Key
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
 
     class Config:
         env_file = ".env"
@@ -29,7 +29,7 @@ def check_tenant_access(user: User, tenant_id: int) -> bool:
     return False
 
 
-async def require_tenant_access(
+def require_tenant_access(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> Tenant:
@@ -44,6 +44,8 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # The booking list's next page cursor
+        expose_headers=["X-Next-Cursor"],
     )
 
 app.add_middleware(SecurityHeadersMiddleware)
@@ -1,8 +1,7 @@
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy.orm import Session
 
-from api.core.database import SessionLocal
+from api.core.database import AsyncSessionLocal
 from api.core.tenant_context import resolve_tenant_from_request, set_current_tenant
 
 
@@ -13,10 +12,12 @@ class TenantMiddleware(BaseHTTPMiddleware):
     """
     
     async def dispatch(self, request: Request, call_next):
-        db = SessionLocal()
         try:
-            # Resolve tenant from request
-            tenant = resolve_tenant_from_request(request, db)
+            # Resolve tenant from request without blocking the event loop
+            async with AsyncSessionLocal() as db:
+                tenant = await db.run_sync(
+                    lambda session: resolve_tenant_from_request(request, session)
+                )
             
             # Set in context (available to all downstream code)
             set_current_tenant(tenant)
@@ -27,6 +28,5 @@ class TenantMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
             return response
         finally:
-            db.close()
             # Clear tenant context after request
             set_current_tenant(None)
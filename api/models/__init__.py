@@ -5,5 +5,12 @@ from api.models.booking import Booking, BookingStatus
 from api.models.user import User, UserRole
 from api.models.password_reset import PasswordResetToken
 from api.models.audit_log import AuditLog, AuditAction
+from api.models.slot_inventory import SlotInventory, SlotInventoryCoverage
+from api.models.session_capacity import SessionCapacity
+from api.models.service_session import ServiceSession
+from api.models.booking_lock import BookingLock
+from api.models.idempotency_key import IdempotencyKey
+from api.models.email_outbox import EmailOutbox, OutboxStatus
+from api.models.export_job import ExportJob, ExportJobStatus
 
-__all__ = ["Tenant", "Service", "Availability", "Blackout", "Booking", "BookingStatus", "User", "UserRole", "PasswordResetToken", "AuditLog", "AuditAction"]
+__all__ = ["Tenant", "Service", "Availability", "Blackout", "Booking", "BookingStatus", "User", "UserRole", "PasswordResetToken", "AuditLog", "AuditAction", "SlotInventory", "SlotInventoryCoverage", "SessionCapacity", "ServiceSession", "BookingLock", "IdempotencyKey", "EmailOutbox", "OutboxStatus", "ExportJob", "ExportJobStatus"]
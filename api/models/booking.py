@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum as SQLEnum, Index
+from sqlalchemy import Boolean, Column, DDL, Integer, String, ForeignKey, DateTime, Enum as SQLEnum, Index, event
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import false, func
 import enum
 from api.core.database import Base
 
@@ -25,6 +25,9 @@ class Booking(Base):
     customer_phone = Column(String(50), nullable=True)
     status = Column(SQLEnum(BookingStatus), default=BookingStatus.CONFIRMED, nullable=False, index=True)
     notes = Column(String(1000), nullable=True)
+    # Set for bookings of single-seat services; active exclusive bookings of
+    # a service may not overlap (enforced by the database, see below)
+    is_exclusive = Column(Boolean, nullable=False, default=False, server_default=false())
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -33,7 +36,73 @@ class Booking(Base):
 
     __table_args__ = (
         Index('ix_bookings_tenant_time', 'tenant_id', 'start_time', 'end_time'),
+        Index('ix_bookings_tenant_service_time', 'tenant_id', 'service_id', 'start_time'),
+        Index('ix_bookings_tenant_start_id', 'tenant_id', 'start_time', 'id'),
     )
 
     def __repr__(self):
         return f"<Booking(id={self.id}, service_id={self.service_id}, start={self.start_time}, status={self.status})>"
+
+
+# Name of the database guard against overlapping exclusive bookings
+BOOKING_OVERLAP_CONSTRAINT = "ex_bookings_no_overlap"
+
+# PostgreSQL: GiST exclusion constraint over a generated tstzrange column
+for statement in (
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    "ALTER TABLE bookings ADD COLUMN during tstzrange "
+    "GENERATED ALWAYS AS (tstzrange(start_time, end_time, '[)')) STORED",
+    f"ALTER TABLE bookings ADD CONSTRAINT {BOOKING_OVERLAP_CONSTRAINT} "
+    "EXCLUDE USING gist (tenant_id WITH =, service_id WITH =, during WITH &&) "
+    "WHERE (is_exclusive AND status IN ('CONFIRMED', 'COMPLETED'))",
+):
+    event.listen(Booking.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+# SQLite: equivalent triggers (SQLite serializes writers, so a check
+# before each write cannot race)
+_SQLITE_OVERLAP_CHECK = f"""
+    WHEN NEW.is_exclusive AND NEW.status IN ('CONFIRMED', 'COMPLETED')
+    BEGIN
+        SELECT RAISE(ABORT, '{BOOKING_OVERLAP_CONSTRAINT}')
+        WHERE EXISTS (
+            SELECT 1 FROM bookings
+            WHERE tenant_id = NEW.tenant_id
+              AND service_id = NEW.service_id
+              AND id IS NOT NEW.id
+              AND is_exclusive
+              AND status IN ('CONFIRMED', 'COMPLETED')
+              AND start_time < NEW.end_time
+              AND end_time > NEW.start_time
+        );
+    END
+"""
+for statement in (
+    f"CREATE TRIGGER {BOOKING_OVERLAP_CONSTRAINT}_insert BEFORE INSERT ON bookings {_SQLITE_OVERLAP_CHECK}",
+    f"CREATE TRIGGER {BOOKING_OVERLAP_CONSTRAINT}_update BEFORE UPDATE ON bookings {_SQLITE_OVERLAP_CHECK}",
+):
+    event.listen(Booking.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+# Customer search indexes (see api/services/booking_search.py)
+CUSTOMER_SEARCH_COLUMNS = {
+    "customer_name": "lower(customer_name)",
+    "customer_email": "lower(customer_email)",
+    "customer_phone": "customer_phone",
+}
+
+# PostgreSQL: trigram GIN indexes, led by tenant_id through btree_gin, so a
+# term can be matched anywhere in a field
+for statement in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    *(
+        f"CREATE INDEX ix_bookings_{column}_trgm ON bookings USING gin (tenant_id, {field} gin_trgm_ops)"
+        for column, field in CUSTOMER_SEARCH_COLUMNS.items()
+    ),
+):
+    event.listen(Booking.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+# SQLite has no trigram index: expression b-tree indexes serve prefix matches
+for column, field in CUSTOMER_SEARCH_COLUMNS.items():
+    event.listen(Booking.__table__, "after_create", DDL(
+        f"CREATE INDEX ix_bookings_{column}_prefix ON bookings (tenant_id, {field})"
+    ).execute_if(dialect="sqlite"))
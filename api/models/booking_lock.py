@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime
+from api.core.database import Base
+
+
+class BookingLock(Base):
+    """
+    Lock row per (tenant_id, service_id, day) for advisory admission mode.
+    
+    Stands in for pg_advisory_xact_lock on databases without advisory
+    locks: admission upserts the row, and the write lock it takes is held
+    until the booking transaction ends.
+    """
+    __tablename__ = "booking_locks"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    service_id = Column(Integer, ForeignKey("services.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<BookingLock(tenant_id={self.tenant_id}, service_id={self.service_id}, day={self.day})>"
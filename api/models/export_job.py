@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, JSON, Text, Enum as SQLEnum, Index
+from sqlalchemy.sql import func
+import enum
+from api.core.database import Base
+
+
+class ExportJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ExportJob(Base):
+    """
+    Booking export requested through the export-job API.
+    
+    The export worker writes the file to the local export store
+    (EXPORT_STORAGE_DIR) and records its size; `filters` holds the
+    booking filters the export was requested with.
+    """
+    __tablename__ = "export_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
+    format = Column(String(20), nullable=False)
+    filters = Column(JSON, nullable=False)
+    status = Column(SQLEnum(ExportJobStatus), default=ExportJobStatus.PENDING, nullable=False)
+    row_count = Column(Integer, nullable=True)
+    file_size = Column(BigInteger, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_export_jobs_status_created', 'status', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f"<ExportJob(id={self.id}, tenant_id={self.tenant_id}, format={self.format}, status={self.status})>"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from api.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Stored response for a client-supplied Idempotency-Key, per tenant.
+    
+    status_code and response_body are filled in before the request's
+    transaction commits, so a committed row always has a response to replay.
+    """
+    __tablename__ = "idempotency_keys"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(tenant_id={self.tenant_id}, key={self.key}, status_code={self.status_code})>"
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, Boolean, ForeignKey, DateTime, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from api.core.database import Base
+
+
+class ServiceSession(Base):
+    """
+    A bookable session of a service, materialized from availability.
+    
+    Rows are never deleted by re-materialization, only deactivated, so a
+    session keeps its ID for as long as it exists.
+    """
+    __tablename__ = "sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    service_id = Column(Integer, ForeignKey("services.id", ondelete="CASCADE"), nullable=False)
+    start_time = Column(DateTime(timezone=True), nullable=False)
+    end_time = Column(DateTime(timezone=True), nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    service = relationship("Service")
+
+    __table_args__ = (
+        UniqueConstraint('service_id', 'start_time', name='uq_sessions_service_start'),
+        Index('ix_sessions_tenant_start', 'tenant_id', 'start_time'),
+    )
+
+    def __repr__(self):
+        return f"<ServiceSession(id={self.id}, service_id={self.service_id}, start={self.start_time})>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from api.core.database import Base
+
+
+class SessionCapacity(Base):
+    """
+    Confirmed booking count per session, keyed by (service_id, session_start).
+    
+    Maintained atomically by api.services.session_capacity whenever a
+    booking enters or leaves the confirmed state.
+    """
+    __tablename__ = "session_capacity"
+
+    service_id = Column(Integer, ForeignKey("services.id", ondelete="CASCADE"), primary_key=True)
+    session_start = Column(DateTime(timezone=True), primary_key=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
+    booked = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SessionCapacity(service_id={self.service_id}, start={self.session_start}, booked={self.booked})>"
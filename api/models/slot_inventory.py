@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Date, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from api.core.database import Base
+
+
+class SlotInventory(Base):
+    """
+    Precomputed bookable slots for a service over a rolling horizon.
+    
+    Rows are generated from availability, blackouts and services, and kept
+    up to date incrementally by SlotInventoryManager. A slot is free while
+    booked < capacity.
+    """
+    __tablename__ = "slot_inventory"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    service_id = Column(Integer, ForeignKey("services.id", ondelete="CASCADE"), nullable=False)
+    start_time = Column(DateTime(timezone=True), nullable=False)
+    end_time = Column(DateTime(timezone=True), nullable=False)
+    capacity = Column(Integer, nullable=False, default=1)
+    booked = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint('service_id', 'start_time', name='uq_slot_inventory_service_start'),
+        Index('ix_slot_inventory_tenant_service_start', 'tenant_id', 'service_id', 'start_time'),
+    )
+
+    def __repr__(self):
+        return f"<SlotInventory(id={self.id}, service_id={self.service_id}, start={self.start_time}, booked={self.booked}/{self.capacity})>"
+
+
+class SlotInventoryCoverage(Base):
+    """Date range for which a service's slot inventory is materialized."""
+    __tablename__ = "slot_inventory_coverage"
+
+    service_id = Column(Integer, ForeignKey("services.id", ondelete="CASCADE"), primary_key=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
+    valid_from = Column(Date, nullable=False)
+    valid_until = Column(Date, nullable=False)
+    rebuilt_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<SlotInventoryCoverage(service_id={self.service_id}, {self.valid_from}..{self.valid_until})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, JSON, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, JSON, Date, DateTime, Text
 from sqlalchemy.sql import func
 from api.core.database import Base
 
@@ -29,6 +29,17 @@ class Tenant(Base):
     business_address = Column(Text, nullable=True)
     social_links = Column(JSON, default=dict, nullable=True)
     
+    # Bumped on every availability write; keys the compiled schedule cache
+    availability_version = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Bumped on every booking, service, blackout and tenant write; keys the
+    # public session list cache
+    sessions_version = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Date range materialized into the sessions table (None until first built)
+    sessions_valid_from = Column(Date, nullable=True)
+    sessions_valid_until = Column(Date, nullable=True)
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from api.models.booking import BookingStatus
+from api.models.export_job import ExportJobStatus
 
 
 class BookingBase(BaseModel):
@@ -18,6 +19,13 @@ class BookingCreate(BookingBase):
     pass
 
 
+class SessionBookingCreate(BaseModel):
+    customer_name: str = Field(..., min_length=1, max_length=255)
+    customer_email: EmailStr
+    customer_phone: Optional[str] = Field(None, max_length=50)
+    notes: Optional[str] = Field(None, max_length=1000)
+
+
 class BookingUpdate(BaseModel):
     status: Optional[BookingStatus] = None
     notes: Optional[str] = Field(None, max_length=1000)
@@ -52,3 +60,35 @@ class BookingListItem(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BulkBookingResult(BaseModel):
+    row: int
+    status: str
+    booking_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkBookingReport(BaseModel):
+    total: int
+    created: int
+    failed: int
+    dry_run: bool = False
+    results: List[BulkBookingResult]
+
+
+class ExportJobResponse(BaseModel):
+    id: int
+    status: ExportJobStatus
+    format: str
+    filters: dict
+    row_count: Optional[int] = None
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    download_url: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
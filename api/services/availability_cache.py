@@ -0,0 +1,164 @@
+"""
+Process-local cache of compiled weekly availability schedules.
+
+A tenant's Availability rows are compiled into a WeeklySchedule: for each
+weekday (0=Monday), a sorted tuple of (start_minute, end_minute) intervals,
+one per availability row. Rows are kept apart even where they touch or
+overlap, since slot grids and sessions start at the beginning of each row
+and a booking must fit inside a single row. Schedules are cached per
+(tenant_id, availability_version); the version lives on the tenant row and
+is bumped by every availability write, so all workers see a change on
+their next lookup. A session that has bumped a tenant's version reads that
+tenant's schedule uncached until it commits, so a schedule other workers
+cannot see yet is never cached.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from api.core.config import settings
+from api.models.availability import Availability
+from api.models.tenant import Tenant
+
+MinuteInterval = Tuple[int, int]
+WeeklySchedule = Tuple[Tuple[MinuteInterval, ...], ...]
+
+EMPTY_SCHEDULE: WeeklySchedule = tuple(() for _ in range(7))
+
+# Session.info key holding the tenant IDs whose availability the session
+# has changed but not yet committed
+_PENDING_TENANTS = "availability_pending_tenants"
+
+
+def _window_days(windows: Iterable[Availability]) -> List[List[MinuteInterval]]:
+    """
+    Group windows by weekday as minute intervals.
+    
+    Window starts are rounded up and ends rounded down to whole minutes, so
+    every interval lies inside the original window.
+    """
+    days: List[List[MinuteInterval]] = [[] for _ in range(7)]
+    
+    for window in windows:
+        start_seconds = window.start_time.hour * 3600 + window.start_time.minute * 60 + window.start_time.second
+        if window.start_time.microsecond:
+            start_seconds += 1
+        start_minute = -(-start_seconds // 60)
+        end_minute = window.end_time.hour * 60 + window.end_time.minute
+        if end_minute > start_minute and 0 <= window.day_of_week <= 6:
+            days[window.day_of_week].append((start_minute, end_minute))
+    
+    return days
+
+
+def compile_weekly_schedule(windows: Iterable[Availability]) -> WeeklySchedule:
+    """
+    Compile availability windows into per-weekday minute intervals, one per
+    distinct window and not merged.
+    """
+    return tuple(tuple(sorted(set(intervals))) for intervals in _window_days(windows))
+
+
+class WeeklyScheduleCache:
+    """Bounded LRU cache of compiled schedules with hit/miss counters."""
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[int, int], WeeklySchedule]" = OrderedDict()
+        self._lock = Lock()
+    
+    def get(
+        self,
+        db: Session,
+        tenant_id: int,
+        version: Optional[int] = None
+    ) -> WeeklySchedule:
+        """
+        Return the compiled schedule for a tenant, loading it on a miss.
+        
+        If version is not given it is read from the tenant row, which is
+        normally already in the session's identity map.
+        """
+        if tenant_id in db.info.get(_PENDING_TENANTS, ()):
+            return compile_weekly_schedule(
+                db.query(Availability).filter(Availability.tenant_id == tenant_id).all()
+            )
+        
+        if version is None:
+            tenant = db.get(Tenant, tenant_id)
+            if tenant is None:
+                return EMPTY_SCHEDULE
+            version = tenant.availability_version or 0
+        
+        key = (tenant_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        
+        windows = db.query(Availability).filter(
+            Availability.tenant_id == tenant_id
+        ).all()
+        entry = compile_weekly_schedule(windows)
+        
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        
+        return entry
+    
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self) -> dict:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+def bump_availability_version(tenant: Tenant) -> None:
+    """
+    Mark a tenant's availability as changed.
+    
+    Call before committing any write to the tenant's Availability rows so
+    the change and the new version are committed together. The increment
+    runs in SQL so concurrent writers cannot lose a bump. Until the
+    transaction ends, schedules the session reads for the tenant are
+    compiled without the cache.
+    """
+    tenant.availability_version = Tenant.availability_version + 1
+    db = object_session(tenant)
+    if db is not None:
+        db.info.setdefault(_PENDING_TENANTS, set()).add(tenant.id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_pending_tenants(db: Session, transaction) -> None:
+    if transaction.parent is None:
+        db.info.pop(_PENDING_TENANTS, None)
+
+
+# Singleton instance
+availability_cache = WeeklyScheduleCache(maxsize=settings.AVAILABILITY_CACHE_SIZE)
@@ -0,0 +1,129 @@
+"""
+Booking admission.
+
+Decides whether a new booking may be written and how concurrent writers
+are kept from double-booking:
+
+- "exclusion" (default): active bookings of single-seat services are
+  marked is_exclusive and the database rejects overlaps (a GiST exclusion
+  constraint on PostgreSQL, triggers on SQLite), so admission takes no
+  row locks and writers only conflict when their ranges actually overlap.
+  Group services, where overlaps are allowed up to capacity, still lock
+  the service row.
+- "row_lock": the service row is always locked FOR UPDATE, serializing
+  every writer for the service.
+- "advisory": a transaction-scoped lock per (tenant, service, day) is taken
+  before the check (pg_advisory_xact_lock on PostgreSQL, a booking_locks
+  row elsewhere), so only writers for the same service on the same day
+  wait for each other.
+"""
+import hashlib
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from api.core.config import settings
+from api.models.booking import BOOKING_OVERLAP_CONSTRAINT
+from api.models.booking_lock import BookingLock
+from api.models.service import Service
+from api.services.intervals import to_naive_utc
+from api.services.slot_generator import Admission, SlotGenerator, service_capacity
+
+ADMISSION_MODES = ("exclusion", "row_lock", "advisory")
+
+
+def is_exclusive_service(service: Service) -> bool:
+    """Return True if the service takes one booking at a time."""
+    return service_capacity(service) == 1
+
+
+def is_double_booking(exc: IntegrityError) -> bool:
+    """Return True if an IntegrityError came from the booking overlap guard."""
+    diag = getattr(exc.orig, "diag", None)
+    if diag is not None and getattr(diag, "constraint_name", None) == BOOKING_OVERLAP_CONSTRAINT:
+        return True
+    return BOOKING_OVERLAP_CONSTRAINT in str(exc.orig)
+
+
+def booking_lock_key(tenant_id: int, service_id: int, day: date) -> int:
+    """Derive a stable signed 64-bit advisory lock key for (tenant, service, day)."""
+    digest = hashlib.blake2b(f"booking:{tenant_id}:{service_id}:{day.isoformat()}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def booking_lock_days(slot_start: datetime, slot_end: datetime) -> List[date]:
+    """Return the days a booking touches, in order (locks are always taken in this order)."""
+    first = to_naive_utc(slot_start).date()
+    last = (to_naive_utc(slot_end) - timedelta(microseconds=1)).date()
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def acquire_booking_locks(
+    db: Session,
+    tenant_id: int,
+    service_id: int,
+    slot_start: datetime,
+    slot_end: datetime
+) -> None:
+    """Take the transaction-scoped admission locks for a booking, waiting if held."""
+    acquire_day_locks(db, tenant_id, [(service_id, day) for day in booking_lock_days(slot_start, slot_end)])
+
+
+def acquire_day_locks(db: Session, tenant_id: int, keys: Iterable[Tuple[int, date]]) -> None:
+    """
+    Take the admission locks for (service_id, day) pairs, in the given order.
+    
+    Callers pass the pairs sorted, so two writers locking several days
+    always take them in the same order and cannot deadlock.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        for service_id, day in keys:
+            db.execute(select(func.pg_advisory_xact_lock(booking_lock_key(tenant_id, service_id, day))))
+        return
+    
+    # Lock-table stand-in: the upsert's write lock lasts until commit
+    from sqlalchemy.dialects.sqlite import insert
+    for service_id, day in keys:
+        db.execute(
+            insert(BookingLock).values(
+                tenant_id=tenant_id, service_id=service_id, day=day, locked_at=func.now()
+            ).on_conflict_do_update(
+                index_elements=[BookingLock.tenant_id, BookingLock.service_id, BookingLock.day],
+                set_={"locked_at": func.now()}
+            )
+        )
+
+
+def admit_booking(
+    generator: SlotGenerator,
+    service_id: int,
+    slot_start: datetime,
+    slot_end: datetime,
+    mode: Optional[str] = None
+) -> Tuple[Admission, Optional[Service]]:
+    """
+    Run the admission check for a new booking under the given mode.
+    
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    mode = mode or settings.BOOKING_ADMISSION_MODE
+    if mode not in ADMISSION_MODES:
+        raise ValueError(f"Unknown booking admission mode: {mode}")
+    
+    if mode == "row_lock":
+        return generator.check_admission(service_id, slot_start, slot_end, lock=True)
+    
+    if mode == "advisory":
+        acquire_booking_locks(generator.db, generator.tenant_id, service_id, slot_start, slot_end)
+        return generator.check_admission(service_id, slot_start, slot_end, lock=False)
+    
+    admission, service = generator.check_admission(service_id, slot_start, slot_end, lock=False)
+    if service is not None and not is_exclusive_service(service):
+        # Capacity is only checked here, so group bookings still serialize
+        # on the service row
+        admission, service = generator.check_admission(service_id, slot_start, slot_end, lock=True)
+    return admission, service
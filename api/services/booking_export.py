@@ -0,0 +1,334 @@
+"""
+Streaming booking export.
+
+Bookings are read in one query with the service name joined in, through a
+server-side cursor (yield_per), and written out as CSV or NDJSON one batch
+of rows at a time. Memory stays flat however many bookings a tenant has,
+and the first bytes go out before the first batch is fetched.
+
+Exports can be gzipped, either as the file format (csv.gz) or as the
+Content-Encoding when the client accepts it. The compressor is fed and
+flushed batch by batch, so compression does not buffer the file either.
+
+The stream opens its own session on the request session's engine: the
+request's session is closed as soon as the endpoint returns, before the
+response body is sent.
+"""
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session
+
+from api.core.config import settings
+from api.models.booking import Booking, BookingStatus
+from api.models.service import Service
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "csv"
+    CSV_GZ = "csv.gz"
+    NDJSON = "ndjson"
+
+
+# Media type of each export format
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.CSV_GZ: "application/gzip",
+    ExportFormat.NDJSON: NDJSON_MEDIA_TYPE,
+}
+
+# Booking and service columns read by the export query
+EXPORT_COLUMNS = (
+    Booking.id,
+    Booking.service_id,
+    Booking.start_time,
+    Booking.end_time,
+    Booking.customer_name,
+    Booking.customer_email,
+    Booking.customer_phone,
+    Booking.status,
+    Booking.notes,
+    Booking.created_at,
+    Service.name.label("service_name"),
+    Service.duration_minutes,
+)
+
+# CSV layout of GET /api/v1/bookings/export
+API_HEADER = [
+    'Booking ID',
+    'Date',
+    'Start Time',
+    'End Time',
+    'Service',
+    'Customer Name',
+    'Customer Email',
+    'Customer Phone',
+    'Status',
+    'Notes',
+    'Created At'
+]
+
+# CSV layout of GET /admin/bookings/export
+ADMIN_HEADER = [
+    'Date',
+    'Start Time',
+    'End Time',
+    'Customer Name',
+    'Customer Email',
+    'Customer Phone',
+    'Service',
+    'Duration (min)',
+    'Status',
+    'Notes',
+    'Created At'
+]
+
+
+def api_row(row: Row) -> list:
+    return [
+        row.id,
+        row.start_time.strftime('%Y-%m-%d'),
+        row.start_time.strftime('%H:%M'),
+        row.end_time.strftime('%H:%M'),
+        row.service_name or 'Unknown',
+        row.customer_name,
+        row.customer_email,
+        row.customer_phone or '',
+        row.status.value,
+        row.notes or '',
+        row.created_at.strftime('%Y-%m-%d %H:%M:%S')
+    ]
+
+
+def admin_row(row: Row) -> list:
+    return [
+        row.start_time.strftime('%Y-%m-%d'),
+        row.start_time.strftime('%H:%M'),
+        row.end_time.strftime('%H:%M'),
+        row.customer_name,
+        row.customer_email,
+        row.customer_phone or '',
+        row.service_name or 'Unknown',
+        row.duration_minutes if row.duration_minutes is not None else '',
+        row.status.value.upper(),
+        row.notes or '',
+        row.created_at.strftime('%Y-%m-%d %H:%M:%S')
+    ]
+
+
+def ndjson_record(row: Row) -> dict:
+    return {
+        "id": row.id,
+        "service_id": row.service_id,
+        "service_name": row.service_name,
+        "duration_minutes": row.duration_minutes,
+        "start_time": row.start_time.isoformat(),
+        "end_time": row.end_time.isoformat(),
+        "customer_name": row.customer_name,
+        "customer_email": row.customer_email,
+        "customer_phone": row.customer_phone,
+        "status": row.status.value,
+        "notes": row.notes,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+def apply_booking_filters(
+    query: Query,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    status: Optional[BookingStatus] = None,
+    service_id: Optional[int] = None
+) -> Query:
+    """Apply the admin booking list filters to a bookings query."""
+    if start_date:
+        query = query.filter(Booking.start_time >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        query = query.filter(Booking.start_time <= datetime.combine(end_date, datetime.max.time()))
+    if status:
+        query = query.filter(Booking.status == status)
+    if service_id:
+        query = query.filter(Booking.service_id == service_id)
+    return query
+
+
+def export_query(db: Session, tenant_id: int, **filters) -> Query:
+    """Build the export query: bookings with their service, newest first."""
+    query = db.query(*EXPORT_COLUMNS).outerjoin(
+        Service, Service.id == Booking.service_id
+    ).filter(Booking.tenant_id == tenant_id)
+    return apply_booking_filters(query, **filters).order_by(
+        Booking.start_time.desc(), Booking.id.desc()
+    )
+
+
+def export_rows(db: Session, tenant_id: int, **filters) -> Iterable[Row]:
+    """Return the export rows, fetched BOOKING_EXPORT_BATCH_SIZE at a time through a server-side cursor."""
+    return export_query(db, tenant_id, **filters).yield_per(settings.BOOKING_EXPORT_BATCH_SIZE)
+
+
+def stream_csv(
+    rows: Iterable[Row],
+    header: Sequence[str],
+    format_row: Callable[[Row], list],
+    batch_size: Optional[int] = None
+) -> Iterator[str]:
+    """Yield the header line, then the CSV text of every batch_size rows."""
+    batch_size = batch_size or settings.BOOKING_EXPORT_BATCH_SIZE
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    # The header goes out before the query runs
+    writer.writerow(header)
+    yield _drain(buffer)
+    
+    for count, row in enumerate(rows, 1):
+        writer.writerow(format_row(row))
+        if count % batch_size == 0:
+            yield _drain(buffer)
+    
+    tail = _drain(buffer)
+    if tail:
+        yield tail
+
+
+def _drain(buffer: io.StringIO) -> str:
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+def stream_ndjson(rows: Iterable[Row], batch_size: Optional[int] = None) -> Iterator[str]:
+    """Yield the NDJSON lines of every batch_size rows."""
+    batch_size = batch_size or settings.BOOKING_EXPORT_BATCH_SIZE
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(ndjson_record(row)) + "\n")
+        if len(lines) == batch_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def gzip_stream(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Gzip text chunks as they arrive.
+    
+    Each chunk is sync-flushed, so the client can decompress everything
+    sent so far; the gzip trailer follows the last chunk.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Return True if an Accept-Encoding header allows gzip."""
+    for coding in (accept_encoding or "").lower().split(","):
+        name, _, params = coding.partition(";")
+        if name.strip() not in ("gzip", "*"):
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def stream_bookings(
+    db: Session,
+    tenant_id: int,
+    encode: Callable[[Iterable[Row]], Iterator],
+    **filters
+) -> Iterator:
+    """
+    Stream a tenant's export rows through encode, for a StreamingResponse.
+    
+    Runs in its own session on db's engine, closed when the stream ends or
+    the client disconnects.
+    """
+    with Session(bind=db.get_bind()) as stream_db:
+        yield from encode(export_rows(stream_db, tenant_id, **filters))
+
+
+def stream_bookings_csv(
+    db: Session,
+    tenant_id: int,
+    header: Sequence[str],
+    format_row: Callable[[Row], list],
+    **filters
+) -> Iterator[str]:
+    """Stream a tenant's bookings as CSV chunks."""
+    return stream_bookings(db, tenant_id, lambda rows: stream_csv(rows, header, format_row), **filters)
+
+
+def export_encoder(
+    export_format: ExportFormat,
+    header: Sequence[str],
+    format_row: Callable[[Row], list],
+    gzip: bool = False
+) -> Callable[[Iterable[Row]], Iterator]:
+    """Return the function turning export rows into chunks of the given format."""
+    def encode(rows: Iterable[Row]) -> Iterator:
+        if export_format == ExportFormat.NDJSON:
+            chunks = stream_ndjson(rows)
+        else:
+            chunks = stream_csv(rows, header, format_row)
+        if gzip or export_format == ExportFormat.CSV_GZ:
+            return gzip_stream(chunks)
+        return chunks
+    return encode
+
+
+def export_response(
+    db: Session,
+    tenant_id: int,
+    export_format: ExportFormat,
+    accept_encoding: str,
+    filename: str,
+    header: Sequence[str],
+    format_row: Callable[[Row], list],
+    **filters
+) -> StreamingResponse:
+    """
+    Build the streaming response for a booking export.
+    
+    Args:
+        export_format: csv, csv.gz (a gzip file) or ndjson
+        accept_encoding: The request's Accept-Encoding; csv and ndjson are
+            sent with Content-Encoding: gzip when it allows gzip
+        filename: Attachment name without the extension
+        header: CSV header row
+        format_row: Turns an export row into a CSV row
+        **filters: apply_booking_filters arguments
+    """
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}.{export_format.value}"
+    }
+    encode_gzip = False
+    if export_format != ExportFormat.CSV_GZ:
+        headers["Vary"] = "Accept-Encoding"
+        encode_gzip = accepts_gzip(accept_encoding)
+        if encode_gzip:
+            headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(
+        stream_bookings(db, tenant_id, export_encoder(export_format, header, format_row, encode_gzip), **filters),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers=headers
+    )
@@ -0,0 +1,296 @@
+"""
+Bulk booking import.
+
+Loads a batch of bookings (e.g. when moving a tenant over from another
+system) without running the per-booking admission path for each one.
+Rows are validated, sorted by service and start time and checked in one
+sweep per service against the existing active bookings and the rows
+accepted before them; the accepted rows are then written with a single
+executemany INSERT, and the slot inventory and session ledger are updated
+once per service and session instead of once per booking.
+
+Every row gets an entry in the result report, in input order.
+"""
+import csv
+import heapq
+import io
+import json
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from api.core.config import settings
+from api.models.availability import Blackout
+from api.models.booking import Booking, BookingStatus
+from api.models.service import Service
+from api.schemas.booking import BookingCreate
+from api.services.booking_admission import acquire_day_locks, booking_lock_days, is_exclusive_service
+from api.services.intervals import Interval, IntervalIndex, peak_overlap, to_naive_utc
+from api.services.session_capacity import adjust_session_capacity
+from api.services.slot_generator import ACTIVE_BOOKING_STATUSES, SlotGenerator, service_capacity
+from api.services.slot_inventory import SlotInventoryManager
+
+# Per-row outcomes in the import report
+CREATED = "created"
+INVALID = "invalid"
+SERVICE_NOT_FOUND = "service_not_found"
+UNAVAILABLE = "unavailable"
+CONFLICT = "conflict"
+
+
+def parse_bulk_payload(body: bytes, content_type: str) -> List[dict]:
+    """
+    Parse an import payload into raw row dicts.
+    
+    CSV needs a header row naming the BookingCreate fields; empty cells
+    are read as missing. JSON may be a list of bookings or an object with
+    a "bookings" list.
+    
+    Raises:
+        ValueError: If the payload cannot be parsed
+    """
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("Payload must be UTF-8 encoded")
+    
+    if "csv" in (content_type or "").lower():
+        reader = csv.DictReader(io.StringIO(text))
+        return [
+            {
+                key.strip(): value.strip() or None
+                for key, value in row.items()
+                if key and value is not None
+            }
+            for row in reader
+        ]
+    
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Invalid JSON: {exc.msg}")
+    
+    if isinstance(payload, dict):
+        payload = payload.get("bookings")
+    if not isinstance(payload, list) or not all(isinstance(row, dict) for row in payload):
+        raise ValueError("Expected a list of booking objects")
+    return payload
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class BookingImporter:
+    """Check and write a batch of bookings for one tenant."""
+    
+    def __init__(self, db: Session, tenant_id: int, check_availability: bool = True):
+        self.db = db
+        self.tenant_id = tenant_id
+        self.check_availability = check_availability
+    
+    def run(self, rows: List[dict], dry_run: bool = False) -> List[dict]:
+        """
+        Import the rows and return one result per row, in input order.
+        
+        With dry_run nothing is written and accepted rows are reported as
+        created without a booking_id. The caller commits.
+        
+        Raises:
+            IntegrityError: If a concurrent writer booked an overlapping
+                slot between the check and the insert
+        """
+        results: List[Optional[dict]] = [None] * len(rows)
+        candidates = []
+        
+        for number, raw in enumerate(rows):
+            try:
+                booking_in = BookingCreate.model_validate(raw)
+            except ValidationError as exc:
+                results[number] = self._result(number, INVALID, _validation_message(exc))
+                continue
+            if booking_in.end_time <= booking_in.start_time:
+                results[number] = self._result(number, INVALID, "end_time must be after start_time")
+                continue
+            candidates.append((
+                booking_in.service_id,
+                to_naive_utc(booking_in.start_time),
+                to_naive_utc(booking_in.end_time),
+                number,
+                booking_in
+            ))
+        
+        candidates.sort(key=lambda candidate: candidate[:4])
+        accepted = self._check(candidates, results)
+        
+        if accepted and not dry_run:
+            for (number, _, _), booking_id in zip(accepted, self._write(accepted)):
+                results[number]["booking_id"] = booking_id
+        
+        return results
+    
+    def _check(self, candidates: list, results: List[Optional[dict]]) -> List[Tuple[int, BookingCreate, Service]]:
+        """Fill in results for every candidate and return the accepted ones, sorted."""
+        if not candidates:
+            return []
+        
+        # Lock the services so concurrent admissions for them wait for the import
+        services = {
+            service.id: service
+            for service in self.db.query(Service).filter(
+                Service.tenant_id == self.tenant_id,
+                Service.id.in_({candidate[0] for candidate in candidates}),
+                Service.is_active == True
+            ).with_for_update()
+        }
+        
+        if settings.BOOKING_ADMISSION_MODE == "advisory":
+            # Single bookings only take their (service, day) locks, not the
+            # service row, so the batch takes every one it touches, in order
+            acquire_day_locks(self.db, self.tenant_id, sorted({
+                (service_id, day)
+                for service_id, start, end, _, _ in candidates
+                if service_id in services
+                for day in booking_lock_days(start, end)
+            }))
+        
+        range_start = min(candidate[1] for candidate in candidates)
+        range_end = max(candidate[2] for candidate in candidates)
+        existing = self._load_existing(list(services), range_start, range_end)
+        
+        generator = SlotGenerator(self.db, self.tenant_id)
+        blackouts = IntervalIndex()
+        if self.check_availability:
+            blackouts = IntervalIndex(
+                (to_naive_utc(start), to_naive_utc(end))
+                for start, end in self.db.query(Blackout.start_datetime, Blackout.end_datetime).filter(
+                    Blackout.tenant_id == self.tenant_id,
+                    Blackout.start_datetime < range_end,
+                    Blackout.end_datetime > range_start
+                )
+            )
+        
+        by_service: Dict[int, list] = defaultdict(list)
+        for service_id, start, end, number, booking_in in candidates:
+            if service_id not in services:
+                results[number] = self._result(number, SERVICE_NOT_FOUND, "Service not found")
+            elif self.check_availability and (
+                not generator.fits_schedule(start, end) or blackouts.overlaps(start, end)
+            ):
+                results[number] = self._result(number, UNAVAILABLE, "Selected time slot is not available")
+            else:
+                by_service[service_id].append((start, end, number, booking_in))
+        
+        accepted = []
+        for service_id, rows in by_service.items():
+            service = services[service_id]
+            admitted = self._sweep(existing.get(service_id, []), rows, service_capacity(service))
+            for (start, end, number, booking_in), ok in zip(rows, admitted):
+                if ok:
+                    results[number] = self._result(number, CREATED)
+                    accepted.append((number, booking_in, service))
+                else:
+                    results[number] = self._result(number, CONFLICT, "This time slot is already booked")
+        return accepted
+    
+    def _load_existing(
+        self,
+        service_ids: List[int],
+        range_start: datetime,
+        range_end: datetime
+    ) -> Dict[int, List[Interval]]:
+        """Load active bookings overlapping the batch in one query, sorted by start per service."""
+        existing: Dict[int, List[Interval]] = defaultdict(list)
+        if not service_ids:
+            return existing
+        
+        rows = self.db.query(Booking.service_id, Booking.start_time, Booking.end_time).filter(
+            Booking.tenant_id == self.tenant_id,
+            Booking.service_id.in_(service_ids),
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+            Booking.start_time < range_end,
+            Booking.end_time > range_start
+        ).order_by(Booking.service_id, Booking.start_time).all()
+        
+        for service_id, start, end in rows:
+            existing[service_id].append((to_naive_utc(start), to_naive_utc(end)))
+        return existing
+    
+    @staticmethod
+    def _sweep(existing: List[Interval], rows: list, capacity: int) -> List[bool]:
+        """
+        Admit rows (sorted by start) one after another against a service's capacity.
+        
+        A heap holds the existing and accepted bookings that have started and
+        not yet ended; existing bookings starting inside a row's range are
+        looked ahead to. Each row is checked with the same peak-overlap rule
+        as single bookings, so a batch cannot overbook itself.
+        """
+        admitted = []
+        active: List[Tuple[datetime, datetime]] = []
+        position = 0
+        
+        for start, end, _, _ in rows:
+            while position < len(existing) and existing[position][0] <= start:
+                heapq.heappush(active, (existing[position][1], existing[position][0]))
+                position += 1
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            
+            overlapping = [(active_start, active_end) for active_end, active_start in active]
+            ahead = position
+            while ahead < len(existing) and existing[ahead][0] < end:
+                overlapping.append(existing[ahead])
+                ahead += 1
+            
+            if overlapping and peak_overlap(overlapping, start, end) >= capacity:
+                admitted.append(False)
+            else:
+                heapq.heappush(active, (end, start))
+                admitted.append(True)
+        return admitted
+    
+    def _write(self, accepted: List[Tuple[int, BookingCreate, Service]]) -> List[int]:
+        """Insert the accepted bookings in one executemany and update derived counts."""
+        booking_ids = self.db.execute(
+            insert(Booking).returning(Booking.id, sort_by_parameter_order=True),
+            [
+                {
+                    **booking_in.model_dump(),
+                    "tenant_id": self.tenant_id,
+                    "status": BookingStatus.CONFIRMED,
+                    "is_exclusive": is_exclusive_service(service)
+                }
+                for _, booking_in, service in accepted
+            ]
+        ).scalars().all()
+        
+        # One ledger upsert per session and one inventory recount per service
+        sessions = Counter(
+            (booking_in.service_id, to_naive_utc(booking_in.start_time))
+            for _, booking_in, _ in accepted
+        )
+        for (service_id, session_start), count in sessions.items():
+            adjust_session_capacity(self.db, self.tenant_id, service_id, session_start, count)
+        
+        ranges: Dict[int, List[datetime]] = {}
+        for _, booking_in, _ in accepted:
+            start, end = to_naive_utc(booking_in.start_time), to_naive_utc(booking_in.end_time)
+            current = ranges.setdefault(booking_in.service_id, [start, end])
+            current[0], current[1] = min(current[0], start), max(current[1], end)
+        inventory = SlotInventoryManager(self.db, self.tenant_id)
+        for service_id, (start, end) in ranges.items():
+            inventory.refresh_booked(service_id, start, end)
+        
+        return booking_ids
+    
+    @staticmethod
+    def _result(number: int, outcome: str, error: Optional[str] = None) -> dict:
+        return {"row": number + 1, "status": outcome, "booking_id": None, "error": error}
@@ -0,0 +1,123 @@
+"""
+Customer search over bookings.
+
+Staff find bookings by customer name, email or phone. On PostgreSQL the
+term is matched anywhere in each field, served by the pg_trgm GIN indexes
+on (tenant_id, field) created with the bookings table. SQLite has no
+trigram index, so there the term is matched as a prefix of each field,
+which its (tenant_id, field) expression indexes serve as range scans.
+
+Matches are ranked: exact matches first, then prefix matches, then other
+substring matches. Each rank is its own filter, read by its own query
+newest first, so every query is driven by the search indexes; ordering
+by a computed rank would have to rank and sort every match before the
+first row. Pages run through the ranks in turn and resume by keyset on
+(start_time, id) within the cursor's rank.
+"""
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, func, literal, or_, true, tuple_
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from api.models.booking import Booking
+
+# Shortest search term accepted; shorter terms cannot use trigram indexes
+SEARCH_MIN_LENGTH = 3
+
+# Rank of a match, best first
+EXACT_MATCH = 0
+PREFIX_MATCH = 1
+SUBSTRING_MATCH = 2
+
+# A (rank, start_time, id) position to resume a search after
+SearchPosition = Tuple[int, datetime, int]
+
+
+def _search_fields() -> Tuple[ColumnElement, ...]:
+    """The indexed expressions a term is matched against (see CUSTOMER_SEARCH_COLUMNS)."""
+    return (func.lower(Booking.customer_name), func.lower(Booking.customer_email), Booking.customer_phone)
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix_match(field: ColumnElement, term: str, dialect_name: str) -> ColumnElement:
+    if dialect_name == "postgresql":
+        return field.like(f"{_escape_like(term)}%", escape="\\")
+    # A range on the indexed expression, which SQLite's LIKE optimization
+    # cannot be relied on to produce for expression indexes
+    return and_(field >= term, field < term[:-1] + chr(ord(term[-1]) + 1))
+
+
+def search_tiers(search: str, dialect_name: str) -> List[Tuple[int, ColumnElement]]:
+    """
+    Split a customer search into one filter per rank, best rank first.
+    
+    Each filter excludes the better ranks' matches (null-safely, as phone
+    may be NULL), so every matching booking is in exactly one tier.
+    
+    Raises:
+        ValueError: If the term is blank
+    """
+    term = search.strip().lower()
+    if not term:
+        raise ValueError("Search term is empty")
+    fields = _search_fields()
+    
+    exact = or_(*(field == term for field in fields))
+    prefix = or_(*(_prefix_match(field, term, dialect_name) for field in fields))
+    tiers = [
+        # An exact match is also a prefix match; the prefix ranges are what
+        # the planners pick the search indexes for
+        (EXACT_MATCH, and_(prefix, exact)),
+        (PREFIX_MATCH, and_(prefix, exact.is_not(true())))
+    ]
+    if dialect_name == "postgresql":
+        pattern = f"%{_escape_like(term)}%"
+        substring = or_(*(field.like(pattern, escape="\\") for field in fields))
+        tiers.append((SUBSTRING_MATCH, and_(substring, prefix.is_not(true()))))
+    return tiers
+
+
+def fetch_search_page(
+    query: Query,
+    tiers: List[Tuple[int, ColumnElement]],
+    limit: int,
+    after: Optional[SearchPosition] = None,
+    offset: int = 0
+) -> List[Tuple[int, Any]]:
+    """
+    Read up to limit matches of a bookings query, best rank first and newest first within a rank.
+    
+    Args:
+        query: Bookings query with the other filters applied
+        tiers: The search_tiers of the term
+        after: Resume after this (rank, start_time, id)
+        offset: Matches to skip instead; each rank skipped over entirely
+            costs a count of that rank
+    
+    Returns:
+        (rank, row) pairs
+    """
+    page = []
+    for rank, match in tiers:
+        if after is not None and rank < after[0]:
+            continue
+        tier = query.filter(match)
+        if after is not None and rank == after[0]:
+            tier = tier.filter(tuple_(Booking.start_time, Booking.id) < tuple_(after[1], after[2]))
+        
+        # The limit is rendered inline: given a bound LIMIT, SQLite walks the
+        # tenant's bookings in date order instead of using the search indexes
+        rows = tier.order_by(Booking.start_time.desc(), Booking.id.desc()).offset(offset).limit(
+            literal(limit - len(page), literal_execute=True)
+        ).all()
+        if offset:
+            offset = offset - tier.with_entities(func.count(Booking.id)).scalar() if not rows else 0
+        page.extend((rank, row) for row in rows)
+        if len(page) >= limit:
+            break
+    return page
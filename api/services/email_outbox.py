@@ -0,0 +1,170 @@
+"""
+Transactional email outbox.
+
+Requests never talk to the mail server. They queue emails as email_outbox
+rows in the same transaction as the booking, so a message exists if and
+only if the booking committed, and the request does no network I/O.
+
+deliver_pending() drains due messages in batches over one SMTP connection
+per batch. A failed send is retried with exponential backoff, and after
+EMAIL_OUTBOX_MAX_ATTEMPTS the message is marked failed. Rows are claimed
+with FOR UPDATE SKIP LOCKED where supported, so several workers can run.
+Run it from scripts/email_outbox_worker.py.
+"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from api.core.config import settings
+from api.models.booking import Booking
+from api.models.email_outbox import EmailOutbox, OutboxStatus
+from api.models.tenant import Tenant
+from api.services.email_service import EmailService, email_service
+
+# EmailService method that sends each kind of message
+EMAIL_KINDS = {
+    "booking_confirmation": "send_booking_confirmation_to_customer",
+    "booking_notification": "send_booking_notification_to_business",
+}
+
+# Payload fields stored as ISO strings and parsed back before sending
+DATETIME_FIELDS = ("start_time", "end_time")
+
+
+def enqueue_email(
+    db: Session,
+    tenant_id: int,
+    kind: str,
+    to_email: str,
+    booking_id: Optional[int] = None,
+    **payload
+) -> EmailOutbox:
+    """
+    Queue an email in the current transaction; the caller commits.
+    
+    Raises:
+        ValueError: If the kind is unknown
+    """
+    if kind not in EMAIL_KINDS:
+        raise ValueError(f"Unknown email kind: {kind}")
+    
+    message = EmailOutbox(
+        tenant_id=tenant_id,
+        booking_id=booking_id,
+        kind=kind,
+        to_email=to_email,
+        payload=jsonable_encoder(payload),
+        status=OutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=datetime.now(timezone.utc)
+    )
+    db.add(message)
+    return message
+
+
+def enqueue_booking_emails(db: Session, tenant: Tenant, service_name: str, booking: Booking) -> None:
+    """Queue the customer confirmation and business notification for a new booking."""
+    enqueue_email(
+        db, tenant.id, "booking_confirmation", booking.customer_email, booking.id,
+        customer_email=booking.customer_email,
+        customer_name=booking.customer_name,
+        service_name=service_name,
+        start_time=booking.start_time,
+        end_time=booking.end_time,
+        tenant_name=tenant.name,
+        tenant_email=tenant.email,
+        tenant_phone=tenant.phone,
+        notes=booking.notes
+    )
+    enqueue_email(
+        db, tenant.id, "booking_notification", tenant.email, booking.id,
+        business_email=tenant.email,
+        business_name=tenant.name,
+        customer_name=booking.customer_name,
+        customer_email=booking.customer_email,
+        customer_phone=booking.customer_phone,
+        service_name=service_name,
+        start_time=booking.start_time,
+        end_time=booking.end_time,
+        notes=booking.notes
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next attempt after `attempts` failures."""
+    seconds = settings.EMAIL_OUTBOX_RETRY_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, settings.EMAIL_OUTBOX_MAX_RETRY_SECONDS))
+
+
+def _send(sender: EmailService, message: EmailOutbox) -> bool:
+    payload = dict(message.payload)
+    for field in DATETIME_FIELDS:
+        if payload.get(field):
+            payload[field] = datetime.fromisoformat(payload[field])
+    return getattr(sender, EMAIL_KINDS[message.kind])(**payload)
+
+
+def _record_attempt(message: EmailOutbox, sent: bool, error: Optional[str], now: datetime) -> str:
+    """Update a message after a send attempt and return its outcome."""
+    message.attempts += 1
+    if sent:
+        message.status = OutboxStatus.SENT
+        message.sent_at = now
+        message.last_error = None
+        return "sent"
+    
+    message.last_error = error or "Send failed"
+    if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        message.status = OutboxStatus.FAILED
+        return "failed"
+    message.next_attempt_at = now + retry_delay(message.attempts)
+    return "retried"
+
+
+def deliver_pending(
+    db: Session,
+    batch_size: int = 100,
+    sender: Optional[EmailService] = None,
+    now: Optional[datetime] = None
+) -> Dict[str, int]:
+    """
+    Send one batch of due messages and commit the results.
+    
+    Returns:
+        Counts of messages "sent", "retried" (scheduled again) and "failed"
+        (out of attempts); all zero when nothing is due
+    """
+    sender = sender or email_service
+    now = now or datetime.now(timezone.utc)
+    
+    messages = db.query(EmailOutbox).filter(
+        EmailOutbox.status == OutboxStatus.PENDING,
+        EmailOutbox.next_attempt_at <= now
+    ).order_by(EmailOutbox.id).limit(batch_size).with_for_update(skip_locked=True).all()
+    
+    outcomes = Counter({"sent": 0, "retried": 0, "failed": 0})
+    if not messages:
+        db.rollback()
+        return dict(outcomes)
+    
+    attempted = set()
+    try:
+        with sender.connection():
+            for message in messages:
+                try:
+                    sent, error = _send(sender, message), None
+                except Exception as e:
+                    sent, error = False, str(e)
+                outcomes[_record_attempt(message, sent, error, now)] += 1
+                attempted.add(message.id)
+    except Exception as e:
+        # The connection failed: count it as a failed attempt for the rest of the batch
+        for message in messages:
+            if message.id not in attempted:
+                outcomes[_record_attempt(message, False, f"SMTP connection failed: {e}", now)] += 1
+    
+    db.commit()
+    return dict(outcomes)
@@ -1,4 +1,5 @@
 import smtplib
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
@@ -17,6 +18,24 @@ class EmailService:
         self.smtp_password = settings.SMTP_PASSWORD
         self.from_email = settings.FROM_EMAIL
         self.from_name = settings.FROM_NAME
+        self._server = None
+    
+    @contextmanager
+    def connection(self):
+        """
+        Keep one SMTP connection open for every email sent inside the block.
+        
+        Lets the outbox worker send a batch after a single STARTTLS and
+        login. Not safe to share between threads.
+        """
+        with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
+            server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+            self._server = server
+            try:
+                yield self
+            finally:
+                self._server = None
     
     def _send_email(
         self,
@@ -44,11 +63,14 @@ class EmailService:
             part2 = MIMEText(html_body, 'html')
             msg.attach(part2)
             
-            # Send via SMTP
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
+            # Send via SMTP, on the open connection if inside connection()
+            if self._server is not None:
+                self._server.send_message(msg)
+            else:
+                with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
+                    server.starttls()
+                    server.login(self.smtp_user, self.smtp_password)
+                    server.send_message(msg)
             
             return True
         except Exception as e:
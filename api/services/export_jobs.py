@@ -0,0 +1,204 @@
+"""
+Asynchronous booking export jobs.
+
+Exports too large to build inside a request are queued as export_jobs
+rows. The export worker (scripts/export_job_worker.py) claims pending
+jobs and writes each one to the local export store with the same query
+and encoders as the streaming exports, then records the file's size and
+row count. Files are written under a temporary name and renamed into
+place, so a completed job's file is always whole and can be downloaded
+in ranges. Jobs still running after EXPORT_JOB_TIMEOUT_MINUTES were left
+by a worker that died and are marked failed. Finished jobs and their
+files are removed after EXPORT_JOB_RETENTION_HOURS.
+"""
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from api.core.config import settings
+from api.models.booking import BookingStatus
+from api.models.export_job import ExportJob, ExportJobStatus
+from api.services.booking_export import API_HEADER, ExportFormat, api_row, export_encoder, export_rows
+
+# Bytes read per chunk when serving an export file
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def serialize_filters(**filters) -> dict:
+    """Encode apply_booking_filters arguments for storage, dropping unset ones."""
+    return jsonable_encoder({name: value for name, value in filters.items() if value is not None})
+
+
+def parse_filters(stored: dict) -> dict:
+    """Decode stored filters back into apply_booking_filters arguments."""
+    filters = dict(stored)
+    for name in ("start_date", "end_date"):
+        if filters.get(name):
+            filters[name] = date.fromisoformat(filters[name])
+    if filters.get("status"):
+        filters["status"] = BookingStatus(filters["status"])
+    return filters
+
+
+def create_export_job(db: Session, tenant_id: int, export_format: ExportFormat, **filters) -> ExportJob:
+    """Queue an export job in the current transaction; the caller commits."""
+    job = ExportJob(
+        tenant_id=tenant_id,
+        format=export_format.value,
+        filters=serialize_filters(**filters),
+        status=ExportJobStatus.PENDING
+    )
+    db.add(job)
+    return job
+
+
+def export_file_path(job: ExportJob) -> str:
+    """Path of a job's file in the export store."""
+    return os.path.join(settings.EXPORT_STORAGE_DIR, str(job.tenant_id), f"{job.id}.{job.format}")
+
+
+def _counted(rows: Iterable[Row], counter: Dict[str, int]) -> Iterator[Row]:
+    for row in rows:
+        counter["rows"] += 1
+        yield row
+
+
+def run_export_job(db: Session, job: ExportJob) -> None:
+    """Write a job's export file and record its size and row count; the caller commits."""
+    path = export_file_path(job)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.part"
+    
+    counter = {"rows": 0}
+    rows = _counted(export_rows(db, job.tenant_id, **parse_filters(job.filters)), counter)
+    encode = export_encoder(ExportFormat(job.format), API_HEADER, api_row)
+    try:
+        with open(partial, "wb") as handle:
+            for chunk in encode(rows):
+                handle.write(chunk.encode() if isinstance(chunk, str) else chunk)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    
+    job.status = ExportJobStatus.COMPLETED
+    job.row_count = counter["rows"]
+    job.file_size = os.path.getsize(path)
+    job.completed_at = datetime.now(timezone.utc)
+
+
+def process_next_job(db: Session) -> Optional[ExportJob]:
+    """
+    Claim the oldest pending job and run it.
+    
+    Returns:
+        The completed or failed job, or None when nothing is pending
+    """
+    job = db.query(ExportJob).filter(
+        ExportJob.status == ExportJobStatus.PENDING
+    ).order_by(ExportJob.created_at, ExportJob.id).limit(1).with_for_update(skip_locked=True).first()
+    
+    if job is None:
+        db.rollback()
+        return None
+    
+    # Commit the claim so pollers see the job running while the file is written
+    job.status = ExportJobStatus.RUNNING
+    job.started_at = datetime.now(timezone.utc)
+    db.commit()
+    
+    try:
+        run_export_job(db, job)
+    except Exception as e:
+        db.rollback()
+        job.status = ExportJobStatus.FAILED
+        job.error = str(e)
+        job.completed_at = datetime.now(timezone.utc)
+    db.commit()
+    return job
+
+
+def fail_stale_jobs(db: Session, now: Optional[datetime] = None) -> int:
+    """Mark jobs running for longer than EXPORT_JOB_TIMEOUT_MINUTES failed; returns the number failed."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(minutes=settings.EXPORT_JOB_TIMEOUT_MINUTES)
+    
+    jobs = db.query(ExportJob).filter(
+        ExportJob.status == ExportJobStatus.RUNNING,
+        ExportJob.started_at <= cutoff
+    ).with_for_update(skip_locked=True).all()
+    for job in jobs:
+        partial = f"{export_file_path(job)}.part"
+        if os.path.exists(partial):
+            os.remove(partial)
+        job.status = ExportJobStatus.FAILED
+        job.error = "Export timed out"
+        job.completed_at = now
+    db.commit()
+    return len(jobs)
+
+
+def purge_expired_jobs(db: Session, now: Optional[datetime] = None) -> int:
+    """Delete finished jobs past retention and their files; returns the number deleted."""
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS)
+    
+    jobs = db.query(ExportJob).filter(
+        ExportJob.status.in_([ExportJobStatus.COMPLETED, ExportJobStatus.FAILED]),
+        ExportJob.completed_at <= cutoff
+    ).all()
+    for job in jobs:
+        path = export_file_path(job)
+        if os.path.exists(path):
+            os.remove(path)
+        db.delete(job)
+    db.commit()
+    return len(jobs)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header into an inclusive (start, end) byte range of a file.
+    
+    Returns None when the whole file should be sent: no header, a unit
+    other than bytes, several ranges or a malformed range.
+    
+    Raises:
+        ValueError: If the range cannot be satisfied for this size
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start, end = int(first), int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start, end = size - int(last), size - 1
+    except ValueError:
+        return None
+    
+    if start >= size or end < start:
+        raise ValueError("Range not satisfiable")
+    return max(start, 0), min(end, size - 1)
+
+
+def iter_file_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    """Yield the bytes of a file from start to end inclusive."""
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,106 @@
+"""
+Idempotency keys for booking creation.
+
+Clients on flaky connections retry POSTs. A request carrying an
+Idempotency-Key header claims (tenant, key) in the same transaction as
+the booking, before anything else is written, and stores its response
+there before committing. A retry with the same key gets the stored
+response back without running admission, touching the booking tables or
+sending email again.
+
+A concurrent retry blocks on the key's primary key until the first
+request finishes, then replays its response. If the first request fails,
+the claim is rolled back with it and the key can be used again. Keys
+expire after IDEMPOTENCY_KEY_TTL_HOURS.
+"""
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from api.core.config import settings
+from api.models.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def request_fingerprint(scope: str, payload: BaseModel) -> str:
+    """Hash the endpoint scope and request body, to detect a key reused for a different request."""
+    body = json.dumps(payload.model_dump(mode="json"), sort_keys=True)
+    return hashlib.sha256(f"{scope}\n{body}".encode()).hexdigest()
+
+
+class IdempotencyGuard:
+    """Claim, replay and store the response for one (tenant, key)."""
+    
+    def __init__(self, db: Session, tenant_id: int, key: str, fingerprint: str):
+        self.db = db
+        self.tenant_id = tenant_id
+        self.key = key
+        self.fingerprint = fingerprint
+        self.record: Optional[IdempotencyKey] = None
+    
+    def stored(self) -> Optional[IdempotencyKey]:
+        """
+        Return the unexpired stored response for the key, if any.
+        
+        Raises:
+            ValueError: If the key was used for a different request
+        """
+        record = self.db.query(IdempotencyKey).filter(
+            IdempotencyKey.tenant_id == self.tenant_id,
+            IdempotencyKey.key == self.key,
+            IdempotencyKey.expires_at > datetime.now(timezone.utc)
+        ).first()
+        
+        if record is not None and record.request_hash != self.fingerprint:
+            raise ValueError(f"{IDEMPOTENCY_HEADER} was already used for a different request")
+        return record
+    
+    def claim(self) -> Optional[IdempotencyKey]:
+        """
+        Claim the key for this request, or return the stored response to replay.
+        
+        Must run before the request writes anything: losing the claim rolls
+        back the session.
+        
+        Raises:
+            ValueError: If the key was used for a different request
+        """
+        record = self.stored()
+        if record is not None:
+            return record
+        
+        now = datetime.now(timezone.utc)
+        # Drop the tenant's expired keys, including an expired use of this one
+        self.db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.tenant_id == self.tenant_id,
+                IdempotencyKey.expires_at <= now
+            ).execution_options(synchronize_session=False)
+        )
+        self.record = IdempotencyKey(
+            tenant_id=self.tenant_id,
+            key=self.key,
+            request_hash=self.fingerprint,
+            expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        )
+        self.db.add(self.record)
+        try:
+            self.db.flush()
+        except IntegrityError:
+            # Another request with the key committed first
+            self.db.rollback()
+            self.record = None
+            return self.stored()
+        return None
+    
+    def save(self, status_code: int, body: Any) -> None:
+        """Store the response for replay; call before committing the request."""
+        self.record.status_code = status_code
+        self.record.response_body = body
@@ -0,0 +1,131 @@
+"""
+Interval helpers shared by slot generation and booking admission.
+
+Intervals are half-open (start, end) tuples of naive datetimes.
+"""
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Iterable, List, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """
+    Normalize a datetime for comparison with generated slots.
+    
+    Slots are built from naive wall-clock times, while timezone-aware
+    columns come back aware from Postgres. Aware values are converted to
+    UTC and stripped so both can be compared.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort intervals and merge any that overlap or touch."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def saturated_intervals(intervals: Iterable[Interval], capacity: int) -> List[Interval]:
+    """
+    Return the merged periods where at least `capacity` intervals overlap.
+    
+    Sweep-line over sorted start/end events. Ends sort before starts at the
+    same instant, so back-to-back bookings do not stack.
+    """
+    events = []
+    for start, end in intervals:
+        if end <= start:
+            continue
+        events.append((start, 1))
+        events.append((end, -1))
+    events.sort(key=lambda event: (event[0], event[1]))
+    
+    full: List[Interval] = []
+    depth = 0
+    full_since = None
+    for instant, delta in events:
+        depth += delta
+        if full_since is None and depth >= capacity:
+            full_since = instant
+        elif full_since is not None and depth < capacity:
+            if instant > full_since:
+                if full and full[-1][1] == full_since:
+                    full[-1] = (full[-1][0], instant)
+                else:
+                    full.append((full_since, instant))
+            full_since = None
+    
+    return full
+
+
+def peak_overlap(intervals: Iterable[Interval], start: datetime, end: datetime) -> int:
+    """Return the maximum number of intervals overlapping any instant in [start, end)."""
+    clipped = [
+        (max(interval_start, start), min(interval_end, end))
+        for interval_start, interval_end in intervals
+    ]
+    events = []
+    for clipped_start, clipped_end in clipped:
+        if clipped_end <= clipped_start:
+            continue
+        events.append((clipped_start, 1))
+        events.append((clipped_end, -1))
+    events.sort(key=lambda event: (event[0], event[1]))
+    
+    depth = 0
+    peak = 0
+    for _, delta in events:
+        depth += delta
+        peak = max(peak, depth)
+    return peak
+
+
+class IntervalIndex:
+    """
+    Sorted, merged interval index answering "does [start, end) overlap
+    anything?" in O(log n) with bisect.
+    
+    Overlapping and touching intervals are merged on construction, so the
+    remaining intervals are disjoint and both their starts and ends are
+    sorted. Degenerate intervals (end <= start) still block any slot that
+    strictly spans them; they are kept aside and checked directly.
+    """
+    
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        intervals = list(intervals)
+        self.merged = merge_intervals(intervals)
+        self.degenerate = [(start, end) for start, end in intervals if end <= start]
+        self._starts = [start for start, _ in self.merged]
+        self._ends = [end for _, end in self.merged]
+    
+    def __len__(self) -> int:
+        return len(self.merged) + len(self.degenerate)
+    
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Return True if [start, end) overlaps any indexed interval."""
+        # First merged interval that ends after `start`
+        position = bisect_right(self._ends, start)
+        if position < len(self._starts) and self._starts[position] < end:
+            return True
+        
+        for blocked_start, blocked_end in self.degenerate:
+            if start < blocked_end and end > blocked_start:
+                return True
+        return False
+    
+    def covers(self, start: datetime, end: datetime) -> bool:
+        """Return True if [start, end) lies entirely inside one merged interval."""
+        position = bisect_right(self._starts, start) - 1
+        return position >= 0 and self._ends[position] >= end
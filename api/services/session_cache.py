@@ -0,0 +1,113 @@
+"""
+Process-local cache of computed public session lists.
+
+The sessions widget loads the same tenant's session list on every page
+view. Lists are cached per (tenant, service filter, date range) together
+with the tenant's availability_version and sessions_version; the versions
+live on the tenant row, which the tenant middleware has already loaded, so
+a hit runs no queries. sessions_version is bumped by every booking,
+service, blackout and tenant write, so all workers see a change on their
+next lookup.
+"""
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+from typing import Any, Hashable, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from api.core.config import settings
+from api.models.tenant import Tenant
+
+SessionListKey = Tuple[int, int, int, Optional[int], date, date]
+
+
+def session_list_key(
+    tenant: Tenant,
+    service_id: Optional[int],
+    from_date: date,
+    to_date: date
+) -> SessionListKey:
+    """Build the cache key for a tenant's session list."""
+    return (
+        tenant.id,
+        tenant.availability_version or 0,
+        tenant.sessions_version or 0,
+        service_id,
+        from_date,
+        to_date
+    )
+
+
+class SessionListCache:
+    """Bounded LRU cache of computed session lists with hit/miss counters."""
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, List[Any]]" = OrderedDict()
+        self._lock = Lock()
+    
+    def get(self, key: Hashable) -> Optional[List[Any]]:
+        """Return the cached list for key, or None on a miss."""
+        with self._lock:
+            sessions = self._entries.get(key)
+            if sessions is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return sessions
+    
+    def set(self, key: Hashable, sessions: List[Any]) -> None:
+        """Store a computed list, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = sessions
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self) -> dict:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+def bump_sessions_version(db: Session, tenant_id: int) -> None:
+    """
+    Mark a tenant's cached session lists as stale.
+    
+    Call before committing a write that changes the tenant's sessions, so
+    the change and the new version are committed together. Booking writes
+    call it last, just before their commit, so concurrent bookings hold
+    the tenant row lock only for the commit itself. The increment runs in
+    SQL so concurrent writers cannot lose a bump.
+    """
+    db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(sessions_version=Tenant.sessions_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# Singleton instance
+session_list_cache = SessionListCache(maxsize=settings.SESSION_CACHE_SIZE)
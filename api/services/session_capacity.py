@@ -0,0 +1,122 @@
+"""
+Session capacity ledger.
+
+Keeps one counter of confirmed bookings per (service_id, session_start) so
+the sessions endpoint can read every count for a range in one query
+instead of running a COUNT per session. Counters are changed with a single
+atomic upsert, so concurrent bookings for the same session cannot lose an
+increment.
+"""
+from datetime import datetime, date, time, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from api.models.booking import Booking, BookingStatus
+from api.models.session_capacity import SessionCapacity
+from api.services.intervals import to_naive_utc
+
+# Bookings counted against session capacity
+COUNTED_STATUSES = (BookingStatus.CONFIRMED,)
+
+SessionKey = Tuple[int, int, datetime]
+
+
+def adjust_session_capacity(
+    db: Session,
+    tenant_id: int,
+    service_id: int,
+    session_start: datetime,
+    delta: int
+) -> None:
+    """Atomically add delta to a session's booked counter, creating it if needed."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    
+    statement = insert(SessionCapacity).values(
+        service_id=service_id,
+        session_start=to_naive_utc(session_start),
+        tenant_id=tenant_id,
+        booked=max(delta, 0)
+    ).on_conflict_do_update(
+        index_elements=[SessionCapacity.service_id, SessionCapacity.session_start],
+        set_={"booked": SessionCapacity.booked + delta}
+    )
+    db.execute(statement)
+
+
+def reserve_session_seat(
+    db: Session,
+    tenant_id: int,
+    service_id: int,
+    session_start: datetime,
+    capacity: Optional[int]
+) -> bool:
+    """
+    Atomically take one seat in a session if it is not full.
+    
+    The counter is only incremented while booked < capacity, in a single
+    UPDATE, so concurrent requests cannot oversell the last seat. Returns
+    False if the session is full.
+    """
+    adjust_session_capacity(db, tenant_id, service_id, session_start, 0)
+    
+    statement = update(SessionCapacity).where(
+        SessionCapacity.service_id == service_id,
+        SessionCapacity.session_start == to_naive_utc(session_start)
+    ).values(booked=SessionCapacity.booked + 1)
+    if capacity is not None:
+        statement = statement.where(SessionCapacity.booked < capacity)
+    
+    return db.execute(statement).rowcount == 1
+
+
+def session_key(booking: Booking) -> Optional[SessionKey]:
+    """Return the ledger key a booking counts against, or None if it does not count."""
+    if booking.status not in COUNTED_STATUSES:
+        return None
+    return booking.tenant_id, booking.service_id, to_naive_utc(booking.start_time)
+
+
+def record_booking_change(db: Session, before: Optional[SessionKey], booking: Booking) -> None:
+    """
+    Update the ledger after a booking was created, changed or cancelled.
+    
+    `before` is session_key(booking) taken before the change (None for a
+    new booking).
+    """
+    after = session_key(booking)
+    if before == after:
+        return
+    if before is not None:
+        adjust_session_capacity(db, *before, delta=-1)
+    if after is not None:
+        adjust_session_capacity(db, *after, delta=1)
+
+
+def load_session_counts(
+    db: Session,
+    tenant_id: int,
+    service_ids: Iterable[int],
+    start_date: date,
+    end_date: date
+) -> Dict[Tuple[int, datetime], int]:
+    """Read booked counters for all sessions of the services in the range in one query."""
+    rows = db.query(
+        SessionCapacity.service_id,
+        SessionCapacity.session_start,
+        SessionCapacity.booked
+    ).filter(
+        SessionCapacity.tenant_id == tenant_id,
+        SessionCapacity.service_id.in_(list(service_ids)),
+        SessionCapacity.session_start >= datetime.combine(start_date, time.min),
+        SessionCapacity.session_start < datetime.combine(end_date + timedelta(days=1), time.min)
+    ).all()
+    
+    return {
+        (service_id, to_naive_utc(session_start)): booked
+        for service_id, session_start, booked in rows
+    }
@@ -0,0 +1,177 @@
+"""
+Materialized sessions.
+
+A session is one run of a service starting at the beginning of an
+availability window, unless it falls in a blackout. SessionStore writes
+them to the sessions table over a rolling horizon so each has a stable
+primary key that can be fetched and booked directly, instead of
+regenerating every session per request.
+"""
+from datetime import datetime, date, time, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from api.core.config import settings
+from api.models.availability import Blackout
+from api.models.service import Service
+from api.models.service_session import ServiceSession
+from api.models.tenant import Tenant
+from api.services.availability_cache import WeeklySchedule, availability_cache
+from api.services.intervals import IntervalIndex, to_naive_utc
+from api.services.session_cache import bump_sessions_version
+
+
+def load_blackout_index(db: Session, tenant_id: int, from_date: date, to_date: date) -> IntervalIndex:
+    """Index the tenant's blackouts overlapping the date range."""
+    range_start = datetime.combine(from_date, time.min)
+    range_end = datetime.combine(to_date + timedelta(days=1), time.min)
+    return IntervalIndex(
+        (to_naive_utc(start), to_naive_utc(end))
+        for start, end in db.query(Blackout.start_datetime, Blackout.end_datetime).filter(
+            Blackout.tenant_id == tenant_id,
+            Blackout.start_datetime < range_end,
+            Blackout.end_datetime > range_start
+        )
+    )
+
+
+def iter_session_times(
+    windows: WeeklySchedule,
+    services: List[Service],
+    from_date: date,
+    to_date: date,
+    blackouts: Optional[IntervalIndex] = None
+) -> Iterator[Tuple[Service, datetime, datetime]]:
+    """
+    Yield (service, start, end) for every session in the range, day by day.
+    
+    windows is the compiled weekly schedule, one interval per availability
+    row: a session starts at each row, even one touching or overlapping
+    another.
+    Sessions overlapping one of the blackouts are skipped.
+    """
+    current_date = from_date
+    while current_date <= to_date:
+        for start_minute, end_minute in windows[current_date.weekday()]:
+            for service in services:
+                # Skip if session end exceeds availability window
+                if start_minute + service.duration_minutes > end_minute:
+                    continue
+                session_start = datetime.combine(current_date, time(start_minute // 60, start_minute % 60))
+                session_end = session_start + timedelta(minutes=service.duration_minutes)
+                if blackouts is not None and blackouts.overlaps(session_start, session_end):
+                    continue
+                yield service, session_start, session_end
+        current_date += timedelta(days=1)
+
+
+class SessionStore:
+    """Materialize and read a tenant's sessions."""
+    
+    def __init__(self, db: Session, tenant_id: int):
+        self.db = db
+        self.tenant_id = tenant_id
+    
+    def get(self, session_id: int) -> Optional[ServiceSession]:
+        """Fetch an active session of this tenant by primary key."""
+        session = self.db.get(ServiceSession, session_id)
+        if session is None or session.tenant_id != self.tenant_id or not session.is_active:
+            return None
+        return session
+    
+    def read(
+        self,
+        from_date: date,
+        to_date: date,
+        service_ids: Iterable[int]
+    ) -> Optional[List[ServiceSession]]:
+        """
+        Return active sessions for the services in the range, ordered by
+        start, or None if the range has not been materialized.
+        """
+        tenant = self.db.get(Tenant, self.tenant_id)
+        if (
+            tenant.sessions_valid_from is None
+            or from_date < tenant.sessions_valid_from
+            or to_date > tenant.sessions_valid_until
+        ):
+            return None
+        
+        return self.db.query(ServiceSession).filter(
+            ServiceSession.tenant_id == self.tenant_id,
+            ServiceSession.service_id.in_(list(service_ids)),
+            ServiceSession.is_active == True,
+            ServiceSession.start_time >= datetime.combine(from_date, time.min),
+            ServiceSession.start_time < datetime.combine(to_date + timedelta(days=1), time.min)
+        ).order_by(ServiceSession.start_time, ServiceSession.service_id).all()
+    
+    def materialize(self, horizon_days: Optional[int] = None) -> int:
+        """
+        Bring the sessions table in line with services and availability from
+        today over the horizon. Existing rows keep their IDs; sessions that
+        no longer exist are deactivated. Returns the number of new rows.
+        """
+        horizon_days = horizon_days or settings.SLOT_INVENTORY_HORIZON_DAYS
+        valid_from = date.today()
+        valid_until = valid_from + timedelta(days=horizon_days - 1)
+        created = self._sync(valid_from, valid_until)
+        
+        tenant = self.db.get(Tenant, self.tenant_id)
+        tenant.sessions_valid_from = valid_from
+        tenant.sessions_valid_until = valid_until
+        self.db.flush()
+        # Cached lists carry synthetic IDs until the table covers them
+        bump_sessions_version(self.db, self.tenant_id)
+        return created
+    
+    def refresh(self) -> None:
+        """Re-sync the materialized range after a service, availability or blackout change."""
+        self.db.flush()
+        tenant = self.db.get(Tenant, self.tenant_id)
+        if tenant.sessions_valid_from is None:
+            return
+        self._sync(max(tenant.sessions_valid_from, date.today()), tenant.sessions_valid_until)
+        self.db.flush()
+    
+    def _sync(self, from_date: date, to_date: date) -> int:
+        services = self.db.query(Service).filter(
+            Service.tenant_id == self.tenant_id,
+            Service.is_active == True
+        ).all()
+        windows = availability_cache.get(self.db, self.tenant_id)
+        blackouts = load_blackout_index(self.db, self.tenant_id, from_date, to_date)
+        
+        # Sessions in a blackout are deactivated, and come back when it is removed
+        wanted = {
+            (service.id, start): end
+            for service, start, end in iter_session_times(windows, services, from_date, to_date, blackouts)
+        }
+        
+        existing = self.db.query(ServiceSession).filter(
+            ServiceSession.tenant_id == self.tenant_id,
+            ServiceSession.start_time >= datetime.combine(from_date, time.min),
+            ServiceSession.start_time < datetime.combine(to_date + timedelta(days=1), time.min)
+        ).all()
+        
+        for session in existing:
+            end = wanted.pop((session.service_id, to_naive_utc(session.start_time)), None)
+            if end is None:
+                session.is_active = False
+            else:
+                session.is_active = True
+                session.end_time = end
+        
+        if wanted:
+            self.db.execute(insert(ServiceSession), [
+                {
+                    "tenant_id": self.tenant_id,
+                    "service_id": service_id,
+                    "start_time": start,
+                    "end_time": end,
+                    "is_active": True
+                }
+                for (service_id, start), end in wanted.items()
+            ])
+        return len(wanted)
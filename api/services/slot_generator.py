@@ -1,24 +1,56 @@
+import enum
 from datetime import datetime, date, time, timedelta
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import and_, exists
 from sqlalchemy.orm import Session
 
-from api.models.availability import Availability, Blackout
+from api.core.config import settings
+from api.models.availability import Blackout
+from api.models.booking import Booking, BookingStatus
 from api.models.service import Service
+from api.services.availability_cache import WeeklySchedule, availability_cache
+from api.services.intervals import Interval, IntervalIndex, peak_overlap, saturated_intervals, to_naive_utc
+from api.services.slot_bitmap import generate_slots_bitmap
+
+# Booking statuses that occupy capacity
+ACTIVE_BOOKING_STATUSES = (BookingStatus.CONFIRMED, BookingStatus.COMPLETED)
+
+
+def service_capacity(service: Service) -> int:
+    """Return the bookings a service takes at once; without max_capacity it takes one."""
+    return service.max_capacity or 1
+
+
+class Admission(str, enum.Enum):
+    """Outcome of SlotGenerator.check_admission."""
+    ADMITTED = "admitted"
+    SERVICE_NOT_FOUND = "service_not_found"
+    UNAVAILABLE = "unavailable"
+    FULL = "full"
 
 
 class SlotGenerator:
     """Generate available booking slots based on availability, blackouts, and existing bookings."""
     
-    def __init__(self, db: Session, tenant_id: int):
+    ENGINES = ("bitmap", "reference")
+    
+    # Days of blocked periods loaded at a time by next_available_slots
+    SEARCH_CHUNK_DAYS = 31
+    
+    def __init__(self, db: Session, tenant_id: int, engine: Optional[str] = None):
         self.db = db
         self.tenant_id = tenant_id
+        self.engine = engine or settings.SLOT_ENGINE
+        if self.engine not in self.ENGINES:
+            raise ValueError(f"Unknown slot engine: {self.engine}")
     
     def generate_slots(
         self,
         service_id: int,
         start_date: date,
         end_date: date,
-        timezone_offset: int = 0
+        timezone_offset: int = 0,
+        exclude_booked: bool = True
     ) -> List[dict]:
         """
         Generate available slots for a service within a date range.
@@ -28,6 +60,7 @@ class SlotGenerator:
             start_date: Start date for slot generation
             end_date: End date for slot generation
             timezone_offset: Timezone offset in hours (default 0 for UTC)
+            exclude_booked: Drop slots where bookings have reached capacity
         
         Returns:
             List of slot dictionaries with start_time and end_time
@@ -42,20 +75,231 @@ class SlotGenerator:
         if not service:
             return []
         
-        # Get availability windows for tenant
-        availability_windows = self.db.query(Availability).filter(
-            Availability.tenant_id == self.tenant_id
-        ).all()
+        # Get the tenant's compiled weekly availability (cached per version)
+        schedule = availability_cache.get(self.db, self.tenant_id)
         
-        if not availability_windows:
+        if not any(schedule):
             return []
         
-        # Get blackouts that overlap with date range
-        blackouts = self.db.query(Blackout).filter(
-            Blackout.tenant_id == self.tenant_id,
-            Blackout.end_datetime >= datetime.combine(start_date, time.min),
-            Blackout.start_datetime <= datetime.combine(end_date, time.max)
-        ).all()
+        # Index blackouts plus periods where bookings have used up the service
+        # capacity, once for the whole range
+        blocked = self._load_blackouts(
+            datetime.combine(start_date, time.min),
+            datetime.combine(end_date, time.max)
+        )
+        if exclude_booked:
+            blocked.extend(self._fully_booked_intervals(service, start_date, end_date))
+        
+        return self._generate(service, start_date, end_date, schedule, IntervalIndex(blocked))
+    
+    def iter_slots_by_day(
+        self,
+        service_id: int,
+        start_date: date,
+        end_date: date,
+        exclude_booked: bool = True
+    ) -> Iterator[Tuple[date, List[dict]]]:
+        """
+        Return an iterator of (date, slots) pairs covering the range.
+        
+        The rules are loaded before this returns, so the iterator holds no
+        database state and can be consumed after the session is closed.
+        Slots are only built as each day is requested, keeping memory flat
+        for long ranges.
+        """
+        service = self.db.query(Service).filter(
+            Service.id == service_id,
+            Service.tenant_id == self.tenant_id,
+            Service.is_active == True
+        ).first()
+        
+        schedule = availability_cache.get(self.db, self.tenant_id)
+        
+        if not service or not any(schedule):
+            return iter(())
+        
+        blocked = self._load_blackouts(
+            datetime.combine(start_date, time.min),
+            datetime.combine(end_date, time.max)
+        )
+        if exclude_booked:
+            blocked.extend(self._fully_booked_intervals(service, start_date, end_date))
+        
+        return self._iter_days(service, start_date, end_date, schedule, IntervalIndex(blocked))
+    
+    def iter_slots(
+        self,
+        service_id: int,
+        start_date: date,
+        end_date: date,
+        after: Optional[datetime] = None
+    ) -> Iterator[dict]:
+        """
+        Return a lazy iterator over the range's slots in start order.
+        
+        If `after` is given, iteration resumes with the first slot starting
+        after it and days before it are never generated.
+        """
+        if after is not None:
+            after = to_naive_utc(after)
+            start_date = max(start_date, after.date())
+        
+        days = self.iter_slots_by_day(service_id, start_date, end_date)
+        return (
+            slot
+            for _, slots in days
+            for slot in slots
+            if after is None or datetime.fromisoformat(slot["start_time"]) > after
+        )
+    
+    def _iter_days(
+        self,
+        service: Service,
+        start_date: date,
+        end_date: date,
+        schedule: WeeklySchedule,
+        blocked: IntervalIndex
+    ) -> Iterator[Tuple[date, List[dict]]]:
+        current_date = start_date
+        while current_date <= end_date:
+            yield current_date, self._generate(service, current_date, current_date, schedule, blocked)
+            current_date += timedelta(days=1)
+    
+    def next_available_slots(
+        self,
+        service_id: int,
+        after: datetime,
+        limit: int = 1,
+        max_days: int = 365
+    ) -> List[dict]:
+        """
+        Find the first `limit` free slots starting at or after `after`.
+        
+        Searches forward in chunks of SEARCH_CHUNK_DAYS, loading blocked
+        periods once per chunk. Days with no availability, or whose windows
+        are entirely covered by blackouts or full bookings, are skipped
+        without generating their slots.
+        """
+        service = self.db.query(Service).filter(
+            Service.id == service_id,
+            Service.tenant_id == self.tenant_id,
+            Service.is_active == True
+        ).first()
+        
+        schedule = availability_cache.get(self.db, self.tenant_id)
+        
+        if not service or not any(schedule) or limit < 1:
+            return []
+        
+        after = to_naive_utc(after)
+        first_date = after.date()
+        last_date = first_date + timedelta(days=max_days - 1)
+        found: List[dict] = []
+        
+        chunk_start = first_date
+        while chunk_start <= last_date:
+            chunk_end = min(chunk_start + timedelta(days=self.SEARCH_CHUNK_DAYS - 1), last_date)
+            blocked = self._load_blackouts(
+                datetime.combine(chunk_start, time.min),
+                datetime.combine(chunk_end, time.max)
+            )
+            blocked.extend(self._fully_booked_intervals(service, chunk_start, chunk_end))
+            blocked = IntervalIndex(blocked)
+            
+            current_date = chunk_start
+            while current_date <= chunk_end:
+                windows = schedule[current_date.weekday()]
+                day_start = datetime.combine(current_date, time.min)
+                
+                if windows and not all(
+                    blocked.covers(
+                        day_start + timedelta(minutes=start_minute),
+                        day_start + timedelta(minutes=end_minute)
+                    )
+                    for start_minute, end_minute in windows
+                ):
+                    for slot in self._generate(service, current_date, current_date, schedule, blocked):
+                        if datetime.fromisoformat(slot["start_time"]) >= after:
+                            found.append(slot)
+                            if len(found) == limit:
+                                return found
+                
+                current_date += timedelta(days=1)
+            
+            chunk_start = chunk_end + timedelta(days=1)
+        
+        return found
+    
+    def generate_slots_for_services(
+        self,
+        start_date: date,
+        end_date: date,
+        service_ids: Optional[List[int]] = None
+    ) -> Dict[int, List[dict]]:
+        """
+        Generate available slots for several services in one pass.
+        
+        The schedule, blackouts and active bookings are each loaded once for
+        the whole range and shared by every service.
+        
+        Args:
+            start_date: Start date for slot generation
+            end_date: End date for slot generation
+            service_ids: Services to include (default: all active services)
+        
+        Returns:
+            Dict of service ID to its list of slot dictionaries
+        """
+        query = self.db.query(Service).filter(
+            Service.tenant_id == self.tenant_id,
+            Service.is_active == True
+        )
+        if service_ids is not None:
+            query = query.filter(Service.id.in_(service_ids))
+        services = query.order_by(Service.id).all()
+        
+        schedule = availability_cache.get(self.db, self.tenant_id)
+        
+        if not services or not any(schedule):
+            return {service.id: [] for service in services}
+        
+        blackouts = self._load_blackouts(
+            datetime.combine(start_date, time.min),
+            datetime.combine(end_date, time.max)
+        )
+        bookings = self._load_active_bookings(
+            [service.id for service in services],
+            start_date,
+            end_date
+        )
+        
+        slots = {}
+        for service in services:
+            blocked = IntervalIndex(blackouts + saturated_intervals(
+                bookings.get(service.id, []),
+                service_capacity(service)
+            ))
+            slots[service.id] = self._generate(service, start_date, end_date, schedule, blocked)
+        
+        return slots
+    
+    def _generate(
+        self,
+        service: Service,
+        start_date: date,
+        end_date: date,
+        schedule: WeeklySchedule,
+        blocked: IntervalIndex
+    ) -> List[dict]:
+        """Run the configured engine for one service."""
+        if self.engine == "bitmap":
+            return generate_slots_bitmap(
+                start_date,
+                end_date,
+                service.duration_minutes,
+                schedule,
+                blocked
+            )
         
         # Generate slots
         slots = []
@@ -65,44 +309,81 @@ class SlotGenerator:
             day_slots = self._generate_slots_for_day(
                 current_date,
                 service.duration_minutes,
-                availability_windows,
-                blackouts
+                schedule,
+                blocked
             )
             slots.extend(day_slots)
             current_date += timedelta(days=1)
         
         return slots
     
+    def _load_blackouts(self, range_start: datetime, range_end: datetime) -> List[Interval]:
+        """Load blackouts touching [range_start, range_end] as intervals."""
+        blackouts = self.db.query(Blackout.start_datetime, Blackout.end_datetime).filter(
+            Blackout.tenant_id == self.tenant_id,
+            Blackout.end_datetime >= range_start,
+            Blackout.start_datetime <= range_end
+        ).all()
+        
+        return [(to_naive_utc(start), to_naive_utc(end)) for start, end in blackouts]
+    
+    def _load_active_bookings(
+        self,
+        service_ids: List[int],
+        start_date: date,
+        end_date: date
+    ) -> Dict[int, List[Interval]]:
+        """Load active bookings for the services in one range query, grouped by service."""
+        bookings = self.db.query(Booking.service_id, Booking.start_time, Booking.end_time).filter(
+            Booking.tenant_id == self.tenant_id,
+            Booking.service_id.in_(service_ids),
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+            Booking.start_time < datetime.combine(end_date + timedelta(days=1), time.min),
+            Booking.end_time > datetime.combine(start_date, time.min)
+        ).all()
+        
+        grouped: Dict[int, List[Interval]] = {}
+        for service_id, start, end in bookings:
+            grouped.setdefault(service_id, []).append((to_naive_utc(start), to_naive_utc(end)))
+        return grouped
+    
+    def _fully_booked_intervals(
+        self,
+        service: Service,
+        start_date: date,
+        end_date: date
+    ) -> List[Interval]:
+        """
+        Return the periods where active bookings reach the service capacity.
+        """
+        bookings = self._load_active_bookings([service.id], start_date, end_date)
+        
+        return saturated_intervals(bookings.get(service.id, []), service_capacity(service))
+    
     def _generate_slots_for_day(
         self,
         target_date: date,
         duration_minutes: int,
-        availability_windows: List[Availability],
-        blackouts: List[Blackout]
+        schedule: WeeklySchedule,
+        blocked: IntervalIndex
     ) -> List[dict]:
         """Generate slots for a specific day."""
         slots = []
         
-        # Get day of week (0=Monday, 6=Sunday)
-        day_of_week = target_date.weekday()
-        
-        # Find availability windows for this day
-        day_availability = [
-            av for av in availability_windows
-            if av.day_of_week == day_of_week
-        ]
+        # Get availability windows for this day (0=Monday, 6=Sunday)
+        day_availability = schedule[target_date.weekday()]
         
         if not day_availability:
             return []
         
         # Generate slots for each availability window
-        for availability in day_availability:
+        for start_minute, end_minute in day_availability:
             window_slots = self._generate_slots_in_window(
                 target_date,
-                availability.start_time,
-                availability.end_time,
+                time(start_minute // 60, start_minute % 60),
+                time(end_minute // 60, end_minute % 60),
                 duration_minutes,
-                blackouts
+                blocked
             )
             slots.extend(window_slots)
         
@@ -114,7 +395,7 @@ class SlotGenerator:
         start_time: time,
         end_time: time,
         duration_minutes: int,
-        blackouts: List[Blackout]
+        blocked: IntervalIndex
     ) -> List[dict]:
         """Generate slots within a specific availability window."""
         slots = []
@@ -127,8 +408,8 @@ class SlotGenerator:
             slot_start = current_time
             slot_end = current_time + timedelta(minutes=duration_minutes)
             
-            # Check if slot overlaps with any blackout
-            if not self._overlaps_blackout(slot_start, slot_end, blackouts):
+            # Check if slot overlaps with any blackout or fully booked period
+            if not self._overlaps_blackout(slot_start, slot_end, blocked):
                 slots.append({
                     "start_time": slot_start.isoformat(),
                     "end_time": slot_end.isoformat()
@@ -143,14 +424,10 @@ class SlotGenerator:
         self,
         slot_start: datetime,
         slot_end: datetime,
-        blackouts: List[Blackout]
+        blocked: IntervalIndex
     ) -> bool:
-        """Check if a slot overlaps with any blackout period."""
-        for blackout in blackouts:
-            # Check for overlap: slot_start < blackout_end AND slot_end > blackout_start
-            if slot_start < blackout.end_datetime and slot_end > blackout.start_datetime:
-                return True
-        return False
+        """Check if a slot overlaps with any blocked period."""
+        return blocked.overlaps(slot_start, slot_end)
     
     def is_slot_available(
         self,
@@ -172,29 +449,97 @@ class SlotGenerator:
         if not service:
             return False
         
-        # Check if slot falls within availability windows
-        day_of_week = slot_start.weekday()
-        slot_time_start = slot_start.time()
-        slot_time_end = slot_end.time()
+        # Check if slot falls within an availability window on its day
+        if not self.fits_schedule(slot_start, slot_end):
+            return False
         
-        availability = self.db.query(Availability).filter(
-            Availability.tenant_id == self.tenant_id,
-            Availability.day_of_week == day_of_week,
-            Availability.start_time <= slot_time_start,
-            Availability.end_time >= slot_time_end
-        ).first()
+        # Check if slot overlaps with blackouts
+        blackouts = IntervalIndex(self._load_blackouts(slot_start, slot_end))
         
-        if not availability:
+        if blackouts.overlaps(to_naive_utc(slot_start), to_naive_utc(slot_end)):
             return False
         
-        # Check if slot overlaps with blackouts
-        blackouts = self.db.query(Blackout).filter(
+        return True
+    
+    def check_admission(
+        self,
+        service_id: int,
+        slot_start: datetime,
+        slot_end: datetime,
+        lock: bool = True
+    ) -> Tuple[Admission, Optional[Service]]:
+        """
+        Decide whether a new booking for [slot_start, slot_end) can be admitted.
+        
+        The service, a blackout flag and the overlapping active bookings come
+        back from one statement; the availability window is checked against
+        the cached weekly schedule. With lock, the service row is locked (FOR
+        UPDATE on databases that support it) so concurrent admissions for the
+        same service are serialized until the booking is committed.
+        
+        Returns:
+            The admission outcome and the service (None if not found)
+        """
+        blacked_out = exists().where(
             Blackout.tenant_id == self.tenant_id,
             Blackout.start_datetime < slot_end,
             Blackout.end_datetime > slot_start
-        ).all()
+        )
         
-        if blackouts:
-            return False
+        query = self.db.query(
+            Service,
+            blacked_out.label("blacked_out"),
+            Booking.id,
+            Booking.start_time,
+            Booking.end_time
+        ).outerjoin(
+            Booking,
+            and_(
+                Booking.tenant_id == Service.tenant_id,
+                Booking.service_id == Service.id,
+                Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+                Booking.start_time < slot_end,
+                Booking.end_time > slot_start
+            )
+        ).filter(
+            Service.id == service_id,
+            Service.tenant_id == self.tenant_id,
+            Service.is_active == True
+        )
+        if lock:
+            query = query.with_for_update(of=Service)
+        rows = query.all()
         
-        return True
+        if not rows:
+            return Admission.SERVICE_NOT_FOUND, None
+        
+        service, is_blacked_out = rows[0][0], rows[0][1]
+        
+        if not self.fits_schedule(slot_start, slot_end) or is_blacked_out:
+            return Admission.UNAVAILABLE, service
+        
+        overlapping = [
+            (to_naive_utc(start), to_naive_utc(end))
+            for _, _, booking_id, start, end in rows
+            if booking_id is not None
+        ]
+        if overlapping and peak_overlap(
+            overlapping,
+            to_naive_utc(slot_start),
+            to_naive_utc(slot_end)
+        ) >= service_capacity(service):
+            return Admission.FULL, service
+        
+        return Admission.ADMITTED, service
+    
+    def fits_schedule(self, slot_start: datetime, slot_end: datetime) -> bool:
+        """Check that a slot lies within a single availability window on its day."""
+        schedule = availability_cache.get(self.db, self.tenant_id)
+        day_start = slot_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        start_offset = (slot_start - day_start).total_seconds()
+        end_offset = (slot_end - day_start).total_seconds()
+        
+        return any(
+            start_minute * 60 <= start_offset and end_offset <= end_minute * 60
+            for start_minute, end_minute in schedule[slot_start.weekday()]
+        )
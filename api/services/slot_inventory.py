@@ -0,0 +1,307 @@
+"""
+Materialized slot inventory.
+
+Slots are precomputed into the slot_inventory table for a rolling horizon
+so public reads become a single indexed range scan. SlotInventoryManager
+builds the rows from the same rules as SlotGenerator and keeps them in
+step with writes to bookings, blackouts, availability and services.
+
+Reads fall back to SlotGenerator for any range outside a service's
+coverage, so nothing changes for tenants that have never been built.
+"""
+import heapq
+from datetime import datetime, date, time, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from api.core.config import settings
+from api.models.booking import Booking
+from api.models.service import Service
+from api.models.slot_inventory import SlotInventory, SlotInventoryCoverage
+from api.services.intervals import peak_overlap, to_naive_utc
+from api.services.slot_generator import ACTIVE_BOOKING_STATUSES, SlotGenerator, service_capacity
+
+
+class SlotInventoryManager:
+    """Build, maintain and read a tenant's slot inventory."""
+    
+    def __init__(self, db: Session, tenant_id: int):
+        self.db = db
+        self.tenant_id = tenant_id
+    
+    # Reads
+    
+    def get_coverage(self, service_id: int) -> Optional[SlotInventoryCoverage]:
+        return self.db.query(SlotInventoryCoverage).filter(
+            SlotInventoryCoverage.service_id == service_id,
+            SlotInventoryCoverage.tenant_id == self.tenant_id
+        ).first()
+    
+    def is_covered(self, service_id: int, start_date: date, end_date: date) -> bool:
+        coverage = self.get_coverage(service_id)
+        return (
+            coverage is not None
+            and coverage.valid_from <= start_date
+            and end_date <= coverage.valid_until
+        )
+    
+    def read_slots(self, service_id: int, start_date: date, end_date: date) -> Optional[List[dict]]:
+        """
+        Return free slots from the inventory, or None if the range is not
+        fully materialized and the caller should generate slots instead.
+        """
+        if not self.is_covered(service_id, start_date, end_date):
+            return None
+        
+        rows = self.db.query(SlotInventory.start_time, SlotInventory.end_time).filter(
+            SlotInventory.tenant_id == self.tenant_id,
+            SlotInventory.service_id == service_id,
+            SlotInventory.start_time >= datetime.combine(start_date, time.min),
+            SlotInventory.start_time < datetime.combine(end_date + timedelta(days=1), time.min),
+            SlotInventory.booked < SlotInventory.capacity
+        ).order_by(SlotInventory.start_time).all()
+        
+        return [
+            {
+                "start_time": to_naive_utc(start).isoformat(),
+                "end_time": to_naive_utc(end).isoformat()
+            }
+            for start, end in rows
+        ]
+    
+    def read_rows(
+        self,
+        start_date: date,
+        end_date: date,
+        service_ids: Iterable[int]
+    ) -> Optional[List[SlotInventory]]:
+        """
+        Return all inventory rows (free or full) for several services in one
+        range scan, or None if any of them is not covered for the range.
+        """
+        service_ids = list(service_ids)
+        coverages = self.db.query(SlotInventoryCoverage).filter(
+            SlotInventoryCoverage.tenant_id == self.tenant_id,
+            SlotInventoryCoverage.service_id.in_(service_ids)
+        ).all()
+        
+        if len(coverages) != len(set(service_ids)) or not all(
+            coverage.valid_from <= start_date and end_date <= coverage.valid_until
+            for coverage in coverages
+        ):
+            return None
+        
+        return self.db.query(SlotInventory).filter(
+            SlotInventory.tenant_id == self.tenant_id,
+            SlotInventory.service_id.in_(service_ids),
+            SlotInventory.start_time >= datetime.combine(start_date, time.min),
+            SlotInventory.start_time < datetime.combine(end_date + timedelta(days=1), time.min)
+        ).order_by(SlotInventory.start_time).all()
+    
+    # Builds
+    
+    def rebuild(
+        self,
+        service_ids: Optional[Iterable[int]] = None,
+        horizon_days: Optional[int] = None
+    ) -> int:
+        """
+        Rebuild the inventory for the tenant's services (all by default)
+        from today over the rolling horizon. Returns the number of rows written.
+        """
+        horizon_days = horizon_days or settings.SLOT_INVENTORY_HORIZON_DAYS
+        valid_from = date.today()
+        valid_until = valid_from + timedelta(days=horizon_days - 1)
+        
+        query = self.db.query(Service).filter(Service.tenant_id == self.tenant_id)
+        if service_ids is not None:
+            query = query.filter(Service.id.in_(list(service_ids)))
+        
+        written = 0
+        for service in query.all():
+            self._delete_rows(service.id)
+            if not service.is_active:
+                self._drop_coverage(service.id)
+                continue
+            written += self._materialize(service, valid_from, valid_until)
+            self._set_coverage(service.id, valid_from, valid_until)
+        
+        self.db.flush()
+        return written
+    
+    def _materialize(self, service: Service, start_date: date, end_date: date) -> int:
+        """Insert rows for [start_date, end_date] with booked counts."""
+        generator = SlotGenerator(self.db, self.tenant_id)
+        slots = generator.generate_slots(service.id, start_date, end_date, exclude_booked=False)
+        if not slots:
+            return 0
+        
+        intervals = [
+            (datetime.fromisoformat(slot["start_time"]), datetime.fromisoformat(slot["end_time"]))
+            for slot in slots
+        ]
+        booked_counts = self._booked_counts(service.id, intervals)
+        capacity = service_capacity(service)
+        
+        self.db.execute(insert(SlotInventory), [
+            {
+                "tenant_id": self.tenant_id,
+                "service_id": service.id,
+                "start_time": start,
+                "end_time": end,
+                "capacity": capacity,
+                "booked": booked
+            }
+            for (start, end), booked in zip(intervals, booked_counts)
+        ])
+        return len(slots)
+    
+    def _booked_counts(self, service_id: int, slots: List[tuple]) -> List[int]:
+        """
+        Peak number of active bookings overlapping each slot.
+        
+        Slots must be sorted by start. Bookings are loaded in one query and
+        swept alongside the slots with a heap of booking end times.
+        """
+        if not slots:
+            return []
+        
+        range_start = slots[0][0]
+        range_end = max(end for _, end in slots)
+        bookings = self.db.query(Booking.start_time, Booking.end_time).filter(
+            Booking.tenant_id == self.tenant_id,
+            Booking.service_id == service_id,
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+            Booking.start_time < range_end,
+            Booking.end_time > range_start
+        ).order_by(Booking.start_time).all()
+        bookings = sorted((to_naive_utc(start), to_naive_utc(end)) for start, end in bookings)
+        
+        counts = []
+        active = []
+        position = 0
+        for slot_start, slot_end in slots:
+            while position < len(bookings) and bookings[position][0] < slot_end:
+                heapq.heappush(active, (bookings[position][1], bookings[position][0]))
+                position += 1
+            while active and active[0][0] <= slot_start:
+                heapq.heappop(active)
+            counts.append(
+                peak_overlap([(start, end) for end, start in active], slot_start, slot_end)
+                if active else 0
+            )
+        return counts
+    
+    def _delete_rows(
+        self,
+        service_id: int,
+        range_start: Optional[datetime] = None,
+        range_end: Optional[datetime] = None
+    ) -> None:
+        query = self.db.query(SlotInventory).filter(
+            SlotInventory.tenant_id == self.tenant_id,
+            SlotInventory.service_id == service_id
+        )
+        if range_start is not None:
+            query = query.filter(SlotInventory.start_time >= range_start)
+        if range_end is not None:
+            query = query.filter(SlotInventory.start_time < range_end)
+        query.delete(synchronize_session=False)
+    
+    def _set_coverage(self, service_id: int, valid_from: date, valid_until: date) -> None:
+        coverage = self.get_coverage(service_id)
+        if coverage is None:
+            coverage = SlotInventoryCoverage(service_id=service_id, tenant_id=self.tenant_id)
+            self.db.add(coverage)
+        coverage.valid_from = valid_from
+        coverage.valid_until = valid_until
+        coverage.rebuilt_at = datetime.now()
+    
+    def _drop_coverage(self, service_id: int) -> None:
+        self.db.query(SlotInventoryCoverage).filter(
+            SlotInventoryCoverage.service_id == service_id
+        ).delete(synchronize_session=False)
+    
+    def _coverages(self) -> List[SlotInventoryCoverage]:
+        return self.db.query(SlotInventoryCoverage).filter(
+            SlotInventoryCoverage.tenant_id == self.tenant_id
+        ).all()
+    
+    # Incremental maintenance (no-ops for tenants without an inventory)
+    
+    def booking_changed(self, booking: Booking) -> None:
+        """Recount bookings for the inventory rows a booking overlaps."""
+        self.refresh_booked(booking.service_id, booking.start_time, booking.end_time)
+    
+    def refresh_booked(self, service_id: int, start: datetime, end: datetime) -> None:
+        """Recount booked for the service's inventory rows overlapping [start, end)."""
+        self.db.flush()
+        rows = self.db.query(SlotInventory).filter(
+            SlotInventory.tenant_id == self.tenant_id,
+            SlotInventory.service_id == service_id,
+            SlotInventory.start_time < end,
+            SlotInventory.end_time > start
+        ).order_by(SlotInventory.start_time).all()
+        if not rows:
+            return
+        
+        counts = self._booked_counts(
+            service_id,
+            [(to_naive_utc(row.start_time), to_naive_utc(row.end_time)) for row in rows]
+        )
+        for row, booked in zip(rows, counts):
+            row.booked = booked
+    
+    def blackout_changed(self, start: datetime, end: datetime) -> None:
+        """Regenerate the days a blackout touched for every covered service."""
+        self.db.flush()
+        first_day = to_naive_utc(start).date()
+        last_day = to_naive_utc(end).date()
+        
+        for coverage in self._coverages():
+            day_from = max(first_day, coverage.valid_from)
+            day_until = min(last_day, coverage.valid_until)
+            if day_from > day_until:
+                continue
+            service = self.db.get(Service, coverage.service_id)
+            self._delete_rows(
+                service.id,
+                datetime.combine(day_from, time.min),
+                datetime.combine(day_until + timedelta(days=1), time.min)
+            )
+            self._materialize(service, day_from, day_until)
+    
+    def availability_changed(self) -> None:
+        """
+        Rebuild every covered service over its current coverage.
+        
+        Call in the transaction that changes availability, after
+        bump_availability_version, so the rebuild reads the new schedule.
+        """
+        self.db.flush()
+        for coverage in self._coverages():
+            service = self.db.get(Service, coverage.service_id)
+            self._delete_rows(service.id)
+            self._materialize(service, coverage.valid_from, coverage.valid_until)
+    
+    def service_changed(self, service: Service) -> None:
+        """Rebuild a service (or drop it when deactivated) if the tenant has an inventory."""
+        self.db.flush()
+        coverages = self._coverages()
+        if not coverages:
+            return
+        
+        if not service.is_active:
+            self._delete_rows(service.id)
+            self._drop_coverage(service.id)
+            return
+        
+        coverage = next((c for c in coverages if c.service_id == service.id), None)
+        valid_from = coverage.valid_from if coverage else min(c.valid_from for c in coverages)
+        valid_until = coverage.valid_until if coverage else max(c.valid_until for c in coverages)
+        
+        self._delete_rows(service.id)
+        self._materialize(service, valid_from, valid_until)
+        self._set_coverage(service.id, valid_from, valid_until)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark the booking admission check used by POST /api/v1/bookings/.
+
+Compares the previous multi-query path (service lookup, is_slot_available,
+overlap query) against SlotGenerator.check_admission and reports p50/p99
+latency and statements per admission. Defaults to in-memory SQLite; pass
+--database-url to measure against a real server, where each round-trip
+costs network latency.
+
+Usage:
+    python scripts/benchmark_admission.py [--requests 2000] [--bookings 2000]
+    python scripts/benchmark_admission.py --database-url postgresql://...
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time as timer
+from datetime import date, datetime, time, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.core.database import Base
+from api.models.tenant import Tenant
+from api.models.service import Service
+from api.models.availability import Availability, Blackout
+from api.models.booking import Booking, BookingStatus
+from api.services.intervals import peak_overlap, to_naive_utc
+from api.services.slot_generator import ACTIVE_BOOKING_STATUSES, Admission, SlotGenerator
+
+
+def build_database(url: str, booking_count: int, days: int = 60, seed: int = 42):
+    """Create a tenant with a group class, blackouts and existing bookings."""
+    if url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    rng = random.Random(seed)
+    
+    tenant = Tenant(slug=f"bench-{rng.randrange(10 ** 9)}", name="Benchmark Tenant",
+                    email="bench@example.com", settings={})
+    db.add(tenant)
+    db.commit()
+    
+    service = Service(tenant_id=tenant.id, name="Class", duration_minutes=60, max_capacity=4, is_active=True)
+    db.add(service)
+    for day_of_week in range(7):
+        db.add(Availability(tenant_id=tenant.id, day_of_week=day_of_week,
+                            start_time=time(8, 0), end_time=time(20, 0)))
+    
+    start = datetime.combine(date.today() + timedelta(days=1), time.min)
+    for _ in range(days * 2):
+        blackout_start = start + timedelta(minutes=rng.randrange(0, days * 24 * 60, 30))
+        db.add(Blackout(tenant_id=tenant.id, start_datetime=blackout_start,
+                        end_datetime=blackout_start + timedelta(hours=1), reason="bench"))
+    db.commit()
+    
+    for _ in range(booking_count):
+        booking_start = start + timedelta(days=rng.randrange(days), hours=rng.randrange(8, 20))
+        db.add(Booking(tenant_id=tenant.id, service_id=service.id, start_time=booking_start,
+                       end_time=booking_start + timedelta(hours=1), customer_name="Bench",
+                       customer_email="bench@example.com", status=BookingStatus.CONFIRMED))
+    db.commit()
+    
+    return engine, db, tenant, service, start, days
+
+
+def legacy_admission(db, tenant_id, service_id, slot_start, slot_end):
+    """The admission queries create_booking issued before check_admission."""
+    service = db.query(Service).filter(
+        Service.id == service_id,
+        Service.tenant_id == tenant_id,
+        Service.is_active == True
+    ).first()
+    if not service:
+        return False
+    
+    if not SlotGenerator(db, tenant_id).is_slot_available(service.id, slot_start, slot_end):
+        return False
+    
+    overlapping = db.query(Booking).filter(
+        Booking.tenant_id == tenant_id,
+        Booking.service_id == service_id,
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+        Booking.start_time < slot_end,
+        Booking.end_time > slot_start
+    ).with_for_update().all()
+    return not overlapping or peak_overlap(
+        [(to_naive_utc(b.start_time), to_naive_utc(b.end_time)) for b in overlapping],
+        slot_start,
+        slot_end
+    ) < (service.max_capacity or 1)
+
+
+def single_statement_admission(db, tenant_id, service_id, slot_start, slot_end):
+    admission, _ = SlotGenerator(db, tenant_id).check_admission(service_id, slot_start, slot_end)
+    return admission == Admission.ADMITTED
+
+
+def measure(db, engine, check, tenant_id, service_id, requests):
+    """
+    Time each admission as create_booking runs it: with the tenant already
+    loaded by the request's tenant dependency.
+    """
+    statements = [0]
+    counting = [False]
+    
+    def count(*_):
+        if counting[0]:
+            statements[0] += 1
+    
+    event.listen(engine, "before_cursor_execute", count)
+    latencies = []
+    admitted = []
+    try:
+        for slot_start in requests:
+            db.get(Tenant, tenant_id).availability_version
+            counting[0] = True
+            started = timer.perf_counter()
+            admitted.append(check(db, tenant_id, service_id, slot_start, slot_start + timedelta(hours=1)))
+            latencies.append(timer.perf_counter() - started)
+            counting[0] = False
+            db.rollback()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "statements": statements[0] / len(requests),
+        "admitted": admitted
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--bookings", type=int, default=2000)
+    args = parser.parse_args()
+    
+    engine, db, tenant, service, start, days = build_database(args.database_url, args.bookings)
+    tenant_id, service_id = tenant.id, service.id
+    rng = random.Random(7)
+    requests = [
+        start + timedelta(days=rng.randrange(days), hours=rng.randrange(6, 21))
+        for _ in range(args.requests)
+    ]
+    
+    # Warm the availability cache and connection pool
+    measure(db, engine, single_statement_admission, tenant_id, service_id, requests[:50])
+    
+    legacy = measure(db, engine, legacy_admission, tenant_id, service_id, requests)
+    single = measure(db, engine, single_statement_admission, tenant_id, service_id, requests)
+    
+    if legacy["admitted"] != single["admitted"]:
+        print("✗ Admission paths disagree")
+        sys.exit(1)
+    
+    print(f"{args.requests} admissions, {args.bookings} existing bookings")
+    print(f"{'path':<18} {'p50':>9} {'p99':>9} {'stmts':>7}")
+    for name, result in (("legacy", legacy), ("single statement", single)):
+        print(f"{name:<18} {result['p50']:>7.2f}ms {result['p99']:>7.2f}ms {result['statements']:>7.1f}")
+    print("✓ Both paths admitted the same requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent booking writes under each admission mode.
+
+Runs create_booking from a pool of threads against single-seat and group
+services, with many requests racing for the same and overlapping slots,
+and reports throughput, outcomes and the number of bookings over capacity
+left in the table for each BOOKING_ADMISSION_MODE. Two workloads are run:
+"spread" scatters requests over every service and day, "hot" sends them
+all to one service on one day. The script exits non-zero if any mode
+overbooks.
+
+The numbers are only meaningful against PostgreSQL, where writers run in
+parallel; SQLite serializes every write transaction. SQLite also ignores
+FOR UPDATE, so group services can go over capacity there in the modes that
+rely on the service row lock; the advisory mode's booking_locks row does
+serialize them.
+
+Usage:
+    python scripts/benchmark_booking_concurrency.py --database-url postgresql://... [--threads 16]
+    python scripts/benchmark_booking_concurrency.py [--requests 2000] [--services 4] [--days 5]
+                                                    [--modes exclusion,row_lock,advisory]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time as timer
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from api.core.config import settings
+from api.core.database import Base
+from api.api.v1.endpoints.bookings import create_booking
+from api.models.tenant import Tenant
+from api.models.service import Service
+from api.models.availability import Availability
+from api.models.booking import Booking
+from api.models.booking_lock import BookingLock
+from api.models.session_capacity import SessionCapacity
+from api.schemas.booking import BookingCreate
+from api.services.booking_admission import ADMISSION_MODES
+from api.services.slot_generator import ACTIVE_BOOKING_STATUSES
+
+# Every other service is a group class with this many seats
+GROUP_CAPACITY = 3
+
+
+def build_database(url, service_count):
+    """Create a tenant with single-seat and group services open 08:00-20:00 every day."""
+    if url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 30})
+    else:
+        engine = create_engine(url, pool_size=64, max_overflow=0)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    
+    tenant = Tenant(slug=f"bench-{random.randrange(10 ** 9)}", name="Benchmark Tenant",
+                    email="bench@example.com", settings={})
+    db.add(tenant)
+    db.commit()
+    
+    services = [
+        Service(tenant_id=tenant.id, name=f"Room {number}", duration_minutes=60,
+                max_capacity=GROUP_CAPACITY if number % 2 else None, is_active=True)
+        for number in range(service_count)
+    ]
+    db.add_all(services)
+    for day_of_week in range(7):
+        db.add(Availability(tenant_id=tenant.id, day_of_week=day_of_week,
+                            start_time=time(8, 0), end_time=time(20, 0)))
+    db.commit()
+    
+    tenant_id, service_ids = tenant.id, [service.id for service in services]
+    db.close()
+    return engine, tenant_id, service_ids
+
+
+def build_requests(service_ids, days, count, seed=7):
+    """Random hourly and half-hour starts, so requests collide and overlap."""
+    rng = random.Random(seed)
+    first_day = date.today() + timedelta(days=1)
+    return [
+        (
+            rng.choice(service_ids),
+            datetime.combine(first_day + timedelta(days=rng.randrange(days)), time(8, 0))
+            + timedelta(minutes=30 * rng.randrange(22))
+        )
+        for _ in range(count)
+    ]
+
+
+def count_overbooked(engine, tenant_id):
+    """Count bookings that took a service past its capacity, with one sweep per service."""
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        capacities = {
+            service.id: service.max_capacity or 1
+            for service in db.query(Service).filter(Service.tenant_id == tenant_id)
+        }
+        rows = db.query(Booking.service_id, Booking.start_time, Booking.end_time).filter(
+            Booking.tenant_id == tenant_id,
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES)
+        ).all()
+    
+    events = sorted(
+        [(service_id, start, 1) for service_id, start, _ in rows]
+        + [(service_id, end, -1) for service_id, _, end in rows],
+        key=lambda event: (event[0], event[1], event[2])
+    )
+    overbooked = 0
+    depth = 0
+    current = None
+    for service_id, _, change in events:
+        if service_id != current:
+            current, depth = service_id, 0
+        depth += change
+        if change > 0 and depth > capacities[service_id]:
+            overbooked += 1
+    return overbooked
+
+
+def reset(engine, tenant_id):
+    with engine.begin() as connection:
+        connection.execute(Booking.__table__.delete().where(Booking.tenant_id == tenant_id))
+        connection.execute(SessionCapacity.__table__.delete().where(SessionCapacity.tenant_id == tenant_id))
+        connection.execute(BookingLock.__table__.delete().where(BookingLock.tenant_id == tenant_id))
+
+
+def run(engine, tenant_id, requests, threads, mode):
+    """Book every request concurrently under one admission mode."""
+    settings.BOOKING_ADMISSION_MODE = mode
+    Session = sessionmaker(bind=engine, autoflush=False)
+    
+    def book(request):
+        service_id, start = request
+        db = Session()
+        try:
+            create_booking(
+                booking_in=BookingCreate(
+                    service_id=service_id,
+                    start_time=start,
+                    end_time=start + timedelta(hours=1),
+                    customer_name="Bench",
+                    customer_email="bench@example.com"
+                ),
+                tenant=db.get(Tenant, tenant_id),
+                db=db
+            )
+            return "created"
+        except HTTPException as exc:
+            db.rollback()
+            return "conflict" if exc.status_code == 409 else "rejected"
+        except OperationalError:
+            db.rollback()
+            return "error"
+        finally:
+            db.close()
+    
+    started = timer.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        outcomes = Counter(pool.map(book, requests))
+    elapsed = timer.perf_counter() - started
+    
+    return {"elapsed": elapsed, "outcomes": outcomes, "overbooked": count_overbooked(engine, tenant_id)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--services", type=int, default=4)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--modes", default=",".join(ADMISSION_MODES))
+    args = parser.parse_args()
+    
+    settings.ENABLE_EMAIL_NOTIFICATIONS = False
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine, tenant_id, service_ids = build_database(url, args.services)
+    workloads = {
+        "spread": build_requests(service_ids, args.days, args.requests),
+        "hot": build_requests(service_ids[:1], 1, args.requests),
+    }
+    
+    print(f"{args.requests} requests from {args.threads} threads over {args.services} services x "
+          f"{args.days} days on {engine.dialect.name}")
+    print(f"{'workload':<9} {'mode':<10} {'writes/s':>9} {'created':>8} {'409':>6} {'errors':>7} {'over':>5}")
+    
+    failed = False
+    for workload, requests in workloads.items():
+        for mode in args.modes.split(","):
+            reset(engine, tenant_id)
+            result = run(engine, tenant_id, requests, args.threads, mode)
+            outcomes = result["outcomes"]
+            print(f"{workload:<9} {mode:<10} {len(requests) / result['elapsed']:>9.0f} {outcomes['created']:>8} "
+                  f"{outcomes['conflict']:>6} {outcomes['error'] + outcomes['rejected']:>7} "
+                  f"{result['overbooked']:>5}")
+            failed = failed or result["overbooked"] > 0
+    
+    reset(engine, tenant_id)
+    if failed:
+        print("✗ Bookings over capacity were written")
+        sys.exit(1)
+    print("✓ No bookings over capacity in any mode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark customer search on GET /api/v1/bookings/?search=.
+
+Compares ordering every match by a computed rank (CASE over the match
+filters) against reading each rank with its own query (fetch_search_page),
+for the first page and for a page deep into the results, and prints the
+query plan of each rank. Defaults to in-memory SQLite; pass
+--database-url to measure against PostgreSQL and its trigram indexes.
+
+Usage:
+    python scripts/benchmark_customer_search.py [--bookings 200000] [--searches 200]
+    python scripts/benchmark_customer_search.py --database-url postgresql://...
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time as timer
+from datetime import date, datetime, time, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import case, create_engine, or_, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.core.database import Base
+from api.models.tenant import Tenant
+from api.models.service import Service
+from api.models.booking import Booking, BookingStatus
+from api.services.booking_search import fetch_search_page, search_tiers
+
+PAGE_SIZE = 50
+
+
+def build_database(url: str, booking_count: int, seed: int = 42):
+    """Create a tenant with booking_count bookings under random customer names."""
+    if url.startswith("sqlite"):
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    rng = random.Random(seed)
+    
+    tenant = Tenant(slug=f"bench-{rng.randrange(10 ** 9)}", name="Benchmark Tenant",
+                    email="bench@example.com", settings={})
+    db.add(tenant)
+    db.commit()
+    service = Service(tenant_id=tenant.id, name="Consult", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.commit()
+    
+    def word():
+        return "".join(rng.choice("abcdefghijklmnop") for _ in range(rng.randint(4, 8)))
+    
+    start = datetime.combine(date.today() - timedelta(days=365), time(9, 0))
+    rows = []
+    for number in range(booking_count):
+        rows.append({
+            "tenant_id": tenant.id,
+            "service_id": service.id,
+            "start_time": start + timedelta(minutes=10 * number),
+            "end_time": start + timedelta(minutes=10 * number + 60),
+            "customer_name": f"{word()} {word()}",
+            "customer_email": f"{word()}@example.com",
+            "customer_phone": f"07{rng.randrange(10 ** 9):09d}",
+            "status": BookingStatus.CONFIRMED,
+            "is_exclusive": False
+        })
+        if len(rows) == 10000:
+            db.execute(Booking.__table__.insert(), rows)
+            rows = []
+    if rows:
+        db.execute(Booking.__table__.insert(), rows)
+    db.execute(text("ANALYZE"))
+    db.commit()
+    return engine, db, tenant
+
+
+def base_query(db, tenant_id):
+    return db.query(Booking).filter(Booking.tenant_id == tenant_id)
+
+
+def ranked_page(db, tenant_id, term, offset):
+    """The previous search: every match ordered by a CASE rank."""
+    tiers = search_tiers(term, db.get_bind().dialect.name)
+    rank = case(*((match, value) for value, match in tiers))
+    return base_query(db, tenant_id).filter(or_(*(match for _, match in tiers))).order_by(
+        rank, Booking.start_time.desc(), Booking.id.desc()
+    ).offset(offset).limit(PAGE_SIZE + 1).all()
+
+
+def tiered_page(db, tenant_id, term, offset):
+    tiers = search_tiers(term, db.get_bind().dialect.name)
+    return [row for _, row in fetch_search_page(base_query(db, tenant_id), tiers, PAGE_SIZE + 1, offset=offset)]
+
+
+def measure(db, search, tenant_id, terms, offset):
+    latencies = []
+    pages = []
+    for term in terms:
+        started = timer.perf_counter()
+        pages.append([booking.id for booking in search(db, tenant_id, term, offset)])
+        latencies.append(timer.perf_counter() - started)
+        db.rollback()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "pages": pages
+    }
+
+
+def print_plans(db, tenant_id, term):
+    dialect = db.get_bind().dialect
+    explain = "EXPLAIN QUERY PLAN" if dialect.name == "sqlite" else "EXPLAIN"
+    for rank, match in search_tiers(term, dialect.name):
+        query = base_query(db, tenant_id).filter(match).order_by(
+            Booking.start_time.desc(), Booking.id.desc()
+        ).limit(PAGE_SIZE + 1)
+        sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+        print(f"rank {rank}:")
+        for row in db.execute(text(f"{explain} {sql}")):
+            print(f"    {row[-1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--bookings", type=int, default=200000)
+    parser.add_argument("--searches", type=int, default=200)
+    args = parser.parse_args()
+    
+    engine, db, tenant = build_database(args.database_url, args.bookings)
+    tenant_id = tenant.id
+    rng = random.Random(7)
+    terms = ["".join(rng.choice("abcdefghijklmnop") for _ in range(3)) for _ in range(args.searches)]
+    
+    print(f"{args.searches} searches, {args.bookings} bookings")
+    print(f"{'path':<14} {'page':>6} {'p50':>9} {'p99':>9}")
+    for offset in (0, PAGE_SIZE * 4):
+        ranked = measure(db, ranked_page, tenant_id, terms, offset)
+        tiered = measure(db, tiered_page, tenant_id, terms, offset)
+        if ranked["pages"] != tiered["pages"]:
+            print("✗ Search paths disagree")
+            sys.exit(1)
+        page = offset // PAGE_SIZE + 1
+        for name, result in (("computed rank", ranked), ("per rank", tiered)):
+            print(f"{name:<14} {page:>6} {result['p50']:>7.2f}ms {result['p99']:>7.2f}ms")
+    print("✓ Both paths returned the same pages")
+    
+    print_plans(db, tenant_id, terms[0])
+
+
+if __name__ == "__main__":
+    main()
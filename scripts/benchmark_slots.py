@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Benchmark and cross-check the slot engines against local SQLite.
+
+Builds synthetic tenants with dense availability, hundreds of blackouts
+and thousands of bookings, then times SlotGenerator.generate_slots and
+is_slot_available over 1-, 7-, 30- and 90-day ranges. Every optimized
+engine must produce byte-identical JSON to the reference engine, and the
+reference engine must match the original per-row slot loop, which starts a
+grid at every availability row even where rows touch or overlap; the
+script exits non-zero if any output differs.
+
+Usage:
+    python scripts/benchmark_slots.py [--tenants 3] [--blackouts 300] [--bookings 3000]
+                                      [--ranges 1,7,30,90] [--repeat 5] [--probes 500]
+    python scripts/benchmark_slots.py --database-url sqlite:///bench.db
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time as timer
+from datetime import date, datetime, time, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.core.database import Base
+from api.models.tenant import Tenant
+from api.models.service import Service
+from api.models.availability import Availability, Blackout
+from api.models.booking import Booking, BookingStatus
+from api.services.slot_generator import SlotGenerator
+
+REFERENCE_ENGINE = "reference"
+OPTIMIZED_ENGINES = [engine for engine in SlotGenerator.ENGINES if engine != REFERENCE_ENGINE]
+
+# (duration_minutes, max_capacity) for each synthetic tenant's services
+SERVICE_SHAPES = [(15, None), (30, None), (45, 3), (60, 8)]
+
+
+def build_database(url, tenant_count, days, blackout_count, booking_count, seed=42):
+    """Create synthetic tenants on a fresh SQLite database."""
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    rng = random.Random(seed)
+    start = datetime.combine(date.today(), time.min)
+    
+    tenants = []
+    for number in range(tenant_count):
+        tenant = Tenant(slug=f"bench-{number}", name=f"Benchmark Tenant {number}",
+                        email=f"bench{number}@example.com", settings={})
+        db.add(tenant)
+        db.commit()
+        
+        services = [
+            Service(tenant_id=tenant.id, name=f"{minutes}-min", duration_minutes=minutes,
+                    max_capacity=capacity, is_active=True)
+            for minutes, capacity in SERVICE_SHAPES
+        ]
+        db.add_all(services)
+        
+        # Dense split shifts every day joined by a touching midday window,
+        # plus an overlapping evening window on weekdays and an off-grid
+        # start on weekends
+        for day_of_week in range(7):
+            db.add(Availability(tenant_id=tenant.id, day_of_week=day_of_week,
+                                start_time=time(7, 0), end_time=time(12, 0)))
+            db.add(Availability(tenant_id=tenant.id, day_of_week=day_of_week,
+                                start_time=time(12, 0), end_time=time(13, 0)))
+            db.add(Availability(tenant_id=tenant.id, day_of_week=day_of_week,
+                                start_time=time(13, 0), end_time=time(19, 0)))
+            if day_of_week < 5:
+                db.add(Availability(tenant_id=tenant.id, day_of_week=day_of_week,
+                                    start_time=time(18, 30), end_time=time(21, 30)))
+            else:
+                db.add(Availability(tenant_id=tenant.id, day_of_week=day_of_week,
+                                    start_time=time(21, 10), end_time=time(23, 0)))
+        
+        for _ in range(blackout_count):
+            blackout_start = start + timedelta(minutes=rng.randrange(0, days * 24 * 60, 5))
+            length = timedelta(minutes=rng.choice([15, 30, 45, 60, 120, 240, 1440]))
+            db.add(Blackout(tenant_id=tenant.id, start_datetime=blackout_start,
+                            end_datetime=blackout_start + length, reason="bench"))
+        db.commit()
+        
+        statuses = [BookingStatus.CONFIRMED] * 6 + [BookingStatus.COMPLETED, BookingStatus.CANCELLED,
+                                                    BookingStatus.NO_SHOW]
+        bookings = []
+        for _ in range(booking_count):
+            service = rng.choice(services)
+            booking_start = start + timedelta(days=rng.randrange(days),
+                                              minutes=rng.randrange(7 * 60, 21 * 60, 15))
+            bookings.append(Booking(
+                tenant_id=tenant.id,
+                service_id=service.id,
+                start_time=booking_start,
+                end_time=booking_start + timedelta(minutes=service.duration_minutes),
+                customer_name="Bench",
+                customer_email="bench@example.com",
+                status=rng.choice(statuses)
+            ))
+        db.add_all(bookings)
+        db.commit()
+        
+        tenants.append((tenant, services))
+    
+    return db, tenants
+
+
+def per_row_slots(db, tenant_id, service, start_date, end_date):
+    """
+    The original slot loop: a grid from the start of each availability row
+    in turn, minus blackouts. Bookings are not excluded, so compare it with
+    generate_slots(exclude_booked=False).
+    """
+    windows = db.query(Availability).filter(Availability.tenant_id == tenant_id).order_by(
+        Availability.start_time, Availability.end_time
+    ).all()
+    blackouts = db.query(Blackout.start_datetime, Blackout.end_datetime).filter(
+        Blackout.tenant_id == tenant_id
+    ).all()
+    duration = timedelta(minutes=service.duration_minutes)
+    
+    slots = []
+    current_date = start_date
+    while current_date <= end_date:
+        for window in windows:
+            if window.day_of_week != current_date.weekday():
+                continue
+            slot_start = datetime.combine(current_date, window.start_time)
+            while slot_start + duration <= datetime.combine(current_date, window.end_time):
+                if not any(slot_start < end and slot_start + duration > start for start, end in blackouts):
+                    slots.append({
+                        "start_time": slot_start.isoformat(),
+                        "end_time": (slot_start + duration).isoformat()
+                    })
+                slot_start += duration
+        current_date += timedelta(days=1)
+    return slots
+
+
+def best_of(repeat, func):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = timer.perf_counter()
+        result = func()
+        elapsed = timer.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def time_generate(db, tenant_id, service_id, start_date, end_date, repeat):
+    """Time each engine over a range; return timings and their JSON outputs."""
+    timings = {}
+    outputs = {}
+    for engine in [REFERENCE_ENGINE] + OPTIMIZED_ENGINES:
+        generator = SlotGenerator(db, tenant_id, engine=engine)
+        timings[engine], slots = best_of(
+            repeat,
+            lambda: generator.generate_slots(service_id, start_date, end_date)
+        )
+        outputs[engine] = json.dumps(slots).encode()
+    return timings, outputs
+
+
+def time_is_slot_available(db, tenant_id, service, start_date, days, probes, rng):
+    """Time is_slot_available over random probes inside the range."""
+    generator = SlotGenerator(db, tenant_id)
+    duration = timedelta(minutes=service.duration_minutes)
+    starts = [
+        datetime.combine(start_date, time.min)
+        + timedelta(days=rng.randrange(days), minutes=rng.randrange(6 * 60, 22 * 60, 5))
+        for _ in range(probes)
+    ]
+    started = timer.perf_counter()
+    for slot_start in starts:
+        generator.is_slot_available(service.id, slot_start, slot_start + duration)
+    return (timer.perf_counter() - started) / probes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--tenants", type=int, default=3)
+    parser.add_argument("--blackouts", type=int, default=300)
+    parser.add_argument("--bookings", type=int, default=3000)
+    parser.add_argument("--ranges", default="1,7,30,90")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--probes", type=int, default=500)
+    args = parser.parse_args()
+    
+    ranges = [int(days) for days in args.ranges.split(",")]
+    db, tenants = build_database(args.database_url, args.tenants, max(ranges),
+                                 args.blackouts, args.bookings)
+    start_date = date.today()
+    rng = random.Random(7)
+    mismatches = []
+    
+    print(f"{args.tenants} tenants x {len(SERVICE_SHAPES)} services, {args.blackouts} blackouts and "
+          f"{args.bookings} bookings per tenant, best of {args.repeat}")
+    header = f"{'tenant':<8} {'service':<8} {'days':>5} {'slots':>7} {REFERENCE_ENGINE:>11}"
+    for engine in OPTIMIZED_ENGINES:
+        header += f" {engine:>11} {'speedup':>8}"
+    print(header + f" {'is_avail':>10}")
+    
+    for tenant, services in tenants:
+        for service in services:
+            for days in ranges:
+                end_date = start_date + timedelta(days=days - 1)
+                timings, outputs = time_generate(db, tenant.id, service.id, start_date, end_date, args.repeat)
+                check = time_is_slot_available(db, tenant.id, service, start_date, days, args.probes, rng)
+                
+                reference = outputs[REFERENCE_ENGINE]
+                line = (f"{tenant.slug:<8} {service.name:<8} {days:>5} {len(json.loads(reference)):>7} "
+                        f"{timings[REFERENCE_ENGINE] * 1000:>9.2f}ms")
+                for engine in OPTIMIZED_ENGINES:
+                    if outputs[engine] != reference:
+                        mismatches.append((tenant.slug, service.name, days, engine))
+                    line += (f" {timings[engine] * 1000:>9.2f}ms "
+                             f"{timings[REFERENCE_ENGINE] / timings[engine]:>7.1f}x")
+                print(line + f" {check * 1_000_000:>8.0f}us")
+            
+            # The per-row loop scans every blackout per slot, so it is only
+            # run over the longest range, untimed
+            end_date = start_date + timedelta(days=max(ranges) - 1)
+            expected = per_row_slots(db, tenant.id, service, start_date, end_date)
+            actual = SlotGenerator(db, tenant.id, engine=REFERENCE_ENGINE).generate_slots(
+                service.id, start_date, end_date, exclude_booked=False
+            )
+            if actual != expected:
+                mismatches.append((tenant.slug, service.name, max(ranges), "per-row loop"))
+    
+    if mismatches:
+        for slug, service_name, days, engine in mismatches:
+            print(f"✗ {slug} {service_name} {days}d: {engine} output differs from {REFERENCE_ENGINE}")
+        sys.exit(1)
+    
+    print(f"✓ {', '.join(OPTIMIZED_ENGINES)} output byte-identical to {REFERENCE_ENGINE}, "
+          f"which matches the per-row loop")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Deliver queued emails from the email outbox.
+
+Drains due messages in batches, one SMTP connection per batch, retrying
+failed sends with exponential backoff. Run it as a long-lived process
+next to the API (or with --once from cron). Several workers can run
+against PostgreSQL; each claims different rows.
+
+Usage:
+    python scripts/email_outbox_worker.py [--interval 5] [--batch-size 100]
+    python scripts/email_outbox_worker.py --once
+"""
+import argparse
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api.core.database import SessionLocal
+from api.services.email_outbox import deliver_pending
+
+
+def drain(batch_size):
+    """Deliver batches until nothing is due; return the total outcome counts."""
+    totals = {"sent": 0, "retried": 0, "failed": 0}
+    db = SessionLocal()
+    try:
+        while True:
+            outcomes = deliver_pending(db, batch_size=batch_size)
+            for outcome, count in outcomes.items():
+                totals[outcome] += count
+            if sum(outcomes.values()) < batch_size:
+                return totals
+    finally:
+        db.close()
+
+
+def run(interval, batch_size, once=False):
+    while True:
+        try:
+            totals = drain(batch_size)
+            if any(totals.values()):
+                print(f"✓ Sent {totals['sent']}, retrying {totals['retried']}, failed {totals['failed']}")
+        except Exception as e:
+            print(f"✗ Error delivering outbox: {str(e)}")
+            if once:
+                sys.exit(1)
+        
+        if once:
+            return
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deliver queued emails from the email outbox")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds to wait when the outbox is empty")
+    parser.add_argument("--batch-size", type=int, default=100, help="Messages sent per SMTP connection")
+    parser.add_argument("--once", action="store_true", help="Drain the outbox once and exit")
+    args = parser.parse_args()
+    
+    run(args.interval, args.batch_size, once=args.once)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Build queued booking export jobs.
+
+Claims pending export jobs one at a time, writes each file to the export
+store (EXPORT_STORAGE_DIR) and marks the job completed or failed. On
+every pass, jobs left running by a worker that died are failed after
+EXPORT_JOB_TIMEOUT_MINUTES and expired jobs and their files are purged.
+Run it as a long-lived process next to the API (or with --once from
+cron). Several workers can run against PostgreSQL; each claims different
+jobs.
+
+Usage:
+    python scripts/export_job_worker.py [--interval 5]
+    python scripts/export_job_worker.py --once
+"""
+import argparse
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api.core.database import SessionLocal
+from api.models.export_job import ExportJobStatus
+from api.services.export_jobs import fail_stale_jobs, process_next_job, purge_expired_jobs
+
+
+def drain():
+    """Run jobs until none are pending; return (completed, failed, purged) counts."""
+    completed = 0
+    db = SessionLocal()
+    try:
+        failed = fail_stale_jobs(db)
+        if failed:
+            print(f"✗ Failed {failed} export jobs left running")
+        purged = purge_expired_jobs(db)
+        while True:
+            job = process_next_job(db)
+            if job is None:
+                return completed, failed, purged
+            if job.status == ExportJobStatus.COMPLETED:
+                completed += 1
+                print(f"✓ Export job {job.id}: {job.row_count} rows, {job.file_size} bytes")
+            else:
+                failed += 1
+                print(f"✗ Export job {job.id} failed: {job.error}")
+    finally:
+        db.close()
+
+
+def run(interval, once=False):
+    while True:
+        try:
+            completed, failed, purged = drain()
+            if purged:
+                print(f"✓ Purged {purged} expired export jobs")
+        except Exception as e:
+            print(f"✗ Error running export jobs: {str(e)}")
+            if once:
+                sys.exit(1)
+        
+        if once:
+            return
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build queued booking export jobs")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds to wait when no job is pending")
+    parser.add_argument("--once", action="store_true", help="Run pending jobs once and exit")
+    args = parser.parse_args()
+    
+    run(args.interval, once=args.once)
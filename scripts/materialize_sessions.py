@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Materialize sessions for one tenant or all tenants.
+
+Run nightly to roll the horizon forward. Existing sessions keep their IDs.
+
+Usage:
+    python scripts/materialize_sessions.py --tenant acme-corp [--days 90]
+    python scripts/materialize_sessions.py --all
+"""
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api.core.config import settings
+from api.core.database import SessionLocal
+from api.models.tenant import Tenant
+from api.services.session_store import SessionStore
+
+
+def materialize_sessions(tenant_slug=None, horizon_days=None):
+    """Materialize sessions for the tenant with the given slug, or every active tenant."""
+    db = SessionLocal()
+    
+    try:
+        query = db.query(Tenant)
+        if tenant_slug:
+            query = query.filter(Tenant.slug == tenant_slug)
+        else:
+            query = query.filter(Tenant.is_active == True)
+        
+        tenants = query.all()
+        if tenant_slug and not tenants:
+            print(f"✗ Tenant not found: {tenant_slug}")
+            sys.exit(1)
+        
+        for tenant in tenants:
+            created = SessionStore(db, tenant.id).materialize(horizon_days=horizon_days)
+            db.commit()
+            print(f"✓ Materialized {tenant.slug}: {created} new sessions")
+        
+        print(f"\n✓ Materialized sessions for {len(tenants)} tenant(s)")
+    
+    except Exception as e:
+        print(f"✗ Error materializing sessions: {str(e)}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize sessions over a rolling horizon")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--tenant", help="Tenant slug to materialize")
+    target.add_argument("--all", action="store_true", help="Materialize every active tenant")
+    parser.add_argument("--days", type=int, default=settings.SLOT_INVENTORY_HORIZON_DAYS,
+                        help="Horizon in days, starting today")
+    args = parser.parse_args()
+    
+    materialize_sessions(args.tenant, args.days)
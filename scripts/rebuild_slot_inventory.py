@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Rebuild the materialized slot inventory for one tenant or all tenants.
+
+Run nightly (or after bulk data changes) to roll the horizon forward.
+
+Usage:
+    python scripts/rebuild_slot_inventory.py --tenant acme-corp [--days 90]
+    python scripts/rebuild_slot_inventory.py --all
+"""
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api.core.config import settings
+from api.core.database import SessionLocal
+from api.models.tenant import Tenant
+from api.services.slot_inventory import SlotInventoryManager
+
+
+def rebuild_slot_inventory(tenant_slug=None, horizon_days=None):
+    """Rebuild inventory for the tenant with the given slug, or every active tenant."""
+    db = SessionLocal()
+    
+    try:
+        query = db.query(Tenant)
+        if tenant_slug:
+            query = query.filter(Tenant.slug == tenant_slug)
+        else:
+            query = query.filter(Tenant.is_active == True)
+        
+        tenants = query.all()
+        if tenant_slug and not tenants:
+            print(f"✗ Tenant not found: {tenant_slug}")
+            sys.exit(1)
+        
+        for tenant in tenants:
+            written = SlotInventoryManager(db, tenant.id).rebuild(horizon_days=horizon_days)
+            db.commit()
+            print(f"✓ Rebuilt {tenant.slug}: {written} slots")
+        
+        print(f"\n✓ Rebuilt slot inventory for {len(tenants)} tenant(s)")
+    
+    except Exception as e:
+        print(f"✗ Error rebuilding slot inventory: {str(e)}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the materialized slot inventory")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--tenant", help="Tenant slug to rebuild")
+    target.add_argument("--all", action="store_true", help="Rebuild every active tenant")
+    parser.add_argument("--days", type=int, default=settings.SLOT_INVENTORY_HORIZON_DAYS,
+                        help="Horizon in days, starting today")
+    args = parser.parse_args()
+    
+    rebuild_slot_inventory(args.tenant, args.days)
@@ -1,14 +1,20 @@
+import asyncio
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from api.main import app
-from api.core.database import Base, get_db
+from api.core.database import Base, get_async_db, get_db
 from api.models.tenant import Tenant
+from api.services.availability_cache import availability_cache
+from api.services.session_cache import session_list_cache
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# A named shared-cache in-memory database, so the async engine sees the
+# same tables and rows as the sync test session
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:testdb?mode=memory&cache=shared&uri=true"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -17,9 +23,19 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# No pooling: every event loop (TestClient portal, asyncio.run) opens its own connection
+async_engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://"),
+    poolclass=NullPool,
+)
+AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 @pytest.fixture(scope="function")
 def db():
+    # Tenant IDs and cache versions restart with every test database
+    availability_cache.clear()
+    session_list_cache.clear()
     Base.metadata.create_all(bind=engine)
     db = TestingSessionLocal()
     try:
@@ -37,12 +53,28 @@ def client(db):
         finally:
             pass
     
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as async_db:
+            yield async_db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def run_async(db):
+    """Call an async endpoint directly with an AsyncSession on the test database."""
+    def run(endpoint, **kwargs):
+        async def call():
+            async with AsyncTestingSessionLocal() as async_db:
+                return await endpoint(db=async_db, **kwargs)
+        return asyncio.run(call())
+    return run
+
+
 @pytest.fixture
 def test_tenant(db):
     tenant = Tenant(
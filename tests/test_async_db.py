@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from fastapi import status
+from datetime import time, datetime, timedelta, date
+
+
+def _next_monday():
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    return today + timedelta(days=days_ahead)
+
+
+def test_async_endpoints_do_not_block_event_loop(client, test_tenant, db, monkeypatch):
+    """Test that async endpoints never run a blocking database call on the event loop thread."""
+    from sqlalchemy import event
+    from api.main import app
+    from api.core.permissions import require_admin_access
+    from api.middleware import tenant as tenant_middleware
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.models.booking import Booking, BookingStatus
+    from api.models.user import User, UserRole
+    from tests.conftest import AsyncTestingSessionLocal, engine
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=4, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(12, 0)))
+    admin = User(email="admin@example.com", full_name="Admin", hashed_password="x",
+                 role=UserRole.SUPERADMIN, is_active=True)
+    db.add(admin)
+    db.commit()
+    db.refresh(service)
+    
+    monday = _next_monday()
+    booking = Booking(
+        tenant_id=test_tenant.id,
+        service_id=service.id,
+        start_time=datetime.combine(monday, time(9, 0)),
+        end_time=datetime.combine(monday, time(10, 0)),
+        customer_name="Customer",
+        customer_email="customer@example.com",
+        status=BookingStatus.CONFIRMED
+    )
+    db.add(booking)
+    db.commit()
+    db.refresh(booking)
+    db.refresh(admin)
+    
+    # Resolve the tenant from the test database and skip real authentication
+    monkeypatch.setattr(tenant_middleware, "AsyncSessionLocal", AsyncTestingSessionLocal)
+    app.dependency_overrides[require_admin_access] = lambda: admin
+    
+    blocking = []
+    
+    def on_execute(conn, cursor, statement, *args):
+        # The sync engine only runs off the loop, in FastAPI's threadpool
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        blocking.append(statement)
+    
+    headers = {"X-Tenant-Slug": test_tenant.slug, "Authorization": "Bearer test"}
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        responses = [
+            client.get(f"/api/v1/sessions/public?from_date={monday}&to_date={monday}", headers=headers),
+            client.get(f"/api/v1/sessions/public/grouped?from_date={monday}", headers=headers),
+            client.get("/api/v1/branding/public", headers=headers),
+            client.post("/api/v1/gdpr/dsar", json={"email": "admin@example.com"}, headers=headers),
+            client.get("/api/v1/gdpr/retention-status", headers=headers),
+            client.get("/public/book", headers=headers),
+            client.get(f"/public/book/slots?service_id={service.id}&date={monday}", headers=headers),
+            client.get(f"/public/book/details?service_id={service.id}&date={monday}&time=11:00", headers=headers),
+            client.get(f"/public/book/confirmation?booking_id={booking.id}", headers=headers),
+        ]
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    
+    assert [response.status_code for response in responses] == [status.HTTP_200_OK] * len(responses)
+    assert blocking == []
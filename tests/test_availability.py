@@ -1,6 +1,6 @@
 import pytest
 from fastapi import status
-from datetime import time, datetime, timedelta
+from datetime import time, datetime, timedelta, date
 
 
 def test_create_availability(client, test_tenant):
@@ -419,3 +419,120 @@ def test_tenant_isolation_blackouts(client, test_tenant, test_tenant_2, db):
     data = response.json()
     assert len(data) == 1
     assert data[0]["tenant_id"] == test_tenant.id
+
+
+def test_compile_weekly_schedule_keeps_each_window(test_tenant):
+    """Test that windows compile into sorted minute intervals per weekday, one per window."""
+    from api.models.availability import Availability
+    from api.services.availability_cache import compile_weekly_schedule
+    
+    windows = [
+        Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(13, 0), end_time=time(17, 0)),
+        Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(12, 0)),
+        Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(11, 0), end_time=time(13, 0)),
+        Availability(tenant_id=test_tenant.id, day_of_week=2, start_time=time(9, 0, 30), end_time=time(10, 0, 59)),
+    ]
+    
+    schedule = compile_weekly_schedule(windows)
+    
+    assert schedule[0] == ((540, 720), (660, 780), (780, 1020))
+    assert schedule[1] == ()
+    assert schedule[2] == ((541, 600),)
+
+
+def test_availability_cache_version_invalidation(test_tenant, db):
+    """Test that bumping the tenant version makes the cache reload availability."""
+    from api.models.availability import Availability
+    from api.services.availability_cache import WeeklyScheduleCache, bump_availability_version
+    
+    cache = WeeklyScheduleCache(maxsize=8)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(12, 0)))
+    db.commit()
+    
+    assert cache.get(db, test_tenant.id)[0] == ((540, 720),)
+    assert cache.get(db, test_tenant.id)[0] == ((540, 720),)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    
+    # A write without a version bump is not visible yet
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=1, start_time=time(9, 0), end_time=time(10, 0)))
+    db.commit()
+    assert cache.get(db, test_tenant.id)[1] == ()
+    
+    bump_availability_version(test_tenant)
+    db.commit()
+    
+    assert cache.get(db, test_tenant.id)[1] == ((540, 600),)
+    assert cache.stats()["misses"] == 2
+
+
+def test_availability_write_refreshes_in_one_transaction(test_tenant, db):
+    """Test that availability writes rebuild inventory and sessions before their single commit, without caching uncommitted schedules."""
+    from sqlalchemy import event
+    from api.api.v1.endpoints.availability import create_availability
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.schemas.availability import AvailabilityCreate
+    from api.services.availability_cache import availability_cache, bump_availability_version
+    from api.services.session_store import SessionStore
+    from api.services.slot_inventory import SlotInventoryManager
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=4, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(10, 0)))
+    bump_availability_version(test_tenant)
+    db.commit()
+    SlotInventoryManager(db, test_tenant.id).rebuild()
+    SessionStore(db, test_tenant.id).materialize(horizon_days=28)
+    db.commit()
+    
+    commits = []
+    
+    def listener(session):
+        commits.append(session)
+    
+    event.listen(db, "after_commit", listener)
+    try:
+        create_availability(
+            availability_in=AvailabilityCreate(day_of_week=0, start_time=time(14, 0), end_time=time(15, 0)),
+            tenant=test_tenant,
+            db=db
+        )
+    finally:
+        event.remove(db, "after_commit", listener)
+    assert len(commits) == 1
+    
+    today = date.today()
+    monday = today + timedelta(days=(7 - today.weekday()) or 7)
+    slots = SlotInventoryManager(db, test_tenant.id).read_slots(service.id, monday, monday)
+    assert [slot["start_time"][11:16] for slot in slots] == ["09:00", "14:00"]
+    assert [row.start_time.hour for row in SessionStore(db, test_tenant.id).read(monday, monday, [service.id])] == [9, 14]
+    
+    # A schedule read inside a transaction that is rolled back is not cached
+    # for the version it would have committed
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(18, 0), end_time=time(19, 0)))
+    bump_availability_version(test_tenant)
+    db.flush()
+    assert availability_cache.get(db, test_tenant.id)[0] == ((540, 600), (840, 900), (1080, 1140))
+    db.rollback()
+    
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(16, 0), end_time=time(17, 0)))
+    bump_availability_version(test_tenant)
+    db.commit()
+    assert availability_cache.get(db, test_tenant.id)[0] == ((540, 600), (840, 900), (960, 1020))
+
+
+def test_availability_cache_lru_eviction(test_tenant, test_tenant_2, db):
+    """Test that the cache evicts the least recently used tenant when full."""
+    from api.services.availability_cache import WeeklyScheduleCache
+    
+    cache = WeeklyScheduleCache(maxsize=1)
+    
+    cache.get(db, test_tenant.id)
+    cache.get(db, test_tenant_2.id)
+    cache.get(db, test_tenant.id)
+    
+    stats = cache.stats()
+    assert stats["size"] == 1
+    assert stats["misses"] == 3
+    assert stats["evictions"] == 2
@@ -574,3 +574,830 @@ def test_tenant_isolation_bookings(client, test_tenant, test_tenant_2, db):
     data = response.json()
     assert len(data) == 1
     assert data[0]["customer_name"] == "Tenant 1 Customer"
+
+
+def test_overlap_guard_rejects_racing_booking(test_tenant, db, monkeypatch):
+    """Test that the database overlap guard turns a booking that slipped past admission into a 409."""
+    from fastapi import HTTPException
+    from sqlalchemy.exc import IntegrityError
+    from api.api.v1.endpoints import bookings as bookings_endpoint
+    from api.core.config import settings
+    from api.models.service import Service
+    from api.models.booking import Booking, BookingStatus
+    from api.schemas.booking import BookingCreate
+    from api.services.booking_admission import is_double_booking
+    from api.services.slot_generator import Admission
+    
+    single = Service(tenant_id=test_tenant.id, name="Consult", duration_minutes=60, is_active=True)
+    group = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=5, is_active=True)
+    db.add_all([single, group])
+    db.commit()
+    
+    start = datetime.combine(date.today() + timedelta(days=7), time(10, 0))
+    
+    def booking(service, offset_minutes=0, exclusive=True):
+        return Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=start + timedelta(minutes=offset_minutes),
+            end_time=start + timedelta(minutes=offset_minutes + 60),
+            customer_name="Customer",
+            customer_email="customer@example.com",
+            status=BookingStatus.CONFIRMED,
+            is_exclusive=exclusive
+        )
+    
+    db.add(booking(single))
+    db.commit()
+    
+    # Overlapping exclusive bookings are rejected by the database
+    db.add(booking(single, offset_minutes=30))
+    with pytest.raises(IntegrityError) as exc_info:
+        db.commit()
+    assert is_double_booking(exc_info.value)
+    db.rollback()
+    
+    # Back-to-back bookings and overlapping group bookings are allowed
+    db.add_all([booking(single, offset_minutes=60), booking(group, exclusive=False), booking(group, exclusive=False)])
+    db.commit()
+    
+    # A writer that passed admission concurrently gets a 409, not a 500
+    monkeypatch.setattr(settings, "ENABLE_EMAIL_NOTIFICATIONS", False)
+    monkeypatch.setattr(bookings_endpoint, "admit_booking", lambda *args: (Admission.ADMITTED, single))
+    booking_in = BookingCreate(
+        service_id=single.id,
+        start_time=start + timedelta(minutes=15),
+        end_time=start + timedelta(minutes=75),
+        customer_name="Racer",
+        customer_email="racer@example.com"
+    )
+    with pytest.raises(HTTPException) as http_exc:
+        bookings_endpoint.create_booking(booking_in=booking_in, tenant=test_tenant, db=db)
+    assert http_exc.value.status_code == status.HTTP_409_CONFLICT
+    assert db.query(Booking).filter(Booking.service_id == single.id).count() == 2
+
+
+def test_advisory_admission_locks_service_day(test_tenant, db, monkeypatch):
+    """Test that advisory admission takes one lock per service and day and still enforces capacity."""
+    from fastapi import HTTPException
+    from api.api.v1.endpoints.bookings import create_booking
+    from api.core.config import settings
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.models.booking_lock import BookingLock
+    from api.schemas.booking import BookingCreate
+    from api.services.booking_admission import booking_lock_days, booking_lock_key
+    from api.services.booking_import import BookingImporter
+    
+    monday = date.today() + timedelta(days=(7 - date.today().weekday()) or 7)
+    
+    # Keys are stable and differ per tenant, service and day
+    assert booking_lock_key(1, 2, monday) == booking_lock_key(1, 2, monday)
+    assert len({
+        booking_lock_key(1, 2, monday),
+        booking_lock_key(1, 3, monday),
+        booking_lock_key(2, 2, monday),
+        booking_lock_key(1, 2, monday + timedelta(days=1))
+    }) == 4
+    
+    # A booking that crosses midnight locks both days
+    late = datetime.combine(monday, time(23, 0))
+    assert booking_lock_days(late, late + timedelta(hours=1)) == [monday]
+    assert booking_lock_days(late, late + timedelta(hours=2)) == [monday, monday + timedelta(days=1)]
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=2, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)))
+    db.commit()
+    
+    monkeypatch.setattr(settings, "BOOKING_ADMISSION_MODE", "advisory")
+    monkeypatch.setattr(settings, "ENABLE_EMAIL_NOTIFICATIONS", False)
+    
+    def book():
+        start = datetime.combine(monday, time(10, 0))
+        return create_booking(
+            booking_in=BookingCreate(
+                service_id=service.id,
+                start_time=start,
+                end_time=start + timedelta(hours=1),
+                customer_name="Customer",
+                customer_email="customer@example.com"
+            ),
+            tenant=test_tenant,
+            db=db
+        )
+    
+    book()
+    book()
+    with pytest.raises(HTTPException) as exc_info:
+        book()
+    assert exc_info.value.status_code == status.HTTP_409_CONFLICT
+    db.rollback()
+    
+    locks = db.query(BookingLock).filter(BookingLock.tenant_id == test_tenant.id).all()
+    assert [(lock.service_id, lock.day) for lock in locks] == [(service.id, monday)]
+    
+    # Bulk imports take the same locks for every service and day they touch
+    tuesday = monday + timedelta(days=1)
+    rows = [
+        {
+            "service_id": service.id,
+            "start_time": datetime.combine(day, time(hour, 0)).isoformat(),
+            "end_time": datetime.combine(day, time(hour + 1, 0)).isoformat(),
+            "customer_name": "Imported",
+            "customer_email": "imported@example.com"
+        }
+        for day, hour in [(tuesday, 9), (monday, 12)]
+    ]
+    results = BookingImporter(db, test_tenant.id, check_availability=False).run(rows)
+    assert [result["status"] for result in results] == ["created", "created"]
+    db.commit()
+    locks = db.query(BookingLock).filter(BookingLock.tenant_id == test_tenant.id).order_by(BookingLock.day).all()
+    assert [(lock.service_id, lock.day) for lock in locks] == [(service.id, monday), (service.id, tuesday)]
+
+
+def test_bulk_import_reports_every_row(client, test_tenant, db, monkeypatch):
+    """Test that a bulk import checks rows against existing bookings and each other in one pass."""
+    from api.main import app
+    from api.core.config import settings
+    from api.core.permissions import require_tenant_access
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.models.booking import Booking, BookingStatus
+    from api.models.session_capacity import SessionCapacity
+    from api.models.email_outbox import EmailOutbox
+    
+    single = Service(tenant_id=test_tenant.id, name="Consult", duration_minutes=60, is_active=True)
+    group = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=2, is_active=True)
+    db.add_all([single, group])
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)))
+    db.commit()
+    
+    monday = date.today() + timedelta(days=(7 - date.today().weekday()) or 7)
+    
+    def at(hour, minute=0):
+        return datetime.combine(monday, time(hour, minute))
+    
+    db.add(Booking(
+        tenant_id=test_tenant.id,
+        service_id=single.id,
+        start_time=at(10),
+        end_time=at(11),
+        customer_name="Existing",
+        customer_email="existing@example.com",
+        status=BookingStatus.CONFIRMED,
+        is_exclusive=True
+    ))
+    db.commit()
+    
+    monkeypatch.setattr(settings, "ENABLE_EMAIL_NOTIFICATIONS", True)
+    app.dependency_overrides[require_tenant_access] = lambda: test_tenant
+    headers = {"Authorization": "Bearer test"}
+    
+    rows = [
+        (single.id, at(10, 30), "overlaps existing"),
+        (single.id, at(11, 30), "overlaps row 3"),
+        (single.id, at(11), "first in the batch"),
+        (group.id, at(10), "seat 1"),
+        (group.id, at(10), "seat 2"),
+        (group.id, at(10, 30), "class full"),
+        (single.id, at(18), "after hours"),
+        (999, at(12), "unknown service"),
+    ]
+    lines = ["service_id,start_time,end_time,customer_name,customer_email,notes"]
+    lines += [
+        f"{service_id},{start.isoformat()},{(start + timedelta(hours=1)).isoformat()},Customer {number},c{number}@example.com,{notes}"
+        for number, (service_id, start, notes) in enumerate(rows)
+    ]
+    lines.append(f"{single.id},{at(14).isoformat()},{at(15).isoformat()},No Email,not-an-email,")
+    
+    response = client.post(
+        "/api/v1/bookings/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "text/csv", **headers}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    assert [result["status"] for result in report["results"]] == [
+        "conflict", "conflict", "created", "created", "created",
+        "conflict", "unavailable", "service_not_found", "invalid"
+    ]
+    assert [result["row"] for result in report["results"]] == list(range(1, 10))
+    assert (report["total"], report["created"], report["failed"]) == (9, 3, 6)
+    assert "customer_email" in report["results"][8]["error"]
+    
+    created_ids = {result["booking_id"] for result in report["results"] if result["status"] == "created"}
+    stored = db.query(Booking).filter(Booking.id.in_(created_ids)).all()
+    assert sorted(booking.notes for booking in stored) == ["first in the batch", "seat 1", "seat 2"]
+    assert all(booking.is_exclusive == (booking.service_id == single.id) for booking in stored)
+    
+    ledger = db.query(SessionCapacity).filter(SessionCapacity.service_id == group.id).one()
+    assert ledger.booked == 2
+    assert db.query(EmailOutbox).count() == 0
+    
+    # A dry run reports without writing; JSON bodies are accepted too
+    response = client.post(
+        "/api/v1/bookings/bulk?dry_run=true",
+        json={"bookings": [{
+            "service_id": single.id,
+            "start_time": at(15).isoformat(),
+            "end_time": at(16).isoformat(),
+            "customer_name": "Later",
+            "customer_email": "later@example.com"
+        }]},
+        headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["results"] == [{"row": 1, "status": "created", "booking_id": None, "error": None}]
+    assert db.query(Booking).count() == 4
+    
+    response = client.post("/api/v1/bookings/bulk", content="{", headers={"Content-Type": "application/json", **headers})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_idempotency_key_replays_booking_response(test_tenant, db, monkeypatch):
+    """Test that a retried booking with the same Idempotency-Key returns the original response."""
+    import json
+    from fastapi import HTTPException
+    from fastapi.encoders import jsonable_encoder
+    from api.api.v1.endpoints.bookings import create_booking
+    from api.core.config import settings
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.models.booking import Booking
+    from api.models.email_outbox import EmailOutbox
+    from api.schemas.booking import BookingCreate
+    
+    service = Service(tenant_id=test_tenant.id, name="Consult", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)))
+    db.commit()
+    
+    monkeypatch.setattr(settings, "ENABLE_EMAIL_NOTIFICATIONS", True)
+    
+    monday = date.today() + timedelta(days=(7 - date.today().weekday()) or 7)
+    
+    def book(hour, key):
+        return create_booking(
+            booking_in=BookingCreate(
+                service_id=service.id,
+                start_time=datetime.combine(monday, time(hour, 0)),
+                end_time=datetime.combine(monday, time(hour + 1, 0)),
+                customer_name="Mobile Customer",
+                customer_email="mobile@example.com"
+            ),
+            idempotency_key=key,
+            tenant=test_tenant,
+            db=db
+        )
+    
+    first = book(10, "retry-1")
+    retry = book(10, "retry-1")
+    
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert json.loads(retry.body) == jsonable_encoder(first)
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db.query(Booking).count() == 1
+    assert db.query(EmailOutbox).count() == 2
+    
+    # The same key with a different request is rejected
+    with pytest.raises(HTTPException) as exc_info:
+        book(12, "retry-1")
+    assert exc_info.value.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    # Expired keys can be used again
+    monkeypatch.setattr(settings, "IDEMPOTENCY_KEY_TTL_HOURS", 0)
+    assert isinstance(book(12, "retry-2"), dict)
+    assert isinstance(book(14, "retry-2"), dict)
+    assert db.query(Booking).count() == 3
+
+
+def test_public_booking_replays_with_idempotency_key(client, test_tenant, db):
+    """Test that a retried public booking with the same Idempotency-Key returns the original response."""
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.models.booking import Booking
+    
+    # The public form books for tenant 1
+    assert test_tenant.id == 1
+    service = Service(tenant_id=test_tenant.id, name="Consult", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)))
+    db.commit()
+    
+    monday = date.today() + timedelta(days=(7 - date.today().weekday()) or 7)
+    payload = {
+        "service_id": service.id,
+        "start_time": datetime.combine(monday, time(10, 0)).isoformat(),
+        "end_time": datetime.combine(monday, time(11, 0)).isoformat(),
+        "customer_name": "Web Customer",
+        "customer_email": "web@example.com"
+    }
+    headers = {"Idempotency-Key": "public-1"}
+    
+    first = client.post("/api/v1/bookings/public", json=payload, headers=headers)
+    assert first.status_code == status.HTTP_201_CREATED
+    assert first.json()["status"] == "confirmed"
+    
+    retry = client.post("/api/v1/bookings/public", json=payload, headers=headers)
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert db.query(Booking).count() == 1
+
+
+def test_public_booking_is_admitted_like_staff_bookings(test_tenant, db):
+    """Test that public bookings are checked against availability, blackouts and overlaps, and counted."""
+    from fastapi import HTTPException
+    from api.api.v1.endpoints.bookings import create_public_booking
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.models.booking import BookingStatus
+    from api.schemas.booking import BookingCreate
+    from api.services.session_capacity import load_session_counts
+    from api.services.slot_inventory import SlotInventoryManager
+    
+    service = Service(tenant_id=test_tenant.id, name="Consult", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    monday = date.today() + timedelta(days=(7 - date.today().weekday()) or 7)
+    db.add(Blackout(
+        tenant_id=test_tenant.id,
+        start_datetime=datetime.combine(monday, time(12, 0)),
+        end_datetime=datetime.combine(monday, time(13, 0))
+    ))
+    db.commit()
+    SlotInventoryManager(db, test_tenant.id).rebuild()
+    db.commit()
+    
+    def book(hour):
+        return create_public_booking(
+            booking_in=BookingCreate(
+                service_id=service.id,
+                start_time=datetime.combine(monday, time(hour, 0)),
+                end_time=datetime.combine(monday, time(hour + 1, 0)),
+                customer_name="Web Customer",
+                customer_email="web@example.com"
+            ),
+            idempotency_key=None,
+            db=db
+        )
+    
+    booking = book(10)
+    assert booking["status"] == BookingStatus.CONFIRMED
+    ten = datetime.combine(monday, time(10, 0))
+    assert load_session_counts(db, test_tenant.id, [service.id], monday, monday)[(service.id, ten)] == 1
+    assert ten.isoformat() not in {
+        slot["start_time"] for slot in SlotInventoryManager(db, test_tenant.id).read_slots(service.id, monday, monday)
+    }
+    
+    for hour, expected in ((10, status.HTTP_409_CONFLICT), (12, status.HTTP_400_BAD_REQUEST), (18, status.HTTP_400_BAD_REQUEST)):
+        with pytest.raises(HTTPException) as exc_info:
+            book(hour)
+        assert exc_info.value.status_code == expected
+
+
+def test_list_bookings_keyset_pages_in_one_query(client, test_tenant, db):
+    """Test that the booking list joins service names and pages by (start_time, id) cursor."""
+    from sqlalchemy import event
+    from api.main import app
+    from api.core.permissions import require_tenant_access
+    from api.models.service import Service
+    from api.models.booking import Booking, BookingStatus
+    from tests.conftest import engine
+    
+    services = [
+        Service(tenant_id=test_tenant.id, name=f"Service {number}", duration_minutes=60, is_active=True)
+        for number in range(2)
+    ]
+    db.add_all(services)
+    db.commit()
+    
+    start = datetime.combine(date.today() + timedelta(days=3), time(9, 0))
+    # Two bookings share each start time, so pages must break ties by id
+    db.add_all([
+        Booking(
+            tenant_id=test_tenant.id,
+            service_id=services[number % 2].id,
+            start_time=start + timedelta(hours=number // 2),
+            end_time=start + timedelta(hours=number // 2 + 1),
+            customer_name=f"Customer {number}",
+            customer_email=f"c{number}@example.com",
+            status=BookingStatus.CONFIRMED
+        )
+        for number in range(7)
+    ])
+    db.commit()
+    expected = [
+        booking.id for booking in
+        db.query(Booking).order_by(Booking.start_time.desc(), Booking.id.desc())
+    ]
+    
+    app.dependency_overrides[require_tenant_access] = lambda: test_tenant
+    
+    statements = []
+    
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        pages = []
+        params = {"limit": 3}
+        while True:
+            response = client.get("/api/v1/bookings/", params=params)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(response.json())
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [item["id"] for page in pages for item in page] == expected
+    assert {item["service_name"] for page in pages for item in page} == {"Service 0", "Service 1"}
+    assert len([statement for statement in statements if "FROM bookings" in statement]) == len(pages)
+    
+    response = client.get("/api/v1/bookings/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    response = client.get("/api/v1/bookings/", params={"limit": 501})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_export_streams_csv_in_batches(client, test_tenant, db, monkeypatch):
+    """Test that the CSV export reads bookings in one joined query and writes them in chunks."""
+    import csv
+    from sqlalchemy import event
+    from api.main import app
+    from api.core.config import settings
+    from api.core.permissions import require_tenant_access
+    from api.models.service import Service
+    from api.models.booking import Booking, BookingStatus
+    from api.services.booking_export import API_HEADER, api_row, stream_bookings_csv
+    from tests.conftest import engine
+    
+    monkeypatch.setattr(settings, "BOOKING_EXPORT_BATCH_SIZE", 2)
+    service = Service(tenant_id=test_tenant.id, name="Export Service", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.commit()
+    
+    start = datetime.combine(date.today() + timedelta(days=2), time(9, 0))
+    db.add_all([
+        Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=start + timedelta(hours=number),
+            end_time=start + timedelta(hours=number + 1),
+            customer_name=f"Customer {number}",
+            customer_email=f"c{number}@example.com",
+            status=BookingStatus.CONFIRMED
+        )
+        for number in range(5)
+    ])
+    db.commit()
+    
+    # Header first, then one chunk per two rows
+    chunks = list(stream_bookings_csv(db, test_tenant.id, API_HEADER, api_row))
+    assert [len(list(csv.reader(chunk.splitlines()))) for chunk in chunks] == [1, 2, 2, 1]
+    
+    app.dependency_overrides[require_tenant_access] = lambda: test_tenant
+    
+    statements = []
+    
+    def on_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        response = client.get("/api/v1/bookings/export")
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(response.text.splitlines()))
+    assert rows[0] == API_HEADER
+    assert [row[5] for row in rows[1:]] == [f"Customer {number}" for number in reversed(range(5))]
+    assert {row[4] for row in rows[1:]} == {"Export Service"}
+    assert len([statement for statement in statements if "FROM bookings" in statement]) == 1
+
+
+def test_export_gzip_and_ndjson_formats(client, test_tenant, db, monkeypatch):
+    """Test that exports are gzipped incrementally and can be NDJSON."""
+    import csv
+    import gzip
+    import json
+    import zlib
+    from api.main import app
+    from api.core.config import settings
+    from api.core.permissions import require_tenant_access
+    from api.models.service import Service
+    from api.models.booking import Booking, BookingStatus
+    from api.services.booking_export import API_HEADER, accepts_gzip, gzip_stream
+    
+    monkeypatch.setattr(settings, "BOOKING_EXPORT_BATCH_SIZE", 2)
+    service = Service(tenant_id=test_tenant.id, name="Export Service", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.commit()
+    
+    start = datetime.combine(date.today() + timedelta(days=2), time(9, 0))
+    db.add_all([
+        Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=start + timedelta(hours=number),
+            end_time=start + timedelta(hours=number + 1),
+            customer_name=f"Customer {number}",
+            customer_email=f"c{number}@example.com",
+            status=BookingStatus.CONFIRMED
+        )
+        for number in range(5)
+    ])
+    db.commit()
+    
+    # Every chunk decompresses on its own as soon as it arrives
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert [decompressor.decompress(chunk) for chunk in gzip_stream(["a,b\n", "c,d\n"])][:2] == [b"a,b\n", b"c,d\n"]
+    assert accepts_gzip("deflate, gzip;q=0.5")
+    assert not accepts_gzip("gzip;q=0, deflate")
+    
+    app.dependency_overrides[require_tenant_access] = lambda: test_tenant
+    
+    response = client.get("/api/v1/bookings/export", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert list(csv.reader(response.text.splitlines()))[0] == API_HEADER
+    
+    response = client.get("/api/v1/bookings/export", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert len(response.text.splitlines()) == 6
+    
+    response = client.get("/api/v1/bookings/export", params={"format": "csv.gz"})
+    assert response.headers["content-type"] == "application/gzip"
+    assert ".csv.gz" in response.headers["content-disposition"]
+    rows = list(csv.reader(gzip.decompress(response.content).decode().splitlines()))
+    assert rows[0] == API_HEADER
+    assert len(rows) == 6
+    
+    response = client.get("/api/v1/bookings/export", params={"format": "ndjson"})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["customer_name"] for record in records] == [f"Customer {number}" for number in reversed(range(5))]
+    assert records[0]["service_name"] == "Export Service"
+    assert records[0]["status"] == "confirmed"
+    
+    response = client.get("/api/v1/bookings/export", params={"format": "xlsx"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_export_job_builds_file_and_serves_ranges(client, test_tenant, db, monkeypatch, tmp_path):
+    """Test that export jobs reuse the export filters and their files can be downloaded in ranges."""
+    import csv
+    from api.main import app
+    from api.core.config import settings
+    from api.core.permissions import require_tenant_access
+    from api.models.service import Service
+    from api.models.booking import Booking, BookingStatus
+    from api.services.export_jobs import process_next_job
+    
+    monkeypatch.setattr(settings, "EXPORT_STORAGE_DIR", str(tmp_path))
+    service = Service(tenant_id=test_tenant.id, name="Export Service", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.commit()
+    
+    start = datetime.combine(date.today() + timedelta(days=2), time(9, 0))
+    db.add_all([
+        Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=start + timedelta(hours=number),
+            end_time=start + timedelta(hours=number + 1),
+            customer_name=f"Customer {number}",
+            customer_email=f"c{number}@example.com",
+            status=BookingStatus.CANCELLED if number == 0 else BookingStatus.CONFIRMED
+        )
+        for number in range(4)
+    ])
+    db.commit()
+    
+    app.dependency_overrides[require_tenant_access] = lambda: test_tenant
+    
+    response = client.post(
+        "/api/v1/bookings/export/jobs",
+        params={"status": "confirmed"},
+        headers={"Authorization": "Bearer test"}
+    )
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert job["status"] == "pending"
+    assert job["filters"] == {"status": "confirmed"}
+    job_url = response.headers["Location"]
+    
+    response = client.get(f"{job_url}/download")
+    assert response.status_code == status.HTTP_409_CONFLICT
+    
+    assert process_next_job(db).status.value == "completed"
+    assert process_next_job(db) is None
+    
+    job = client.get(job_url).json()
+    assert job["status"] == "completed"
+    assert job["row_count"] == 3
+    
+    full = client.get(job["download_url"])
+    assert full.status_code == status.HTTP_200_OK
+    assert full.headers["accept-ranges"] == "bytes"
+    assert len(full.content) == job["file_size"]
+    rows = list(csv.reader(full.text.splitlines()))
+    assert [row[5] for row in rows[1:]] == ["Customer 3", "Customer 2", "Customer 1"]
+    
+    # Resume after the first 10 bytes
+    etag = full.headers["etag"]
+    rest = client.get(job["download_url"], headers={"Range": "bytes=10-", "If-Range": etag})
+    assert rest.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert rest.headers["content-range"] == f"bytes 10-{job['file_size'] - 1}/{job['file_size']}"
+    assert full.content[:10] + rest.content == full.content
+    
+    tail = client.get(job["download_url"], headers={"Range": "bytes=-5"})
+    assert tail.content == full.content[-5:]
+    
+    response = client.get(job["download_url"], headers={"Range": f"bytes={job['file_size']}-"})
+    assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers["content-range"] == f"bytes */{job['file_size']}"
+    
+    # A stale If-Range gets the whole file
+    response = client.get(job["download_url"], headers={"Range": "bytes=10-", "If-Range": '"other"'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == full.content
+
+
+def test_stale_running_export_jobs_are_failed(test_tenant, db, monkeypatch, tmp_path):
+    """Test that jobs left running past the timeout are marked failed and later purged."""
+    import os
+    from datetime import timezone
+    from api.core.config import settings
+    from api.models.export_job import ExportJob, ExportJobStatus
+    from api.services.export_jobs import export_file_path, fail_stale_jobs, purge_expired_jobs
+    
+    monkeypatch.setattr(settings, "EXPORT_STORAGE_DIR", str(tmp_path))
+    now = datetime.now(timezone.utc)
+    stale, running = [
+        ExportJob(
+            tenant_id=test_tenant.id,
+            format="csv",
+            filters={},
+            status=ExportJobStatus.RUNNING,
+            started_at=now - timedelta(minutes=minutes)
+        )
+        for minutes in (settings.EXPORT_JOB_TIMEOUT_MINUTES + 1, 1)
+    ]
+    db.add_all([stale, running])
+    db.commit()
+    
+    partial = f"{export_file_path(stale)}.part"
+    os.makedirs(os.path.dirname(partial))
+    open(partial, "w").close()
+    
+    assert fail_stale_jobs(db, now) == 1
+    assert (stale.status, stale.error) == (ExportJobStatus.FAILED, "Export timed out")
+    assert running.status == ExportJobStatus.RUNNING
+    assert not os.path.exists(partial)
+    
+    assert purge_expired_jobs(db, now + timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS)) == 1
+    assert db.query(ExportJob).count() == 1
+
+
+def test_list_bookings_customer_search_ranks_and_pages(client, test_tenant, db):
+    """Test that customer search ranks exact matches first and pages by cursor."""
+    from api.main import app
+    from api.core.permissions import require_tenant_access
+    from api.models.service import Service
+    from api.models.booking import Booking, BookingStatus
+    
+    service = Service(tenant_id=test_tenant.id, name="Search Service", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.commit()
+    
+    start = datetime.combine(date.today() + timedelta(days=3), time(9, 0))
+    customers = [
+        ("Ann", "ann.exact@example.com", None),
+        ("Annabel Lee", "lee@example.com", None),
+        ("Bob Stone", "anna@example.com", None),
+        ("Joanne Park", "jo@example.com", None),
+        ("Carl Ray", "carl@example.com", "0755 123"),
+    ]
+    bookings = [
+        Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=start + timedelta(hours=number),
+            end_time=start + timedelta(hours=number + 1),
+            customer_name=name,
+            customer_email=email,
+            customer_phone=phone,
+            status=BookingStatus.CONFIRMED
+        )
+        for number, (name, email, phone) in enumerate(customers)
+    ]
+    db.add_all(bookings)
+    db.commit()
+    ids = {booking.customer_name: booking.id for booking in bookings}
+    
+    app.dependency_overrides[require_tenant_access] = lambda: test_tenant
+    
+    # The exact name match first, then prefix matches newest first
+    pages = []
+    params = {"search": "ANN", "limit": 2}
+    while True:
+        response = client.get("/api/v1/bookings/", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([item["id"] for item in response.json()])
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    found = [booking_id for page in pages for booking_id in page]
+    assert pages[0] == [ids["Ann"], ids["Bob Stone"]]
+    assert found[2] == ids["Annabel Lee"]
+    # SQLite matches prefixes; PostgreSQL also finds "Joanne" by substring
+    assert set(found[3:]) <= {ids["Joanne Park"]}
+    
+    response = client.get("/api/v1/bookings/", params={"search": "0755"})
+    assert [item["id"] for item in response.json()] == [ids["Carl Ray"]]
+    
+    response = client.get("/api/v1/bookings/", params={"search": "a%_"})
+    assert response.json() == []
+    
+    response = client.get("/api/v1/bookings/", params={"search": "an"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    # A cursor from the unfiltered list does not fit a search
+    response = client.get("/api/v1/bookings/", params={"limit": 1})
+    response = client.get(
+        "/api/v1/bookings/",
+        params={"search": "ann", "cursor": response.headers["X-Next-Cursor"]}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_customer_search_ranks_are_read_through_search_indexes(test_tenant, db):
+    """Test that every search rank is read through the customer search indexes, not a tenant scan."""
+    import random
+    from sqlalchemy import event, text
+    from api.models.service import Service
+    from api.models.booking import Booking, BookingStatus
+    from api.services.booking_search import fetch_search_page, search_tiers
+    from tests.conftest import engine
+    
+    service = Service(tenant_id=test_tenant.id, name="Search Service", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.commit()
+    
+    rng = random.Random(1)
+    
+    def word():
+        return "".join(rng.choice("abcdefghijklmnop") for _ in range(rng.randint(4, 8)))
+    
+    start = datetime.combine(date.today() + timedelta(days=1), time(9, 0))
+    db.execute(Booking.__table__.insert(), [
+        {
+            "tenant_id": test_tenant.id,
+            "service_id": service.id,
+            "start_time": start + timedelta(hours=number),
+            "end_time": start + timedelta(hours=number + 1),
+            "customer_name": f"{word()} {word()}",
+            "customer_email": f"{word()}@example.com",
+            "status": BookingStatus.CONFIRMED,
+            "is_exclusive": True
+        }
+        for number in range(500)
+    ])
+    db.execute(text("ANALYZE"))
+    db.commit()
+    
+    tenant_id = test_tenant.id
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    
+    # Past the last match, so every rank is both read and counted
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        page = fetch_search_page(
+            db.query(Booking).filter(Booking.tenant_id == tenant_id),
+            search_tiers("Abc", "sqlite"),
+            limit=50,
+            offset=500
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert page == []
+    assert len(statements) == 4
+    
+    for statement, parameters in statements:
+        plan = " ".join(row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+        for column in ("customer_name", "customer_email", "customer_phone"):
+            assert f"USING INDEX ix_bookings_{column}_prefix" in plan
@@ -158,14 +158,16 @@ def test_booking_creates_with_email_disabled(client, test_tenant, db):
         settings.ENABLE_EMAIL_NOTIFICATIONS = original_setting
 
 
+@patch('api.services.email_service.smtplib.SMTP')
 @patch('api.services.email_service.email_service.send_booking_confirmation_to_customer')
 @patch('api.services.email_service.email_service.send_booking_notification_to_business')
-def test_booking_sends_emails_when_enabled(mock_business_email, mock_customer_email, client, test_tenant, db):
+def test_booking_sends_emails_when_enabled(mock_business_email, mock_customer_email, mock_smtp, client, test_tenant, db):
     """Test that bookings trigger email notifications when enabled."""
     from api.models.service import Service
     from api.models.availability import Availability
     from datetime import time, date
     from api.core.config import settings
+    from api.services.email_outbox import deliver_pending
     
     # Ensure email is enabled
     original_setting = settings.ENABLE_EMAIL_NOTIFICATIONS
@@ -219,6 +221,10 @@ def test_booking_sends_emails_when_enabled(mock_business_email, mock_customer_em
         
         assert response.status_code == 201
         
+        # Emails are queued with the booking and sent by the outbox worker
+        mock_customer_email.assert_not_called()
+        deliver_pending(db)
+        
         # Verify emails were called
         mock_customer_email.assert_called_once()
         mock_business_email.assert_called_once()
@@ -228,7 +234,111 @@ def test_booking_sends_emails_when_enabled(mock_business_email, mock_customer_em
         assert customer_call.kwargs['customer_email'] == "john@example.com"
         assert customer_call.kwargs['customer_name'] == "John Doe"
         assert customer_call.kwargs['service_name'] == "Test Service"
-        
+    
     finally:
         # Restore original setting
         settings.ENABLE_EMAIL_NOTIFICATIONS = original_setting
+
+
+@patch('api.services.email_service.smtplib.SMTP')
+def test_connection_reuses_one_smtp_session(mock_smtp):
+    """Test that emails sent inside connection() share one SMTP handshake."""
+    mock_server = MagicMock()
+    mock_smtp.return_value.__enter__.return_value = mock_server
+    
+    service = EmailService()
+    start_time = datetime.now() + timedelta(days=1)
+    
+    with service.connection():
+        for email in ("one@example.com", "two@example.com"):
+            assert service.send_booking_confirmation_to_customer(
+                customer_email=email,
+                customer_name="John Doe",
+                service_name="Consultation",
+                start_time=start_time,
+                end_time=start_time + timedelta(hours=1),
+                tenant_name="Acme Corp",
+                tenant_email="contact@acme.com"
+            ) is True
+    
+    mock_smtp.assert_called_once()
+    mock_server.login.assert_called_once()
+    assert mock_server.send_message.call_count == 2
+
+
+def test_outbox_delivers_with_retries_and_backoff(test_tenant, db, monkeypatch):
+    """Test that bookings queue emails in their transaction and the worker retries failed sends."""
+    from contextlib import contextmanager
+    from datetime import time, date, timezone
+    from api.api.v1.endpoints.bookings import create_booking
+    from api.core.config import settings
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.models.email_outbox import EmailOutbox, OutboxStatus
+    from api.schemas.booking import BookingCreate
+    from api.services.email_outbox import deliver_pending
+    
+    service = Service(tenant_id=test_tenant.id, name="Consultation", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)))
+    db.commit()
+    
+    monkeypatch.setattr(settings, "ENABLE_EMAIL_NOTIFICATIONS", True)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_RETRY_SECONDS", 60)
+    # Any SMTP traffic from the request path would fail the test
+    monkeypatch.setattr("api.services.email_service.smtplib.SMTP", None)
+    
+    monday = date.today() + timedelta(days=(7 - date.today().weekday()) or 7)
+    booking = create_booking(
+        booking_in=BookingCreate(
+            service_id=service.id,
+            start_time=datetime.combine(monday, time(10, 0)),
+            end_time=datetime.combine(monday, time(11, 0)),
+            customer_name="John Doe",
+            customer_email="john@example.com"
+        ),
+        tenant=test_tenant,
+        db=db
+    )
+    
+    messages = db.query(EmailOutbox).order_by(EmailOutbox.id).all()
+    assert [(message.kind, message.to_email) for message in messages] == [
+        ("booking_confirmation", "john@example.com"),
+        ("booking_notification", test_tenant.email),
+    ]
+    assert all(message.booking_id == booking["id"] for message in messages)
+    
+    class FlakySender:
+        """Fails every business notification; records confirmations."""
+        def __init__(self):
+            self.connections = 0
+            self.sent = []
+        
+        @contextmanager
+        def connection(self):
+            self.connections += 1
+            yield self
+        
+        def send_booking_confirmation_to_customer(self, **kwargs):
+            self.sent.append(kwargs)
+            return True
+        
+        def send_booking_notification_to_business(self, **kwargs):
+            return False
+    
+    sender = FlakySender()
+    now = datetime.now(timezone.utc)
+    assert deliver_pending(db, sender=sender, now=now) == {"sent": 1, "retried": 1, "failed": 0}
+    assert sender.connections == 1
+    assert sender.sent[0]["start_time"] == datetime.combine(monday, time(10, 0))
+    
+    # Not due again until the backoff has passed, which doubles each time
+    assert deliver_pending(db, sender=sender, now=now + timedelta(seconds=30)) == {"sent": 0, "retried": 0, "failed": 0}
+    assert deliver_pending(db, sender=sender, now=now + timedelta(seconds=61)) == {"sent": 0, "retried": 1, "failed": 0}
+    assert deliver_pending(db, sender=sender, now=now + timedelta(seconds=150)) == {"sent": 0, "retried": 0, "failed": 0}
+    assert deliver_pending(db, sender=sender, now=now + timedelta(seconds=182)) == {"sent": 0, "retried": 0, "failed": 1}
+    
+    notification = db.query(EmailOutbox).filter(EmailOutbox.kind == "booking_notification").one()
+    assert (notification.status, notification.attempts) == (OutboxStatus.FAILED, 3)
+    assert len(sender.sent) == 1
@@ -0,0 +1,359 @@
+import pytest
+from datetime import time, datetime, timedelta, date
+
+
+def _next_monday():
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    return today + timedelta(days=days_ahead)
+
+
+def test_session_capacity_ledger_tracks_booking_changes(test_tenant, db):
+    """Test that the ledger follows bookings being created, moved and cancelled."""
+    from api.models.service import Service
+    from api.models.booking import Booking, BookingStatus
+    from api.services.session_capacity import load_session_counts, record_booking_change, session_key
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=10, is_active=True)
+    db.add(service)
+    db.commit()
+    db.refresh(service)
+    
+    monday = _next_monday()
+    nine = datetime.combine(monday, time(9, 0))
+    ten = datetime.combine(monday, time(10, 0))
+    
+    bookings = []
+    for _ in range(3):
+        booking = Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=nine,
+            end_time=nine + timedelta(hours=1),
+            customer_name="Customer",
+            customer_email="customer@example.com",
+            status=BookingStatus.CONFIRMED
+        )
+        db.add(booking)
+        record_booking_change(db, None, booking)
+        bookings.append(booking)
+    db.commit()
+    
+    assert load_session_counts(db, test_tenant.id, [service.id], monday, monday) == {(service.id, nine): 3}
+    
+    # Move one booking to 10:00 and cancel another
+    before = session_key(bookings[0])
+    bookings[0].start_time = ten
+    bookings[0].end_time = ten + timedelta(hours=1)
+    record_booking_change(db, before, bookings[0])
+    
+    before = session_key(bookings[1])
+    bookings[1].status = BookingStatus.CANCELLED
+    record_booking_change(db, before, bookings[1])
+    
+    # Cancelling twice does not decrement again
+    before = session_key(bookings[1])
+    record_booking_change(db, before, bookings[1])
+    db.commit()
+    
+    assert load_session_counts(db, test_tenant.id, [service.id], monday, monday) == {
+        (service.id, nine): 1,
+        (service.id, ten): 1,
+    }
+    assert load_session_counts(db, test_tenant.id, [service.id], monday + timedelta(days=1), monday + timedelta(days=1)) == {}
+
+
+def test_public_sessions_read_counts_from_ledger(test_tenant, db, run_async):
+    """Test that public sessions report booked counts from the ledger in one query."""
+    from sqlalchemy import event
+    from api.api.v1.endpoints.sessions import get_public_sessions
+    from tests.conftest import async_engine
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.services.session_capacity import adjust_session_capacity
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=4, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(12, 0)))
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(14, 0), end_time=time(16, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    monday = _next_monday()
+    adjust_session_capacity(db, test_tenant.id, service.id, datetime.combine(monday, time(9, 0)), 4)
+    adjust_session_capacity(db, test_tenant.id, service.id, datetime.combine(monday, time(14, 0)), 1)
+    db.commit()
+    
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        sessions = run_async(
+            get_public_sessions,
+            tenant=test_tenant,
+            from_date=monday,
+            to_date=monday + timedelta(days=27),
+            service_id=None
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    
+    first_day = [session for session in sessions if session.start_time.date() == monday]
+    assert [(session.start_time.hour, session.booked_count, session.is_sold_out) for session in first_day] == [
+        (9, 4, True),
+        (14, 1, False),
+    ]
+    assert len(sessions) == 8
+    assert not any("count(" in statement.lower() for statement in statements)
+
+
+def test_touching_windows_each_start_a_session(test_tenant, db, run_async):
+    """Test that adjoining availability windows keep a session per window, listed and materialized."""
+    from api.api.v1.endpoints.sessions import get_public_sessions
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.services.availability_cache import availability_cache
+    from api.services.session_store import SessionStore
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=4, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(12, 0)))
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(12, 0), end_time=time(17, 0)))
+    db.commit()
+    
+    assert availability_cache.get(db, test_tenant.id)[0] == ((540, 720), (720, 1020))
+    
+    monday = _next_monday()
+    sessions = run_async(
+        get_public_sessions, tenant=test_tenant, from_date=monday, to_date=monday, service_id=None
+    )
+    assert [session.start_time.hour for session in sessions] == [9, 12]
+    
+    SessionStore(db, test_tenant.id).materialize(horizon_days=28)
+    db.commit()
+    sessions = run_async(
+        get_public_sessions, tenant=test_tenant, from_date=monday, to_date=monday, service_id=None
+    )
+    assert [session.start_time.hour for session in sessions] == [9, 12]
+
+
+def test_sessions_without_an_inventory_row_are_listed(test_tenant, db):
+    """Test that a session start the slot inventory has no row for is still listed, counted from the ledger."""
+    from api.api.v1.endpoints.sessions import _load_public_sessions
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.models.slot_inventory import SlotInventory
+    from api.services.session_capacity import reserve_session_seat
+    from api.services.slot_inventory import SlotInventoryManager
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=4, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(12, 0)))
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(12, 0), end_time=time(17, 0)))
+    db.commit()
+    
+    monday = _next_monday()
+    noon = datetime.combine(monday, time(12, 0))
+    db.refresh(service)
+    assert reserve_session_seat(db, test_tenant.id, service.id, noon, service.max_capacity)
+    SlotInventoryManager(db, test_tenant.id).rebuild()
+    db.query(SlotInventory).filter(
+        SlotInventory.service_id == service.id,
+        SlotInventory.start_time == noon
+    ).delete()
+    db.commit()
+    
+    sessions = _load_public_sessions(db, test_tenant, monday, monday, None)
+    assert [(session.start_time.hour, session.booked_count) for session in sessions] == [(9, 0), (12, 1)]
+
+
+def test_materialized_sessions_keep_ids_and_book_by_id(test_tenant, db, run_async):
+    """Test that materialized sessions keep their IDs across syncs and can be booked until full."""
+    from fastapi import HTTPException
+    from api.api.v1.endpoints.sessions import book_session, get_public_sessions
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.schemas.booking import SessionBookingCreate
+    from api.services.availability_cache import bump_availability_version
+    from api.services.session_store import SessionStore
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=2, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(10, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    store = SessionStore(db, test_tenant.id)
+    assert store.materialize(horizon_days=28) == 4
+    db.commit()
+    
+    monday = _next_monday()
+    sessions = run_async(
+        get_public_sessions, tenant=test_tenant, from_date=monday, to_date=monday + timedelta(days=6), service_id=None
+    )
+    assert len(sessions) == 1
+    session_id = sessions[0].id
+    assert store.get(session_id).start_time == datetime.combine(monday, time(9, 0))
+    
+    # A new window adds sessions without renumbering existing ones
+    availability = Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(14, 0), end_time=time(15, 0))
+    db.add(availability)
+    bump_availability_version(test_tenant)
+    db.commit()
+    store.refresh()
+    db.commit()
+    assert store.get(session_id) is not None
+    
+    customer = SessionBookingCreate(customer_name="Customer", customer_email="customer@example.com")
+    for _ in range(2):
+        booking = book_session(session_id=session_id, booking_in=customer, tenant=test_tenant, db=db)
+        assert booking["start_time"] == datetime.combine(monday, time(9, 0))
+    
+    with pytest.raises(HTTPException) as exc_info:
+        book_session(session_id=session_id, booking_in=customer, tenant=test_tenant, db=db)
+    assert exc_info.value.status_code == 409
+    
+    # Removing the window deactivates its sessions
+    db.delete(availability)
+    db.query(Availability).filter(Availability.start_time == time(9, 0)).delete()
+    bump_availability_version(test_tenant)
+    db.commit()
+    store.refresh()
+    db.commit()
+    assert store.get(session_id) is None
+
+
+def test_service_without_max_capacity_takes_one_booking_per_session(test_tenant, db):
+    """Test that a service without max_capacity lists and books one seat per session, like booking admission."""
+    from fastapi import HTTPException
+    from api.api.v1.endpoints.sessions import _load_public_sessions, book_session
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.schemas.booking import SessionBookingCreate
+    from api.services.booking_admission import is_exclusive_service
+    from api.services.session_store import SessionStore
+    
+    service = Service(tenant_id=test_tenant.id, name="Consultation", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(10, 0)))
+    db.commit()
+    db.refresh(service)
+    assert is_exclusive_service(service)
+    
+    SessionStore(db, test_tenant.id).materialize(horizon_days=28)
+    db.commit()
+    
+    monday = _next_monday()
+    session = _load_public_sessions(db, test_tenant, monday, monday, None)[0]
+    assert (session.max_capacity, session.spaces_left, session.is_available) == (1, 1, True)
+    
+    customer = SessionBookingCreate(customer_name="Customer", customer_email="customer@example.com")
+    book_session(session_id=session.id, booking_in=customer, tenant=test_tenant, db=db)
+    with pytest.raises(HTTPException) as exc_info:
+        book_session(session_id=session.id, booking_in=customer, tenant=test_tenant, db=db)
+    assert exc_info.value.status_code == 409
+    
+    session = _load_public_sessions(db, test_tenant, monday, monday, None)[0]
+    assert (session.spaces_left, session.is_available, session.is_sold_out) == (0, False, True)
+
+
+def test_sessions_inside_blackout_are_hidden_and_rejected(test_tenant, db, run_async):
+    """Test that a session inside a blackout cannot be booked and is hidden until the blackout is removed."""
+    from fastapi import HTTPException
+    from api.api.v1.endpoints.blackouts import create_blackout, delete_blackout
+    from api.api.v1.endpoints.sessions import book_session, get_public_sessions
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.schemas.availability import BlackoutCreate
+    from api.schemas.booking import SessionBookingCreate
+    from api.services.session_store import SessionStore
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=5, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(10, 0)))
+    db.commit()
+    
+    store = SessionStore(db, test_tenant.id)
+    store.materialize(horizon_days=28)
+    db.commit()
+    
+    monday = _next_monday()
+    session_id = run_async(
+        get_public_sessions, tenant=test_tenant, from_date=monday, to_date=monday, service_id=None
+    )[0].id
+    
+    # A blackout written without re-syncing still blocks the booking
+    blackout = Blackout(
+        tenant_id=test_tenant.id,
+        start_datetime=datetime.combine(monday, time(8, 0)),
+        end_datetime=datetime.combine(monday, time(12, 0))
+    )
+    db.add(blackout)
+    db.commit()
+    customer = SessionBookingCreate(customer_name="Customer", customer_email="customer@example.com")
+    with pytest.raises(HTTPException) as exc_info:
+        book_session(session_id=session_id, booking_in=customer, tenant=test_tenant, db=db)
+    assert exc_info.value.status_code == 400
+    db.delete(blackout)
+    db.commit()
+    
+    # Blackout writes deactivate and restore the sessions they cover
+    created = create_blackout(
+        blackout_in=BlackoutCreate(
+            start_datetime=datetime.combine(monday, time(8, 0)),
+            end_datetime=datetime.combine(monday, time(12, 0))
+        ),
+        tenant=test_tenant,
+        db=db
+    )
+    assert store.get(session_id) is None
+    assert run_async(
+        get_public_sessions, tenant=test_tenant, from_date=monday, to_date=monday, service_id=None
+    ) == []
+    
+    delete_blackout(blackout_id=created.id, tenant=test_tenant, db=db)
+    assert store.get(session_id) is not None
+    assert book_session(session_id=session_id, booking_in=customer, tenant=test_tenant, db=db)["id"]
+
+
+def test_grouped_sessions_served_from_cache_until_invalidated(test_tenant, db, run_async):
+    """Test that repeated widget loads run no queries and a booking invalidates the cached list."""
+    from sqlalchemy import event
+    from api.api.v1.endpoints.sessions import get_grouped_sessions
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.services.session_capacity import adjust_session_capacity
+    from api.services.session_cache import bump_sessions_version
+    from tests.conftest import async_engine
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=4, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(10, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    monday = _next_monday()
+    
+    def load():
+        groups = run_async(get_grouped_sessions, tenant=test_tenant, from_date=monday, to_date=monday + timedelta(days=6))
+        return [session.booked_count for group in groups for session in group.sessions]
+    
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        assert load() == [0]
+        computed = len(statements)
+        assert computed > 0
+        assert load() == [0]
+        assert len(statements) == computed
+        
+        adjust_session_capacity(db, test_tenant.id, service.id, datetime.combine(monday, time(9, 0)), 1)
+        bump_sessions_version(db, test_tenant.id)
+        db.commit()
+        assert load() == [1]
+        assert len(statements) > computed
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
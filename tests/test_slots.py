@@ -3,6 +3,27 @@ from fastapi import status
 from datetime import time, datetime, timedelta, date
 
 
+def _per_row_slots(windows, blackouts, duration_minutes, start_date, end_date):
+    """The original slot loop: a grid from each availability row's start, minus blackouts."""
+    slots = []
+    duration = timedelta(minutes=duration_minutes)
+    current_date = start_date
+    while current_date <= end_date:
+        for window in sorted(windows, key=lambda w: (w.start_time, w.end_time)):
+            if window.day_of_week != current_date.weekday():
+                continue
+            slot_start = datetime.combine(current_date, window.start_time)
+            while slot_start + duration <= datetime.combine(current_date, window.end_time):
+                if not any(slot_start < end and slot_start + duration > start for start, end in blackouts):
+                    slots.append({
+                        "start_time": slot_start.isoformat(),
+                        "end_time": (slot_start + duration).isoformat()
+                    })
+                slot_start += duration
+        current_date += timedelta(days=1)
+    return slots
+
+
 def test_generate_slots_basic(client, test_tenant, db):
     """Test basic slot generation."""
     from api.models.service import Service
@@ -239,6 +260,30 @@ def test_generate_slots_invalid_date_range(client, test_tenant, db):
     assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
+def test_generate_slots_requires_end_date_or_days(client, test_tenant, db):
+    """Test that a slot query without end_date or days is rejected rather than failing."""
+    from api.models.service import Service
+    
+    service = Service(
+        tenant_id=test_tenant.id,
+        name="Service",
+        duration_minutes=30,
+        is_active=True
+    )
+    db.add(service)
+    db.commit()
+    db.refresh(service)
+    
+    today = date.today()
+    headers = {"X-Tenant-Slug": test_tenant.slug}
+    
+    response = client.get(f"/api/v1/slots/?service_id={service.id}&start_date={today}", headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    response = client.get(f"/api/v1/slots/batch?start_date={today}", headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 def test_generate_slots_date_range_too_large(client, test_tenant, db):
     """Test that date range is limited to 90 days."""
     from api.models.service import Service
@@ -397,3 +442,759 @@ def test_slot_generator_is_slot_available(test_tenant, db):
     slot_start = datetime.combine(next_monday, time(14, 0))
     slot_end = datetime.combine(next_monday, time(15, 0))
     assert generator.is_slot_available(service.id, slot_start, slot_end) is False
+
+
+def test_bitmap_engine_matches_reference(test_tenant, db):
+    """Test that the bitmap engine returns exactly what the reference loop returns."""
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.services.slot_generator import SlotGenerator
+    
+    service = Service(
+        tenant_id=test_tenant.id,
+        name="25-min Service",
+        duration_minutes=25,
+        is_active=True
+    )
+    db.add(service)
+    
+    # Overlapping and non-minute-aligned windows
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)))
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(16, 0), end_time=time(18, 10)))
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=1, start_time=time(9, 0, 30), end_time=time(12, 0)))
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=2, start_time=time(0, 0), end_time=time(23, 59, 59)))
+    
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    next_monday = today + timedelta(days=days_ahead)
+    
+    blackouts = [
+        # Sub-minute edges
+        (datetime.combine(next_monday, time(10, 0, 30)), datetime.combine(next_monday, time(10, 1))),
+        (datetime.combine(next_monday, time(11, 59, 59)), datetime.combine(next_monday, time(12, 0, 0, 1))),
+        # Spans midnight into Tuesday
+        (datetime.combine(next_monday, time(17, 30)), datetime.combine(next_monday + timedelta(days=1), time(9, 45))),
+        # Degenerate (end before start) inside Wednesday
+        (datetime.combine(next_monday + timedelta(days=2), time(13, 10)), datetime.combine(next_monday + timedelta(days=2), time(13, 5))),
+        # Starts before the requested range
+        (datetime.combine(next_monday - timedelta(days=3), time(8, 0)), datetime.combine(next_monday + timedelta(days=2), time(6, 0))),
+    ]
+    for start, end in blackouts:
+        db.add(Blackout(tenant_id=test_tenant.id, start_datetime=start, end_datetime=end))
+    db.commit()
+    db.refresh(service)
+    
+    start_date = next_monday
+    end_date = next_monday + timedelta(days=13)
+    
+    reference = SlotGenerator(db, test_tenant.id, engine="reference").generate_slots(
+        service.id, start_date, end_date
+    )
+    bitmap = SlotGenerator(db, test_tenant.id, engine="bitmap").generate_slots(
+        service.id, start_date, end_date
+    )
+    
+    assert len(reference) > 0
+    assert bitmap == reference
+
+
+def test_slot_generator_rejects_unknown_engine(test_tenant, db):
+    """Test that an unknown engine name is rejected."""
+    from api.services.slot_generator import SlotGenerator
+    
+    with pytest.raises(ValueError):
+        SlotGenerator(db, test_tenant.id, engine="quantum")
+
+
+@pytest.mark.parametrize("engine", ["bitmap", "reference"])
+def test_generate_slots_excludes_booked_slots(test_tenant, db, engine):
+    """Test that confirmed bookings remove their slots but cancelled ones do not."""
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.models.booking import Booking, BookingStatus
+    from api.services.slot_generator import SlotGenerator
+    
+    service = Service(
+        tenant_id=test_tenant.id,
+        name="60-min Service",
+        duration_minutes=60,
+        is_active=True
+    )
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(13, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    next_monday = today + timedelta(days=days_ahead)
+    
+    for hour, booking_status in [(9, BookingStatus.CONFIRMED), (10, BookingStatus.CANCELLED), (11, BookingStatus.COMPLETED)]:
+        db.add(Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=datetime.combine(next_monday, time(hour, 0)),
+            end_time=datetime.combine(next_monday, time(hour + 1, 0)),
+            customer_name="Customer",
+            customer_email="customer@example.com",
+            status=booking_status
+        ))
+    db.commit()
+    
+    slots = SlotGenerator(db, test_tenant.id, engine=engine).generate_slots(
+        service.id, next_monday, next_monday
+    )
+    
+    assert [slot["start_time"] for slot in slots] == [
+        datetime.combine(next_monday, time(10, 0)).isoformat(),
+        datetime.combine(next_monday, time(12, 0)).isoformat(),
+    ]
+
+
+@pytest.mark.parametrize("engine", ["bitmap", "reference"])
+def test_generate_slots_honours_max_capacity(test_tenant, db, engine):
+    """Test that a group slot stays listed until it reaches max_capacity."""
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.models.booking import Booking, BookingStatus
+    from api.services.slot_generator import SlotGenerator
+    
+    service = Service(
+        tenant_id=test_tenant.id,
+        name="Group Class",
+        duration_minutes=60,
+        max_capacity=2,
+        is_active=True
+    )
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(11, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    next_monday = today + timedelta(days=days_ahead)
+    
+    def book(hour):
+        db.add(Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=datetime.combine(next_monday, time(hour, 0)),
+            end_time=datetime.combine(next_monday, time(hour + 1, 0)),
+            customer_name="Customer",
+            customer_email="customer@example.com",
+            status=BookingStatus.CONFIRMED
+        ))
+        db.commit()
+    
+    generator = SlotGenerator(db, test_tenant.id, engine=engine)
+    
+    book(9)
+    assert len(generator.generate_slots(service.id, next_monday, next_monday)) == 2
+    
+    book(9)
+    slots = generator.generate_slots(service.id, next_monday, next_monday)
+    assert [slot["start_time"] for slot in slots] == [
+        datetime.combine(next_monday, time(10, 0)).isoformat()
+    ]
+
+
+def test_saturated_intervals_sweep():
+    """Test the sweep-line merge used to find fully booked periods."""
+    from api.services.intervals import saturated_intervals, peak_overlap
+    
+    day = datetime(2030, 1, 7)
+    intervals = [
+        (day.replace(hour=9), day.replace(hour=10)),
+        (day.replace(hour=9, minute=30), day.replace(hour=11)),
+        (day.replace(hour=10), day.replace(hour=12)),
+        (day.replace(hour=12), day.replace(hour=13)),
+    ]
+    
+    assert saturated_intervals(intervals, 1) == [(day.replace(hour=9), day.replace(hour=13))]
+    assert saturated_intervals(intervals, 2) == [(day.replace(hour=9, minute=30), day.replace(hour=11))]
+    assert saturated_intervals(intervals, 3) == []
+    
+    assert peak_overlap(intervals, day.replace(hour=11), day.replace(hour=13)) == 1
+    assert peak_overlap(intervals, day.replace(hour=9), day.replace(hour=12)) == 2
+
+
+def test_interval_index_matches_linear_scan():
+    """Test that IntervalIndex answers overlap queries like a linear scan."""
+    import random
+    from api.services.intervals import IntervalIndex
+    
+    rng = random.Random(7)
+    base = datetime(2030, 1, 1)
+    intervals = []
+    for _ in range(200):
+        start = base + timedelta(minutes=rng.randrange(0, 10000))
+        # Include touching, nested and degenerate intervals
+        intervals.append((start, start + timedelta(minutes=rng.choice([-5, 0, 1, 15, 60, 300]))))
+    
+    index = IntervalIndex(intervals)
+    
+    for _ in range(2000):
+        start = base + timedelta(minutes=rng.randrange(-100, 10100))
+        end = start + timedelta(minutes=rng.choice([1, 15, 30, 90]))
+        expected = any(start < blocked_end and end > blocked_start for blocked_start, blocked_end in intervals)
+        assert index.overlaps(start, end) is expected
+
+
+def test_slot_inventory_matches_generator(test_tenant, db):
+    """Test that the materialized inventory returns the same slots as the generator."""
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.models.booking import Booking, BookingStatus
+    from api.services.slot_generator import SlotGenerator
+    from api.services.slot_inventory import SlotInventoryManager
+    
+    service = Service(
+        tenant_id=test_tenant.id,
+        name="Class",
+        duration_minutes=60,
+        max_capacity=2,
+        is_active=True
+    )
+    db.add(service)
+    for day_of_week in range(7):
+        db.add(Availability(tenant_id=test_tenant.id, day_of_week=day_of_week, start_time=time(9, 0), end_time=time(17, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    db.add(Blackout(
+        tenant_id=test_tenant.id,
+        start_datetime=datetime.combine(tomorrow, time(12, 0)),
+        end_datetime=datetime.combine(tomorrow, time(14, 0)),
+        reason="Lunch"
+    ))
+    for _ in range(2):
+        db.add(Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=datetime.combine(tomorrow, time(9, 0)),
+            end_time=datetime.combine(tomorrow, time(10, 0)),
+            customer_name="Customer",
+            customer_email="customer@example.com",
+            status=BookingStatus.CONFIRMED
+        ))
+    db.commit()
+    
+    inventory = SlotInventoryManager(db, test_tenant.id)
+    assert inventory.read_slots(service.id, today, today + timedelta(days=6)) is None
+    
+    inventory.rebuild(horizon_days=14)
+    db.commit()
+    
+    expected = SlotGenerator(db, test_tenant.id).generate_slots(service.id, today, today + timedelta(days=6))
+    assert inventory.read_slots(service.id, today, today + timedelta(days=6)) == expected
+    assert inventory.read_slots(service.id, today, today + timedelta(days=30)) is None
+
+
+def test_slot_inventory_incremental_updates(client, test_tenant, db):
+    """Test that bookings and blackouts update a built inventory."""
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.models.booking import Booking, BookingStatus
+    from api.services.slot_inventory import SlotInventoryManager
+    
+    service = Service(
+        tenant_id=test_tenant.id,
+        name="60-min Service",
+        duration_minutes=60,
+        is_active=True
+    )
+    db.add(service)
+    for day_of_week in range(7):
+        db.add(Availability(tenant_id=test_tenant.id, day_of_week=day_of_week, start_time=time(9, 0), end_time=time(12, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    target = date.today() + timedelta(days=2)
+    inventory = SlotInventoryManager(db, test_tenant.id)
+    inventory.rebuild(horizon_days=7)
+    db.commit()
+    
+    def starts():
+        return [
+            slot["start_time"][11:16]
+            for slot in inventory.read_slots(service.id, target, target)
+        ]
+    
+    assert starts() == ["09:00", "10:00", "11:00"]
+    
+    booking = Booking(
+        tenant_id=test_tenant.id,
+        service_id=service.id,
+        start_time=datetime.combine(target, time(10, 0)),
+        end_time=datetime.combine(target, time(11, 0)),
+        customer_name="Customer",
+        customer_email="customer@example.com",
+        status=BookingStatus.CONFIRMED
+    )
+    db.add(booking)
+    inventory.booking_changed(booking)
+    db.commit()
+    assert starts() == ["09:00", "11:00"]
+    
+    booking.status = BookingStatus.CANCELLED
+    inventory.booking_changed(booking)
+    db.commit()
+    assert starts() == ["09:00", "10:00", "11:00"]
+    
+    blackout = Blackout(
+        tenant_id=test_tenant.id,
+        start_datetime=datetime.combine(target, time(8, 30)),
+        end_datetime=datetime.combine(target, time(9, 30)),
+        reason="Closed"
+    )
+    db.add(blackout)
+    inventory.blackout_changed(blackout.start_datetime, blackout.end_datetime)
+    db.commit()
+    assert starts() == ["10:00", "11:00"]
+    
+    service.is_active = False
+    inventory.service_changed(service)
+    db.commit()
+    assert inventory.read_slots(service.id, target, target) is None
+
+
+def test_generate_slots_batch(client, test_tenant, db):
+    """Test batch slot generation keyed by service."""
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.models.booking import Booking, BookingStatus
+    from api.services.slot_generator import SlotGenerator
+    
+    services = [
+        Service(tenant_id=test_tenant.id, name=f"{minutes}-min", duration_minutes=minutes, is_active=True)
+        for minutes in (30, 45, 60)
+    ]
+    db.add_all(services)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)))
+    db.commit()
+    
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    next_monday = today + timedelta(days=days_ahead)
+    
+    db.add(Blackout(
+        tenant_id=test_tenant.id,
+        start_datetime=datetime.combine(next_monday, time(12, 0)),
+        end_datetime=datetime.combine(next_monday, time(13, 0)),
+        reason="Lunch"
+    ))
+    db.add(Booking(
+        tenant_id=test_tenant.id,
+        service_id=services[0].id,
+        start_time=datetime.combine(next_monday, time(9, 0)),
+        end_time=datetime.combine(next_monday, time(9, 30)),
+        customer_name="Customer",
+        customer_email="customer@example.com",
+        status=BookingStatus.CONFIRMED
+    ))
+    db.commit()
+    
+    response = client.get(
+        f"/api/v1/slots/batch?start_date={next_monday}&days=7"
+        f"&service_ids={services[0].id}&service_ids={services[2].id}",
+        headers={"X-Tenant-Slug": test_tenant.slug}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert set(data["services"]) == {str(services[0].id), str(services[2].id)}
+    
+    generator = SlotGenerator(db, test_tenant.id)
+    for service in (services[0], services[2]):
+        expected = generator.generate_slots(service.id, next_monday, next_monday + timedelta(days=6))
+        assert data["services"][str(service.id)]["slots"] == expected
+    
+    # All active services by default
+    response = client.get(
+        f"/api/v1/slots/batch?start_date={next_monday}&days=1",
+        headers={"X-Tenant-Slug": test_tenant.slug}
+    )
+    assert set(response.json()["services"]) == {str(service.id) for service in services}
+    
+    response = client.get(
+        f"/api/v1/slots/batch?start_date={next_monday}&days=1&service_ids=99999",
+        headers={"X-Tenant-Slug": test_tenant.slug}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize("engine", ["bitmap", "reference"])
+def test_iter_slots_by_day_matches_generate_slots(test_tenant, db, engine):
+    """Test that the day-by-day iterator yields the same slots as generate_slots."""
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.services.slot_generator import SlotGenerator
+    
+    service = Service(tenant_id=test_tenant.id, name="45-min", duration_minutes=45, is_active=True)
+    db.add(service)
+    for day_of_week in (0, 2, 4):
+        db.add(Availability(tenant_id=test_tenant.id, day_of_week=day_of_week, start_time=time(8, 0), end_time=time(18, 0)))
+    start = date.today()
+    db.add(Blackout(
+        tenant_id=test_tenant.id,
+        start_datetime=datetime.combine(start + timedelta(days=3), time(10, 0)),
+        end_datetime=datetime.combine(start + timedelta(days=5), time(11, 0)),
+        reason="Away"
+    ))
+    db.commit()
+    db.refresh(service)
+    
+    generator = SlotGenerator(db, test_tenant.id, engine=engine)
+    end = start + timedelta(days=20)
+    days = list(generator.iter_slots_by_day(service.id, start, end))
+    
+    assert [day for day, _ in days] == [start + timedelta(days=offset) for offset in range(21)]
+    assert [slot for _, slots in days for slot in slots] == generator.generate_slots(service.id, start, end)
+
+
+def test_generate_slots_ndjson_stream(client, test_tenant, db):
+    """Test that Accept: application/x-ndjson streams one slot per line."""
+    import json
+    from api.models.service import Service
+    from api.models.availability import Availability
+    
+    service = Service(tenant_id=test_tenant.id, name="30-min Service", duration_minutes=30, is_active=True)
+    db.add(service)
+    for day_of_week in range(7):
+        db.add(Availability(tenant_id=test_tenant.id, day_of_week=day_of_week, start_time=time(9, 0), end_time=time(12, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    start = date.today() + timedelta(days=1)
+    url = f"/api/v1/slots/?service_id={service.id}&start_date={start}&days=14"
+    
+    response = client.get(url, headers={"X-Tenant-Slug": test_tenant.slug, "Accept": "application/x-ndjson"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    streamed = [json.loads(line) for line in response.text.splitlines()]
+    
+    response = client.get(url, headers={"X-Tenant-Slug": test_tenant.slug})
+    assert streamed == response.json()["slots"]
+    assert len(streamed) == 14 * 6
+
+
+def test_next_available_slots_skips_blocked_days(client, test_tenant, db):
+    """Test that the next-available search skips blocked days and honours limit."""
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    
+    service = Service(tenant_id=test_tenant.id, name="60-min Service", duration_minutes=60, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(12, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    next_monday = today + timedelta(days=days_ahead)
+    
+    # Two whole Mondays blacked out by touching blackouts
+    db.add(Blackout(
+        tenant_id=test_tenant.id,
+        start_datetime=datetime.combine(next_monday, time(8, 0)),
+        end_datetime=datetime.combine(next_monday, time(10, 30)),
+        reason="Away"
+    ))
+    db.add(Blackout(
+        tenant_id=test_tenant.id,
+        start_datetime=datetime.combine(next_monday, time(10, 30)),
+        end_datetime=datetime.combine(next_monday + timedelta(days=7), time(23, 0)),
+        reason="Away"
+    ))
+    db.commit()
+    
+    third_monday = next_monday + timedelta(days=14)
+    response = client.get(
+        f"/api/v1/slots/next?service_id={service.id}&after={next_monday}T00:00:00&limit=4",
+        headers={"X-Tenant-Slug": test_tenant.slug}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [slot["start_time"] for slot in response.json()["slots"]] == [
+        datetime.combine(third_monday, time(9, 0)).isoformat(),
+        datetime.combine(third_monday, time(10, 0)).isoformat(),
+        datetime.combine(third_monday, time(11, 0)).isoformat(),
+        datetime.combine(third_monday + timedelta(days=7), time(9, 0)).isoformat(),
+    ]
+    
+    # Slots starting before `after` on the same day are excluded
+    response = client.get(
+        f"/api/v1/slots/next?service_id={service.id}&after={third_monday}T09:30:00&limit=1",
+        headers={"X-Tenant-Slug": test_tenant.slug}
+    )
+    assert response.json()["slots"][0]["start_time"] == datetime.combine(third_monday, time(10, 0)).isoformat()
+
+
+def test_next_available_slots_searches_a_year_ahead(test_tenant, db):
+    """Test that the search crosses chunk boundaries up to a year ahead."""
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.services.slot_generator import SlotGenerator
+    
+    service = Service(tenant_id=test_tenant.id, name="30-min Service", duration_minutes=30, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=2, start_time=time(9, 0), end_time=time(10, 0)))
+    start = datetime.combine(date.today(), time.min)
+    db.add(Blackout(
+        tenant_id=test_tenant.id,
+        start_datetime=start,
+        end_datetime=start + timedelta(days=300),
+        reason="Closed"
+    ))
+    db.commit()
+    db.refresh(service)
+    
+    generator = SlotGenerator(db, test_tenant.id)
+    slots = generator.next_available_slots(service.id, start, limit=2)
+    
+    first_open = start + timedelta(days=300)
+    while first_open.weekday() != 2:
+        first_open += timedelta(days=1)
+    assert [slot["start_time"] for slot in slots] == [
+        first_open.replace(hour=9).isoformat(),
+        first_open.replace(hour=9, minute=30).isoformat(),
+    ]
+    assert generator.next_available_slots(service.id, start, limit=2, max_days=200) == []
+
+
+def test_generate_slots_cursor_pagination(client, test_tenant, db):
+    """Test that limit/cursor pages through the same slots as a full request."""
+    from api.models.service import Service
+    from api.models.availability import Availability
+    
+    service = Service(tenant_id=test_tenant.id, name="30-min Service", duration_minutes=30, is_active=True)
+    db.add(service)
+    for day_of_week in range(7):
+        db.add(Availability(tenant_id=test_tenant.id, day_of_week=day_of_week, start_time=time(9, 0), end_time=time(11, 30)))
+    db.commit()
+    db.refresh(service)
+    
+    start = date.today() + timedelta(days=1)
+    url = f"/api/v1/slots/?service_id={service.id}&start_date={start}&days=5"
+    headers = {"X-Tenant-Slug": test_tenant.slug}
+    expected = client.get(url, headers=headers).json()["slots"]
+    assert len(expected) == 25
+    
+    pages = []
+    response = client.get(f"{url}&limit=7", headers=headers)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        pages.append(data["slots"])
+        if data["next_cursor"] is None:
+            break
+        response = client.get(f"{url}&limit=7&cursor={data['next_cursor']}", headers=headers)
+    
+    assert [len(page) for page in pages] == [7, 7, 7, 4]
+    assert [slot for page in pages for slot in page] == expected
+    
+    response = client.get(f"{url}&cursor=not-a-cursor", headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_check_admission_outcomes(test_tenant, test_tenant_2, db):
+    """Test the single-statement admission check for each outcome."""
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.models.booking import Booking, BookingStatus
+    from api.services.slot_generator import Admission, SlotGenerator
+    
+    service = Service(tenant_id=test_tenant.id, name="Class", duration_minutes=60, max_capacity=2, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(17, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    next_monday = today + timedelta(days=days_ahead)
+    
+    def at(hour):
+        return datetime.combine(next_monday, time(hour, 0))
+    
+    db.add(Blackout(tenant_id=test_tenant.id, start_datetime=at(12), end_datetime=at(13), reason="Lunch"))
+    # Two identical bookings fill the 10:00 class
+    for _ in range(2):
+        db.add(Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=at(10),
+            end_time=at(11),
+            customer_name="Customer",
+            customer_email="customer@example.com",
+            status=BookingStatus.CONFIRMED
+        ))
+    db.commit()
+    
+    generator = SlotGenerator(db, test_tenant.id)
+    assert generator.check_admission(service.id, at(9), at(10)) == (Admission.ADMITTED, service)
+    assert generator.check_admission(service.id, at(10), at(11))[0] == Admission.FULL
+    assert generator.check_admission(service.id, at(12), at(13))[0] == Admission.UNAVAILABLE
+    assert generator.check_admission(service.id, at(16), at(17) + timedelta(minutes=30))[0] == Admission.UNAVAILABLE
+    assert generator.check_admission(service.id + 1000, at(9), at(10)) == (Admission.SERVICE_NOT_FOUND, None)
+    assert SlotGenerator(db, test_tenant_2.id).check_admission(service.id, at(9), at(10))[0] == Admission.SERVICE_NOT_FOUND
+
+
+@pytest.mark.parametrize("engine", ["bitmap", "reference"])
+def test_touching_windows_keep_their_own_slot_grids(test_tenant, db, engine):
+    """Test that each availability row starts its own slot grid and a booking must fit in one row."""
+    from api.models.service import Service
+    from api.models.availability import Availability
+    from api.services.slot_generator import Admission, SlotGenerator
+    
+    service = Service(tenant_id=test_tenant.id, name="50-min Service", duration_minutes=50, is_active=True)
+    db.add(service)
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(12, 0)))
+    db.add(Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(12, 0), end_time=time(17, 0)))
+    db.commit()
+    db.refresh(service)
+    
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    next_monday = today + timedelta(days=days_ahead)
+    
+    generator = SlotGenerator(db, test_tenant.id, engine=engine)
+    slots = generator.generate_slots(service.id, next_monday, next_monday)
+    
+    assert [slot["start_time"][11:16] for slot in slots] == [
+        "09:00", "09:50", "10:40", "12:00", "12:50", "13:40", "14:30", "15:20", "16:10"
+    ]
+    
+    # 11:30-12:20 is inside the merged hours but inside neither row
+    straddle_start = datetime.combine(next_monday, time(11, 30))
+    straddle_end = datetime.combine(next_monday, time(12, 20))
+    assert generator.check_admission(service.id, straddle_start, straddle_end)[0] == Admission.UNAVAILABLE
+    assert generator.is_slot_available(service.id, straddle_start, straddle_end) is False
+
+
+@pytest.mark.parametrize("engine", ["bitmap", "reference"])
+def test_engines_match_per_row_loop_on_touching_and_overlapping_windows(test_tenant, db, engine):
+    """Test that touching and overlapping rows give the original per-row slots on every engine."""
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.services.slot_generator import SlotGenerator
+    
+    services = [
+        Service(tenant_id=test_tenant.id, name=f"{minutes}-min", duration_minutes=minutes, is_active=True)
+        for minutes in (25, 50, 90)
+    ]
+    db.add_all(services)
+    windows = [
+        # Touching
+        Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(9, 0), end_time=time(12, 0)),
+        Availability(tenant_id=test_tenant.id, day_of_week=0, start_time=time(12, 0), end_time=time(17, 0)),
+        # Overlapping, off the first row's grid
+        Availability(tenant_id=test_tenant.id, day_of_week=1, start_time=time(9, 0), end_time=time(13, 0)),
+        Availability(tenant_id=test_tenant.id, day_of_week=1, start_time=time(11, 10), end_time=time(15, 0)),
+        # Nested
+        Availability(tenant_id=test_tenant.id, day_of_week=2, start_time=time(8, 0), end_time=time(18, 0)),
+        Availability(tenant_id=test_tenant.id, day_of_week=2, start_time=time(10, 5), end_time=time(12, 0)),
+    ]
+    db.add_all(windows)
+    
+    today = date.today()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    next_monday = today + timedelta(days=days_ahead)
+    blackouts = [
+        (datetime.combine(next_monday + timedelta(days=1), time(12, 0)), datetime.combine(next_monday + timedelta(days=1), time(12, 30))),
+        (datetime.combine(next_monday + timedelta(days=9), time(10, 45)), datetime.combine(next_monday + timedelta(days=9), time(11, 0))),
+    ]
+    for start, end in blackouts:
+        db.add(Blackout(tenant_id=test_tenant.id, start_datetime=start, end_datetime=end))
+    db.commit()
+    
+    generator = SlotGenerator(db, test_tenant.id, engine=engine)
+    end_date = next_monday + timedelta(days=13)
+    for service in services:
+        db.refresh(service)
+        expected = _per_row_slots(windows, blackouts, service.duration_minutes, next_monday, end_date)
+        assert generator.generate_slots(service.id, next_monday, end_date) == expected
+    
+    monday = generator.generate_slots(services[1].id, next_monday, next_monday)
+    assert [slot["start_time"][11:16] for slot in monday][:5] == ["09:00", "09:50", "10:40", "12:00", "12:50"]
+
+
+def test_engines_byte_identical_on_synthetic_tenant(test_tenant, db):
+    """Test engine equivalence on dense availability with random blackouts and bookings."""
+    import json
+    import random
+    from api.models.service import Service
+    from api.models.availability import Availability, Blackout
+    from api.models.booking import Booking, BookingStatus
+    from api.services.slot_generator import SlotGenerator
+    
+    rng = random.Random(1234)
+    services = [
+        Service(tenant_id=test_tenant.id, name=f"{minutes}-min", duration_minutes=minutes,
+                max_capacity=capacity, is_active=True)
+        for minutes, capacity in [(15, None), (40, 2), (90, 5)]
+    ]
+    db.add_all(services)
+    for day_of_week in range(7):
+        db.add(Availability(tenant_id=test_tenant.id, day_of_week=day_of_week, start_time=time(7, 0), end_time=time(12, 0)))
+        db.add(Availability(tenant_id=test_tenant.id, day_of_week=day_of_week, start_time=time(11, 30), end_time=time(19, 45)))
+    
+    start = datetime.combine(date.today(), time.min)
+    for _ in range(150):
+        blackout_start = start + timedelta(minutes=rng.randrange(0, 30 * 24 * 60, 5))
+        db.add(Blackout(
+            tenant_id=test_tenant.id,
+            start_datetime=blackout_start,
+            end_datetime=blackout_start + timedelta(minutes=rng.choice([5, 30, 75, 600])),
+            reason="Random"
+        ))
+    db.commit()
+    
+    for _ in range(600):
+        service = rng.choice(services)
+        booking_start = start + timedelta(days=rng.randrange(30), minutes=rng.randrange(7 * 60, 19 * 60, 5))
+        db.add(Booking(
+            tenant_id=test_tenant.id,
+            service_id=service.id,
+            start_time=booking_start,
+            end_time=booking_start + timedelta(minutes=service.duration_minutes),
+            customer_name="Customer",
+            customer_email="customer@example.com",
+            status=rng.choice([BookingStatus.CONFIRMED, BookingStatus.COMPLETED, BookingStatus.CANCELLED])
+        ))
+    db.commit()
+    
+    reference = SlotGenerator(db, test_tenant.id, engine="reference")
+    for engine in SlotGenerator.ENGINES:
+        optimized = SlotGenerator(db, test_tenant.id, engine=engine)
+        for service in services:
+            for days in (1, 7, 30):
+                end_date = start.date() + timedelta(days=days - 1)
+                expected = reference.generate_slots(service.id, start.date(), end_date)
+                actual = optimized.generate_slots(service.id, start.date(), end_date)
+                assert json.dumps(actual).encode() == json.dumps(expected).encode()
+    
+    # Every generated slot passes the single-slot check
+    for slot in rng.sample(reference.generate_slots(services[0].id, start.date(), start.date() + timedelta(days=29)), 50):
+        assert reference.is_slot_available(
+            services[0].id,
+            datetime.fromisoformat(slot["start_time"]),
+            datetime.fromisoformat(slot["end_time"])
+        )